@@ -0,0 +1,39 @@
+"""
+Frequency analysis and decoding of a multi-MB ciphertext (ciphertext.txt
+repeated): ceasar_salad against frequency_decode, with and without NumPy.
+
+    python bench_crack_caesar.py [copies]
+"""
+
+import os
+import sys
+import time
+
+import crack_caesar
+from crack_caesar import ceasar_salad, frequency_decode
+
+CIPHERTEXT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ciphertext.txt")
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    copies = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    with open(CIPHERTEXT) as f:
+        ciphertext = f.read() * copies
+    data = ciphertext.encode()
+    print(f"{len(data) / 2 ** 20:.1f} MiB ciphertext")
+
+    print(f"  ceasar_salad                   {timed(ceasar_salad, ciphertext) * 1000:9.1f} ms")
+
+    np = crack_caesar.np
+    if np is not None:
+        print(f"  frequency_decode, NumPy        {timed(frequency_decode, data) * 1000:9.1f} ms")
+    crack_caesar.np = None
+    print(f"  frequency_decode, bytes.count  {timed(frequency_decode, data) * 1000:9.1f} ms")
+    crack_caesar.np = np
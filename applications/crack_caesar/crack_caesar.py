@@ -4,6 +4,11 @@
 # 1st to encode char frequency
 # 2nd to decode text
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
 
 # List of alphabet letters in order of expected frequency, from most to least frequent
 frequency_list = ['E', 'T', 'A', 'O', 'H', 'N', 'R', 'I', 'S', 'D', 'L', 'W', 'U',
@@ -28,14 +33,75 @@ def ceasar_salad(words):
     match = {letter_freq[i][0]:frequency_list[i]
                 for i in range (len(letter_freq))}
     translate = ''.join(map(lambda x: match[x] if x in match else x, words))
-    print(translate)
+    return translate
+
+
+# Fast path: work on the raw bytes instead of character by character.
+# The ciphertext is uppercase ASCII letters plus punctuation and UTF-8,
+# and only the bytes A-Z are ever remapped, so decoding bytes is safe.
+
+UPPERCASE = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def _as_bytes(text):
+    return text.encode() if isinstance(text, str) else bytes(text)
+
+
+def letter_counts(data):
+    """
+    Occurrences of A..Z in `data` (str or bytes) as a list of 26 ints.
+    One np.bincount pass over the buffer, or 26 bytes.count() scans
+    without NumPy.
+    """
+    data = _as_bytes(data)
+    if np is None:
+        return [data.count(letter) for letter in UPPERCASE]
+    counts = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256)
+    return counts[ord("A"):ord("Z") + 1].tolist()
+
+
+def frequency_key(counts, letters=frequency_list, first_seen=None):
+    """
+    Cipher letter -> plain letter by matching frequency ranks, like
+    ceasar_salad. Letters that don't occur are left out. Ties go to the
+    letter with the lower `first_seen` position (alphabetical without),
+    which is the order ceasar_salad's stable sort gives.
+    """
+    first_seen = first_seen or range(26)
+    ranked = sorted((i for i in range(26) if counts[i]), key=lambda i: (-counts[i], first_seen[i]))
+    return {chr(ord("A") + i): letters[rank] for rank, i in enumerate(ranked)}
+
+
+def decode_table(key):
+    """
+    256-entry bytes.translate table applying a cipher -> plain letter key.
+    """
+    cipher = "".join(key).encode()
+    plain = "".join(key[c] for c in key).encode()
+    return bytes.maketrans(cipher, plain)
+
+
+def frequency_decode(text):
+    """
+    Decode `text` (str or bytes) by letter frequency. Returns the same
+    type it was given.
+    """
+    data = _as_bytes(text)
+    first_seen = [data.find(letter) for letter in UPPERCASE]
+    key = frequency_key(letter_counts(data), first_seen=first_seen)
+    plaintext = data.translate(decode_table(key))
+    return plaintext.decode() if isinstance(text, str) else plaintext
 
 
 
 
 if __name__ == "__main__":
+    from solver import crack
+
     # read cyphertext file
     with open('ciphertext.txt') as file:
-        ciphertext = file.read()   
+        ciphertext = file.read()
 
-    print(ceasar_salad(ciphertext))
\ No newline at end of file
+    key, plaintext = crack(ciphertext)
+    print(" ".join(f"{c}->{p}" for c, p in sorted(key.items())))
+    print(plaintext)
@@ -0,0 +1,292 @@
+"""
+Key search for substitution ciphers, scored against English statistics.
+
+Candidate keys are scored two ways:
+
+chi_squared     letter counts against the expected English frequencies
+                (the table in README.md). Cheap, used to pick among the
+                26 shifts of a true Caesar cipher.
+log_likelihood  bigram + trigram log10 probabilities of the decoded
+                text, from tables trained on the texts in this repo and
+                kept in HashTables keyed by n-gram.
+
+solve_shift tries all 26 shifts. solve_substitution hill-climbs over
+general keys by swapping pairs of letters, with restarts spread over a
+process pool. crack runs both and returns the best key and plaintext.
+
+    python solver.py [path] [restarts]
+"""
+
+import math
+import os
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from crack_caesar import UPPERCASE, _as_bytes, decode_table, frequency_key, letter_counts
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "hashtable"))
+from caching import memoize
+from hashtable import HashTable
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+CIPHERTEXT = os.path.join(HERE, "ciphertext.txt")
+
+# English prose to learn n-gram statistics from
+TRAINING_TEXTS = (
+    os.path.join(HERE, "..", "histo", "robin.txt"),
+    os.path.join(HERE, "..", "markov", "input.txt"),
+)
+
+# Percent of all letters, A..Z (from README.md)
+ENGLISH_FREQUENCIES = [
+    8.46, 2.19, 1.58, 4.74, 11.53, 2.42, 2.48, 7.71, 5.84, 0.07, 0.84, 3.92, 2.18,
+    6.73, 8.08, 1.08, 0.17, 6.29, 5.56, 9.75, 2.59, 0.59, 3.08, 0.07, 2.02, 0.03,
+]
+
+# bytes.translate deletion set keeping only A-Z
+NOT_UPPERCASE = bytes(b for b in range(256) if b not in UPPERCASE)
+
+
+def letters_only(text):
+    """
+    The A-Z bytes of `text` (str or bytes), uppercased, everything else
+    dropped.
+    """
+    return _as_bytes(text).upper().translate(None, NOT_UPPERCASE)
+
+
+def chi_squared(counts):
+    """
+    Chi-squared statistic of 26 letter counts against English. Lower is
+    more English-like.
+    """
+    total = sum(counts)
+    if total == 0:
+        return 0.0
+    score = 0.0
+    for observed, percent in zip(counts, ENGLISH_FREQUENCIES):
+        expected = total * percent / 100
+        score += (observed - expected) ** 2 / expected
+    return score
+
+
+@memoize(max_entries=8)
+def ngram_table(n, texts=TRAINING_TEXTS):
+    """
+    HashTable of n-gram (str) -> log10 probability in the training texts,
+    and the log10 probability to use for n-grams never seen there.
+    """
+    counts = HashTable()
+    for path in texts:
+        with open(path, "rb") as f:
+            letters = letters_only(f.read()).decode()
+        for i in range(len(letters) - n + 1):
+            counts.increment(letters[i:i + n])
+
+    total = sum(counts.values())
+    table = HashTable.from_items((gram, math.log10(count / total)) for gram, count in counts.items())
+    return table, math.log10(0.01 / total)
+
+
+@memoize(max_entries=8)
+def dense_scores(n, texts=TRAINING_TEXTS):
+    """
+    ngram_table as a flat list indexed by the n-gram's letters in base 26,
+    so scoring a key doesn't hash any strings.
+    """
+    table, floor = ngram_table(n, texts)
+    scores = [floor] * 26 ** n
+    for gram, score in table.items():
+        index = 0
+        for letter in gram:
+            index = index * 26 + ord(letter) - ord("A")
+        scores[index] = score
+    return scores
+
+
+class CipherStats:
+    """
+    Letter, bigram and trigram counts of a ciphertext, computed once so
+    each candidate key is scored without decoding the text.
+    """
+
+    def __init__(self, ciphertext):
+        letters = [b - ord("A") for b in letters_only(ciphertext)]
+        self.counts = letter_counts(bytes(b + ord("A") for b in letters))
+        self.bigrams = self._ngrams(letters, 2)
+        self.trigrams = self._ngrams(letters, 3)
+
+    @staticmethod
+    def _ngrams(letters, n):
+        # (letter indexes..., count) for each distinct n-gram
+        counts = HashTable(hash_function=hash)
+        for i in range(len(letters) - n + 1):
+            counts.increment(tuple(letters[i:i + n]))
+        return [gram + (count,) for gram, count in counts.items()]
+
+    def shifted_counts(self, shift):
+        """
+        Letter counts after decoding with a shift of `shift`.
+        """
+        return [self.counts[(i + shift) % 26] for i in range(26)]
+
+
+class Scorer:
+    """
+    log_likelihood of CipherStats under a key given as a permutation:
+    perm[c] is the plaintext letter index for cipher letter index c.
+    """
+
+    def __init__(self, stats):
+        self.bigrams = stats.bigrams
+        self.trigrams = stats.trigrams
+        self.bigram_scores = dense_scores(2)
+        self.trigram_scores = dense_scores(3)
+        if np is not None and self.trigrams:
+            self._arrays = (
+                np.array(self.bigrams, dtype=np.int64).T,
+                np.array(self.trigrams, dtype=np.int64).T,
+                np.array(self.bigram_scores),
+                np.array(self.trigram_scores),
+            )
+        else:
+            self._arrays = None
+
+    def log_likelihood(self, perm):
+        if self._arrays is not None:
+            (a2, b2, n2), (a3, b3, c3, n3), scores2, scores3 = self._arrays
+            p = np.asarray(perm)
+            return float((scores2[p[a2] * 26 + p[b2]] * n2).sum()
+                         + (scores3[(p[a3] * 26 + p[b3]) * 26 + p[c3]] * n3).sum())
+
+        scores2 = self.bigram_scores
+        scores3 = self.trigram_scores
+        score = 0.0
+        for a, b, n in self.bigrams:
+            score += n * scores2[perm[a] * 26 + perm[b]]
+        for a, b, c, n in self.trigrams:
+            score += n * scores3[(perm[a] * 26 + perm[b]) * 26 + perm[c]]
+        return score
+
+
+def perm_to_key(perm):
+    """
+    Cipher letter -> plain letter dict, the key format of frequency_key.
+    """
+    return {chr(ord("A") + c): chr(ord("A") + p) for c, p in enumerate(perm)}
+
+
+def key_to_perm(key):
+    perm = list(range(26))
+    unused = [p for p in range(26) if chr(ord("A") + p) not in key.values()]
+    for c in range(26):
+        letter = chr(ord("A") + c)
+        perm[c] = ord(key[letter]) - ord("A") if letter in key else unused.pop()
+    return perm
+
+
+def decode(ciphertext, key):
+    """
+    Apply a cipher -> plain key, returning the same type as given.
+    """
+    plaintext = _as_bytes(ciphertext).translate(decode_table(key))
+    return plaintext.decode() if isinstance(ciphertext, str) else plaintext
+
+
+def solve_shift(ciphertext, stats=None):
+    """
+    Best of the 26 Caesar shifts by chi-squared. Returns (shift, key,
+    plaintext), where the ciphertext letter is the plain letter + shift.
+    """
+    stats = stats or CipherStats(ciphertext)
+    shift = min(range(26), key=lambda s: chi_squared(stats.shifted_counts(s)))
+    key = perm_to_key([(c - shift) % 26 for c in range(26)])
+    return shift, key, decode(ciphertext, key)
+
+
+def _climb(job):
+    """
+    Hill-climb from one starting key: swap every pair of plain letters,
+    keep swaps that raise the score, stop when a full pass finds none.
+    Runs in pool workers, so it only takes picklable arguments.
+    """
+    stats, perm, seed, shuffles = job
+    rng = random.Random(seed)
+    perm = list(perm)
+    for _ in range(shuffles):
+        i, j = rng.sample(range(26), 2)
+        perm[i], perm[j] = perm[j], perm[i]
+
+    scorer = Scorer(stats)
+    best = scorer.log_likelihood(perm)
+    improved = True
+    while improved:
+        improved = False
+        for i in range(26):
+            for j in range(i + 1, 26):
+                perm[i], perm[j] = perm[j], perm[i]
+                score = scorer.log_likelihood(perm)
+                if score > best:
+                    best = score
+                    improved = True
+                else:
+                    perm[i], perm[j] = perm[j], perm[i]
+    return best, perm
+
+
+def solve_substitution(ciphertext, restarts=4, workers=1, seed=0, starts=(), stats=None):
+    """
+    Hill-climbing search over general substitution keys. The first climbs
+    start from the frequency-rank key and any `starts` keys; the other
+    restarts from randomly perturbed frequency keys. With workers > 1 (or
+    None, one per CPU) the climbs run in a process pool.
+
+    Returns (score, key, plaintext) for the best climb.
+    """
+    stats = stats or CipherStats(ciphertext)
+    frequency_perm = key_to_perm(frequency_key(stats.counts))
+    jobs = [(stats, frequency_perm, seed, 0)]
+    jobs += [(stats, key_to_perm(key), seed, 0) for key in starts]
+    jobs += [(stats, frequency_perm, seed + r, 8) for r in range(1, restarts)]
+
+    if workers == 1:
+        results = [_climb(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_climb, jobs))
+
+    score, perm = max(results, key=lambda result: result[0])
+    key = perm_to_key(perm)
+    return score, key, decode(ciphertext, key)
+
+
+def crack(ciphertext, restarts=4, workers=1, seed=0):
+    """
+    Find the key to `ciphertext` (str or bytes). The best Caesar shift
+    seeds the substitution search, so a plain shift cipher comes back
+    unchanged when no swap improves on it.
+
+    Returns (key, plaintext): key maps each cipher letter to its plain
+    letter, plaintext has the type of the ciphertext.
+    """
+    stats = CipherStats(ciphertext)
+    _, shift_key, _ = solve_shift(ciphertext, stats)
+    _, key, plaintext = solve_substitution(ciphertext, restarts, workers, seed,
+                                           starts=[shift_key], stats=stats)
+    return key, plaintext
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else CIPHERTEXT
+    restarts = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    with open(path) as f:
+        key, plaintext = crack(f.read(), restarts, workers=None)
+    print(" ".join(f"{c}->{p}" for c, p in sorted(key.items())))
+    print(plaintext)
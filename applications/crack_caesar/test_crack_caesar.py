@@ -0,0 +1,41 @@
+import os
+import unittest
+
+import crack_caesar
+from crack_caesar import ceasar_salad, decode_table, frequency_decode, frequency_key, letter_counts
+
+CIPHERTEXT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ciphertext.txt")
+
+
+class TestCrackCaesar(unittest.TestCase):
+
+    def setUp(self):
+        with open(CIPHERTEXT) as f:
+            self.ciphertext = f.read()
+
+    def test_letter_counts(self):
+        expected = [self.ciphertext.count(chr(c)) for c in range(ord("A"), ord("Z") + 1)]
+        self.assertTrue(letter_counts(self.ciphertext) == expected)
+        self.assertTrue(letter_counts(self.ciphertext.encode()) == expected)
+
+        np = crack_caesar.np
+        crack_caesar.np = None
+        try:
+            self.assertTrue(letter_counts(self.ciphertext) == expected)
+        finally:
+            crack_caesar.np = np
+
+    def test_decode_table(self):
+        key = frequency_key([0, 5, 9] + [0] * 23)
+        self.assertTrue(key == {"C": "E", "B": "T"})
+        self.assertTrue(b"ABC, cab\xe2\x80\x94".translate(decode_table(key)) == b"ATE, cab\xe2\x80\x94")
+
+    def test_matches_ceasar_salad(self):
+        plaintext = frequency_decode(self.ciphertext)
+        self.assertTrue(plaintext == ceasar_salad(self.ciphertext))
+        self.assertTrue(plaintext.startswith("IN MERRY ENGLAND IN THE TIME OF OLD"))
+        self.assertTrue(frequency_decode(self.ciphertext.encode()) == plaintext.encode())
+
+
+if __name__ == '__main__':
+    unittest.main()
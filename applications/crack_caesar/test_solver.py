@@ -0,0 +1,75 @@
+import random
+import unittest
+
+from crack_caesar import frequency_decode
+from solver import (CIPHERTEXT, CipherStats, Scorer, chi_squared, crack, key_to_perm, letters_only,
+                    ngram_table, perm_to_key, solve_shift, solve_substitution)
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def encrypt(plaintext, cipher_alphabet):
+    return plaintext.translate(str.maketrans(ALPHABET, cipher_alphabet))
+
+
+def errors(x, y):
+    return sum(a != b for a, b in zip(x, y))
+
+
+class TestSolver(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with open(CIPHERTEXT) as f:
+            # A passage from later in the book than the training text
+            cls.plaintext = frequency_decode(f.read())[5000:6500]
+
+    def test_scores(self):
+        self.assertTrue(letters_only("Ab, c—d!") == b"ABCD")
+        english = CipherStats(self.plaintext).counts
+        self.assertTrue(chi_squared(english) < chi_squared(english[1:] + english[:1]))
+        self.assertTrue(chi_squared([0] * 26) == 0)
+
+        table, floor = ngram_table(3)
+        self.assertTrue(table["THE"] > table.get("ZQX", floor))
+
+        scorer = Scorer(CipherStats(self.plaintext))
+        identity = list(range(26))
+        self.assertTrue(scorer.log_likelihood(identity) > scorer.log_likelihood(identity[::-1]))
+
+    def test_key_conversion(self):
+        perm = list(range(25, -1, -1))
+        self.assertTrue(key_to_perm(perm_to_key(perm)) == perm)
+        # Missing letters are filled from the unused plain letters
+        self.assertTrue(sorted(key_to_perm({"A": "E"})) == list(range(26)))
+
+    def test_solve_shift(self):
+        short = self.plaintext[:300]
+        shift, key, plaintext = solve_shift(encrypt(short, ALPHABET[3:] + ALPHABET[:3]))
+        self.assertTrue(shift == 3)
+        self.assertTrue(key["D"] == "A")
+        self.assertTrue(plaintext == short)
+
+    def test_crack_substitution(self):
+        rng = random.Random(5)
+        cipher_alphabet = "".join(rng.sample(ALPHABET, 26))
+        ciphertext = encrypt(self.plaintext, cipher_alphabet)
+
+        key, plaintext = crack(ciphertext, restarts=2)
+        self.assertTrue(errors(plaintext, self.plaintext) < errors(frequency_decode(ciphertext), self.plaintext))
+        self.assertTrue(errors(plaintext, self.plaintext) <= 5)
+        self.assertTrue(key[cipher_alphabet[ALPHABET.index("E")]] == "E")
+
+        key, plaintext = crack(ciphertext.encode(), restarts=1)
+        self.assertTrue(isinstance(plaintext, bytes))
+
+    def test_crack_in_pool(self):
+        short = self.plaintext[:400]
+        ciphertext = encrypt(short, ALPHABET[7:] + ALPHABET[:7])
+        score, key, plaintext = solve_substitution(ciphertext, restarts=2, workers=2,
+                                                   starts=[solve_shift(ciphertext)[1]])
+        self.assertTrue(plaintext == short)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+"""
+Memoized recursion vs the bottom-up evaluator for expensive_seq.
+
+    python bench_expseq.py
+
+The recursive version is only run while x stays clear of the recursion
+limit.
+"""
+
+import random
+import sys
+import time
+
+from expensive_seq import expensive_seq, expensive_seq_iterative, expensive_seq_many
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    recursion_safe = sys.getrecursionlimit() // 3
+
+    print(f"{'x':>6} {'recursive':>12} {'iterative':>12}")
+    for x in (50, 100, 150, 1000, 2000, 5000):
+        iterative = timed(lambda: expensive_seq_iterative(x, 400, 800))
+        if x <= recursion_safe:
+            expensive_seq.cache_clear()
+            recursive = f"{timed(lambda: expensive_seq(x, 400, 800)):11.3f}s"
+        else:
+            recursive = "RecursionErr"
+        print(f"{x:6} {recursive:>12} {iterative:11.4f}s")
+
+    rng = random.Random(0)
+    queries = [(rng.randrange(5000), rng.randrange(1000), rng.randrange(1000))
+               for _ in range(1000)]
+    one_by_one = timed(lambda: [expensive_seq_iterative(*q) for q in queries])
+    batched = timed(lambda: expensive_seq_many(queries))
+    print(f"\n1000 queries with x < 5000: one at a time {one_by_one:.3f}s, "
+          f"batched {batched:.3f}s")
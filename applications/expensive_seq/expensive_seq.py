@@ -1,18 +1,102 @@
 # In Python, a dict key can be any immutable type... including a tuple.
 # Use a hashtable to make sure your solution completes before the universe ends
 
-cache = {}
+import os
+import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "hashtable"))
+from caching import memoize
+from hashtable import HashTable
+
+
+# Largest x evaluated by the memoized recursion. It visits on the order of
+# x**3 / 30 distinct (x, y, z) tuples, which for x up to here fit in the
+# cache below; larger x would thrash it, so they go to the closed form
+# (expensive_seq_many), which is O(x) time with no cache at all.
+RECURSIVE_MAX_X = 50
+
+
+# Bounded LRU cache of (x, y, z) -> result
+@memoize(max_entries=20000)
 def expensive_seq(x, y, z):
     if x <= 0:
         return y + z
-    elif (x, y, z) in cache:
-        return cache[(x, y, z)] # return the cached value if available
-    else: # else, calculate output and cache it, then return
-        cache[(x, y, z)] = expensive_seq(x-1, y+1, z) \
-                           + expensive_seq(x - 2, y + 2, z * 2) \
-                           + expensive_seq(x - 3, y + 3, z * 3)
-        return cache[(x, y, z)]
+    elif x > RECURSIVE_MAX_X:
+        return expensive_seq_iterative(x, y, z)
+    else:
+        return expensive_seq(x-1, y+1, z) \
+               + expensive_seq(x - 2, y + 2, z * 2) \
+               + expensive_seq(x - 3, y + 3, z * 3)
+
+
+# Iterative evaluation
+#
+# Along any path of the recursion x + y stays the same (x goes down by k
+# exactly when y goes up by k) and z is only ever multiplied. Every base
+# case x' <= 0 returns y' + z' = (x + y) - x' + z', so the whole result is
+# affine in (x + y) and z:
+#
+#     expensive_seq(x, y, z) = (x + y) * C(x) - D(x) + z * B(x)
+#
+# where for x <= 0:  C(x) = 1, D(x) = x, B(x) = 1
+# and for x >= 1:    C(x) = C(x-1) + C(x-2) + C(x-3)   (same for D)
+#                    B(x) = B(x-1) + 2 B(x-2) + 3 B(x-3)
+#
+# C, D and B don't depend on y or z, so one bottom-up pass over x answers
+# any number of queries, keeping only the last three x values.
+
+
+def _base_coefficients(x):
+    """
+    (C, D, B) for x <= 0
+    """
+    return 1, x, 1
+
+
+def expensive_seq_many(queries):
+    """
+    Evaluate expensive_seq for every (x, y, z) in `queries` with a single
+    bottom-up pass up to the largest x. No recursion, and memory doesn't
+    grow with x. Returns the results in query order.
+    """
+    queries = list(queries)
+    results = [None] * len(queries)
+
+    # Query indexes waiting on each x, largest x last
+    waiting = HashTable(hash_function=int)
+    for i, (x, y, z) in enumerate(queries):
+        if x <= 0:
+            results[i] = y + z
+        else:
+            pending = waiting.get(x)
+            if pending is None:
+                waiting.put(x, [i])
+            else:
+                pending.append(i)
+    if not waiting:
+        return results
+
+    # Coefficients for x - 3, x - 2, x - 1
+    window = [_base_coefficients(-2), _base_coefficients(-1), _base_coefficients(0)]
+    max_x = max(waiting)
+
+    for x in range(1, max_x + 1):
+        (c3, d3, b3), (c2, d2, b2), (c1, d1, b1) = window
+        current = (c1 + c2 + c3, d1 + d2 + d3, b1 + 2 * b2 + 3 * b3)
+        window = [window[1], window[2], current]
+
+        pending = waiting.get(x)
+        if pending is not None:
+            c, d, b = current
+            for i in pending:
+                _, y, z = queries[i]
+                results[i] = (x + y) * c - d + z * b
+
+    return results
+
+
+def expensive_seq_iterative(x, y, z):
+    return expensive_seq_many([(x, y, z)])[0]
 
 
 if __name__ == "__main__":
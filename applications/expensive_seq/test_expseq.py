@@ -1,6 +1,6 @@
 import unittest
 
-from expensive_seq import expensive_seq
+from expensive_seq import RECURSIVE_MAX_X, expensive_seq, expensive_seq_iterative, expensive_seq_many
 
 
 class TestHashTable(unittest.TestCase):
@@ -15,6 +15,37 @@ class TestHashTable(unittest.TestCase):
         x = expensive_seq(150, 400, 800)
         self.assertTrue(x == 348089347602676380885589070822523585642423790379026639337628)
 
+    def test_expseq_iterative(self):
+        first10 = [0, 73, 712, 5233, 36592, 246773, 1623280, 10496585, 66941152, 421957189]
+
+        for i in range(10):
+            x = expensive_seq_iterative(i*2, i*3, i*4)
+            self.assertTrue(x == first10[i])
+
+        x = expensive_seq_iterative(150, 400, 800)
+        self.assertTrue(x == 348089347602676380885589070822523585642423790379026639337628)
+
+    def test_expseq_many_matches_recursive(self):
+        queries = [(x, y, z) for x in range(-3, 20) for y in range(-2, 4) for z in range(4)]
+        self.assertTrue(expensive_seq_many(queries) == [expensive_seq(*q) for q in queries])
+
+    def test_expseq_beyond_recursion_limit(self):
+        # Far deeper than the recursive version can go
+        x = expensive_seq_iterative(5000, 1, 1)
+        self.assertTrue(x > 0)
+        self.assertTrue(expensive_seq_many([(5000, 1, 1), (10, 2, 3)]) == [x, expensive_seq(10, 2, 3)])
+
+    def test_expseq_cache_stays_bounded(self):
+        expensive_seq.cache_clear()
+        # The recursion's subproblems fit in the cache...
+        expensive_seq(RECURSIVE_MAX_X, 1, 1)
+        self.assertTrue(len(expensive_seq.cache) < 20000)
+        # ...and larger x goes straight to the closed form
+        expensive_seq.cache_clear()
+        x = expensive_seq(300, 400, 800)
+        self.assertTrue(x == expensive_seq_iterative(300, 400, 800))
+        self.assertTrue(len(expensive_seq.cache) == 1)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,63 @@
+"""
+Histogram ordering and output on a generated corpus: a single sort on
+(-count, word) with one print per line, against histo's two-key sort or
+top-k heap with batched writes.
+
+    python bench_histo.py [megabytes] [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "word_count"))
+from bench_word_count import make_corpus
+from histo import histogram_rows, render
+from word_count import word_count_file
+
+
+def naive(counts, limit, out):
+    rows = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+    column = max(len(word) for word, _ in rows) + 2
+    scale = min(1, 60 / rows[0][1])
+    for word, count in rows:
+        print(f"{word:{column}}{'#' * max(1, round(count * scale))}", file=out)
+
+
+def batched(counts, limit, out):
+    lines = render(histogram_rows(counts, limit), bar_width=60)
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= 1024:
+            batch.append("")
+            out.write("\n".join(batch))
+            batch = []
+    batch.append("")
+    out.write("\n".join(batch))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.txt")
+        make_corpus(path, megabytes)
+        start = time.perf_counter()
+        counts = word_count_file(path)
+        print(f"{megabytes} MiB corpus, {len(counts)} distinct words, "
+              f"counted in {time.perf_counter() - start:.2f}s")
+
+        with open(os.devnull, "w") as out:
+            for limit in (None, rows):
+                label = "all rows" if limit is None else f"top {limit}"
+                print(f"  {label:9} sort + print   {timed(naive, counts, limit, out):7.3f}s")
+                print(f"  {label:9} histo          {timed(batched, counts, limit, out):7.3f}s")
@@ -1,2 +1,72 @@
-# Your code here
+"""
+Print a histogram of the words in a file, one hash mark per occurrence,
+ordered by count and then alphabetically.
 
+    python histo.py [path] [rows]
+"""
+
+import os
+import sys
+from operator import itemgetter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "word_count"))
+from heavy_hitters import top_k
+from word_count import word_count_file
+
+ROBIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "robin.txt")
+
+# Lines joined into a single write to the output stream
+BATCH_SIZE = 1024
+
+
+def histogram_rows(counts, limit=None):
+    """
+    (word, count) pairs ordered by (-count, word). With a limit only the
+    top rows are selected, using a heap instead of sorting every word.
+    """
+    if limit is not None:
+        return top_k(counts, limit)
+    # Two stable sorts on plain keys are cheaper than one on (-count, word)
+    rows = sorted(counts.items())
+    rows.sort(key=itemgetter(1), reverse=True)
+    return rows
+
+
+def render(rows, bar_width=None):
+    """
+    Yield histogram lines. Marks start two spaces after the longest word;
+    bar_width scales the largest count down to that many marks.
+    """
+    if not rows:
+        return
+    column = max(len(word) for word, _ in rows) + 2
+    scale = 1
+    if bar_width is not None and rows[0][1] > bar_width:
+        scale = bar_width / rows[0][1]
+    for word, count in rows:
+        marks = count if scale == 1 else max(1, round(count * scale))
+        yield f"{word:{column}}{'#' * marks}"
+
+
+def print_histogram(path_or_stream=ROBIN, limit=None, bar_width=None, out=None, batch_size=BATCH_SIZE):
+    """
+    Count the words of a file or stream and write their histogram to
+    `out` (stdout by default) in batches of lines.
+    """
+    out = sys.stdout if out is None else out
+    batch = []
+    for line in render(histogram_rows(word_count_file(path_or_stream), limit), bar_width):
+        batch.append(line)
+        if len(batch) >= batch_size:
+            batch.append("")
+            out.write("\n".join(batch))
+            batch = []
+    if batch:
+        batch.append("")
+        out.write("\n".join(batch))
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else ROBIN
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    print_histogram(path, limit)
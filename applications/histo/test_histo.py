@@ -0,0 +1,44 @@
+import io
+import unittest
+
+from histo import ROBIN, histogram_rows, print_histogram, render
+from word_count import word_count
+
+
+class TestHisto(unittest.TestCase):
+
+    def test_histogram_rows(self):
+        counts = word_count("b c a b c b d")
+        expected = [("b", 3), ("c", 2), ("a", 1), ("d", 1)]
+        self.assertTrue(histogram_rows(counts) == expected)
+        self.assertTrue(histogram_rows(counts, limit=3) == expected[:3])
+        self.assertTrue(histogram_rows(word_count("")) == [])
+
+    def test_render(self):
+        lines = list(render([("the", 3), ("robin", 1)]))
+        self.assertTrue(lines == ["the    ###", "robin  #"])
+
+        lines = list(render([("a", 1000), ("b", 10)], bar_width=50))
+        self.assertTrue(lines == ["a  " + "#" * 50, "b  #"])
+        self.assertTrue(list(render([])) == [])
+
+    def test_print_histogram(self):
+        out = io.StringIO()
+        print_histogram(ROBIN, out=out, batch_size=7)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[0] == "the              " + "#" * 48)
+        self.assertTrue(lines[3] == "a                " + "#" * 24)
+        with open(ROBIN) as f:
+            self.assertTrue(len(lines) == len(word_count(f.read())))
+
+        out = io.StringIO()
+        print_histogram(ROBIN, limit=2, out=out)
+        self.assertTrue(out.getvalue() == "the  " + "#" * 48 + "\nand  " + "#" * 36 + "\n")
+
+        out = io.StringIO()
+        print_histogram(io.StringIO("... ;;"), out=out)
+        self.assertTrue(out.getvalue() == "")
+
+
+if __name__ == '__main__':
+    unittest.main()
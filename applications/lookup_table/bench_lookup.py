@@ -0,0 +1,47 @@
+"""
+Time to first answer for slowfun: lazy computation vs the precomputed table.
+
+    python bench_lookup.py [workers]
+
+lazy         compute on first use, so the first query for (13, 5) pays for
+             the whole factorial
+eager build  precompute the whole domain on a process pool
+load         open the saved table, as every run after the first does
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from lookup_builder import DOMAIN, build_table, load_table, slowfun_too_slow, table_key
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+
+    lazy_first, _ = timed(lambda: slowfun_too_slow(13, 5))
+    lazy_all, _ = timed(lambda: [slowfun_too_slow(x, y) for x, y in DOMAIN])
+    build_time, table = timed(lambda: build_table(workers=workers))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "slowfun.htbl")
+        table.save(path)
+
+        def load_and_query():
+            mapped = load_table(path)
+            return mapped, mapped.get(table_key(13, 5))
+
+        load_time, (mapped, _) = timed(load_and_query)
+        mapped.close()
+
+    print(f"lazy, first query for (13, 5)       {lazy_first:8.3f}s")
+    print(f"lazy, every pair once               {lazy_all:8.3f}s")
+    print(f"eager build on {workers:2} workers          {build_time:8.3f}s")
+    print(f"load saved table + first query      {load_time:8.5f}s")
@@ -0,0 +1,108 @@
+"""
+Eagerly precomputed lookup table for slowfun.
+
+The domain of slowfun is small and known up front (x in 2..13, y in 3..5),
+but the big pairs cost seconds each (13 ** 5 = 371293, and that's the
+number we take the factorial of). build_table() computes the whole domain
+across a process pool, save/load keep it in a memory-mapped HashTable file
+so later runs start with every answer ready.
+
+    python lookup_builder.py [path] [x,y ...]
+        build and save the table (for the whole domain if no pairs given)
+"""
+
+import math
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "hashtable"))
+from hashtable import HashTable
+
+DOMAIN = [(x, y) for x in range(2, 14) for y in range(3, 6)]
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "slowfun_table.htbl")
+
+
+def slowfun_too_slow(x, y):
+    v = math.pow(x, y)
+    # factorial() no longer takes floats (Python 3.10+)
+    v = math.factorial(int(v))
+    v //= (x + y)
+    v %= 982451653
+
+    return v
+
+
+def table_key(x, y):
+    return f"{x},{y}"
+
+
+def _compute(pair):
+    return pair, slowfun_too_slow(*pair)
+
+
+def build_table(domain=DOMAIN, workers=None):
+    """
+    Compute slowfun for every (x, y) in `domain` across `workers`
+    processes (default: one per CPU; 1 computes in this process) and
+    return a HashTable of table_key(x, y) -> value.
+    """
+    # Most expensive first, so no worker is left with a big pair at the end
+    pairs = sorted(domain, key=lambda pair: pair[0] ** pair[1], reverse=True)
+    if workers == 1:
+        results = [_compute(pair) for pair in pairs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_compute, pairs))
+    return HashTable.from_items((table_key(x, y), value) for (x, y), value in results)
+
+
+def load_table(path=TABLE_PATH):
+    """
+    Open a saved table. Lookups read straight from the mapped file.
+    """
+    return HashTable.open_mmap(path)
+
+
+def _load_current(path, domain):
+    """
+    The table saved at `path` if there is one and it covers `domain`,
+    otherwise None.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        table = load_table(path)
+    except ValueError:
+        # Not a table file, or one from an unsupported format version
+        return None
+    if any(table.get(table_key(x, y)) is None for x, y in domain):
+        # Saved for a smaller domain
+        table.close()
+        return None
+    return table
+
+
+def load_or_build(path=TABLE_PATH, domain=DOMAIN):
+    """
+    Load the table saved at `path`, building and saving it first if
+    there isn't one yet, or the saved one is unreadable or stale (missing
+    some of `domain`).
+    """
+    table = _load_current(path, domain)
+    if table is None:
+        # Build from a fresh interpreter running this file. Pool workers
+        # started with "spawn" re-import the caller's __main__, and
+        # lookup_table.py can't keep its module-level loop out of them
+        pairs = [table_key(x, y) for x, y in domain]
+        subprocess.run([sys.executable, os.path.abspath(__file__), path, *pairs], check=True)
+        table = load_table(path)
+    return table
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else TABLE_PATH
+    domain = [tuple(int(n) for n in pair.split(",")) for pair in sys.argv[2:]] or DOMAIN
+    build_table(domain).save(path)
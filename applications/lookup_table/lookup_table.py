@@ -1,32 +1,41 @@
-import random, math
+import random
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "hashtable"))
+from caching import memoize
+from lookup_builder import load_or_build, slowfun_too_slow, table_key
+
 # For expensive operations, caching the results in a lookup table speeds future queries.
 # The lookup table can be built in advance by iterating over all values in the domain of the function and recording the results.
 # Or, more lazily, can be build as the individual values are passed in.
 # Modify the code in this directory to build a lookup table so that it can finish running in under a minute.
 # There's no test file for this. It's counting to 50,000, so if it finishes before you give up, then you're golden.
 
-def slowfun_too_slow(x, y):
-    v = math.pow(x, y)
-    v = math.factorial(v)
-    v //= (x + y)
-    v %= 982451653
+# slowfun_too_slow() lives in lookup_builder so pool workers can import it
+# without running this script
+
 
-    return v
+# The whole domain, precomputed in parallel by lookup_builder and loaded
+# from disk (built and saved on the first run)
+table = load_or_build()
 
 
-# create cache for slowfun values
-cache = {}
+# Bounded cache for anything outside the precomputed domain
+@memoize(max_entries=64)
+def slowfun_uncached(x, y):
+    return slowfun_too_slow(x, y)
+
 
 def slowfun(x, y):
     """
     Rewrite slowfun_too_slow() in here so that the program produces the same
     output, but completes quickly instead of taking ages to run.
     """
-    item = (x,y)
-    if item not in cache:
-        cache[item] = slowfun_too_slow(x,y)
-
-    return cache[item]
+    value = table.get(table_key(x, y))
+    if value is None:
+        value = slowfun_uncached(x, y)
+    return value
 
 
 
@@ -0,0 +1,63 @@
+import os
+import tempfile
+import unittest
+
+from lookup_builder import build_table, load_or_build, load_table, slowfun_too_slow, table_key
+
+# Cheap corner of the real domain
+DOMAIN = [(x, y) for x in range(2, 5) for y in range(3, 6)]
+
+
+class TestLookupBuilder(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "table.htbl")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assertCovers(self, table, domain):
+        for x, y in domain:
+            self.assertTrue(table.get(table_key(x, y)) == slowfun_too_slow(x, y))
+
+    def test_build_save_load(self):
+        built = build_table(DOMAIN, workers=1)
+        self.assertTrue(len(built) == len(DOMAIN))
+        self.assertCovers(built, DOMAIN)
+
+        built.save(self.path)
+        with load_table(self.path) as table:
+            self.assertCovers(table, DOMAIN)
+
+    def test_build_in_pool(self):
+        self.assertTrue(build_table(DOMAIN[:3], workers=2) == build_table(DOMAIN[:3], workers=1))
+
+    def test_load_or_build(self):
+        # Missing -> built by the builder script
+        with load_or_build(self.path, DOMAIN) as table:
+            self.assertCovers(table, DOMAIN)
+
+        # Current -> loaded as is
+        mtime = os.stat(self.path).st_mtime_ns
+        with load_or_build(self.path, DOMAIN) as table:
+            self.assertCovers(table, DOMAIN)
+        self.assertTrue(os.stat(self.path).st_mtime_ns == mtime)
+
+    def test_load_or_build_stale(self):
+        # Saved for part of the domain -> rebuilt for all of it
+        build_table(DOMAIN[:2], workers=1).save(self.path)
+        with load_or_build(self.path, DOMAIN) as table:
+            self.assertCovers(table, DOMAIN)
+
+    def test_load_or_build_unreadable(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a table file")
+        with self.assertRaises(ValueError):
+            load_table(self.path)
+        with load_or_build(self.path, DOMAIN) as table:
+            self.assertCovers(table, DOMAIN)
+
+
+if __name__ == '__main__':
+    unittest.main()
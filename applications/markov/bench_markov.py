@@ -0,0 +1,104 @@
+"""
+Build and generation speed of MarkovModel on a corpus far larger than
+input.txt, against the dict of duplicated follower lists + random.choice
+that the README hints at.
+
+    python bench_markov.py [megabytes] [sentences]
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from markov import INPUT, MarkovModel, is_start_word, is_stop_word
+
+ROBIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "histo", "robin.txt")
+
+
+def make_corpus(megabytes, seed=0):
+    """
+    Sentences of input.txt and robin.txt drawn at random, with one word in
+    ten swapped for a made-up one so the vocabulary keeps growing.
+    """
+    rng = random.Random(seed)
+    words = []
+    for path in (INPUT, ROBIN):
+        with open(path) as f:
+            words += f.read().split()
+    sentences, current = [], []
+    for word in words:
+        current.append(word)
+        if is_stop_word(word):
+            sentences.append(current)
+            current = []
+
+    corpus, size = [], 0
+    while size < megabytes * 2 ** 20:
+        for word in rng.choice(sentences):
+            if rng.random() < 0.1:
+                word = f"w{int(rng.paretovariate(1.2)) % 100000}"
+            corpus.append(word)
+            size += len(word) + 1
+    return corpus
+
+
+def naive_build(words):
+    followers = {}
+    for word, follower in zip(words, words[1:]):
+        followers.setdefault(word, []).append(follower)
+    starts = [word for word in words if is_start_word(word)]
+    return starts, followers
+
+
+def naive_sentence(starts, followers, rng):
+    sentence = [rng.choice(starts)]
+    while not is_stop_word(sentence[-1]) and len(sentence) < 200:
+        sentence.append(rng.choice(followers[sentence[-1]]))
+    return " ".join(sentence)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def retained(build):
+    """
+    MiB still allocated by build() once it returns.
+    """
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size / 2 ** 20
+
+
+if __name__ == "__main__":
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+
+    words = make_corpus(megabytes)
+    print(f"{megabytes} MiB corpus, {len(words)} words")
+
+    (starts, followers), seconds = timed(naive_build, words)
+    rng = random.Random(0)
+    _, generate = timed(lambda: [naive_sentence(starts, followers, rng) for _ in range(count)])
+    memory = retained(lambda: naive_build(words))
+    print(f"  dict of lists     build {seconds:6.2f}s  {memory:6.1f} MiB  {count / generate:8.0f} sentences/s")
+
+    for order in (1, 2, 3):
+        def build():
+            model = MarkovModel(order)
+            model.add_words(words)
+            model.compile()
+            return model
+
+        model, seconds = timed(build)
+        _, generate = timed(model.generate, count, 0)
+        memory = retained(build)
+        print(f"  MarkovModel({order})    build {seconds:6.2f}s  {memory:6.1f} MiB  {count / generate:8.0f} sentences/s"
+              f"  {len(model.transitions)} prefixes")
@@ -0,0 +1,67 @@
+"""
+Markov model files on a generated corpus split into shards: building
+from files, saving, opening through mmap against rebuilding, merging
+shard models, and generating across 1..N worker processes.
+
+    python bench_markov_file.py [megabytes] [shards] [sentences]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import markov_file
+from bench_markov import make_corpus
+from markov import build_model
+
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    shards = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    count = int(sys.argv[3]) if len(sys.argv) > 3 else 20000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        words = make_corpus(megabytes)
+        paths = []
+        step = len(words) // shards + 1
+        for i in range(shards):
+            paths.append(os.path.join(tmp, f"corpus{i}.txt"))
+            with open(paths[-1], "w") as f:
+                f.write(" ".join(words[i * step:(i + 1) * step]))
+        print(f"{megabytes} MiB corpus in {shards} files, {os.cpu_count()} CPUs")
+
+        model_path = os.path.join(tmp, "model.mkv")
+        model, seconds = timed(build_model, paths, 2)
+        print(f"  build from files       {seconds:7.2f}s")
+        _, seconds = timed(model.save, model_path)
+        print(f"  save                   {seconds:7.2f}s  {os.path.getsize(model_path) / 2 ** 20:.1f} MiB")
+        mapped, seconds = timed(markov_file.open_mmap, model_path)
+        print(f"  open_mmap              {seconds * 1000:7.2f}ms")
+        _, seconds = timed(markov_file.load, model_path)
+        print(f"  load into MarkovModel  {seconds:7.2f}s")
+
+        shard_paths = []
+        for i, path in enumerate(paths):
+            shard_paths.append(os.path.join(tmp, f"shard{i}.mkv"))
+            build_model(path, 2).save(shard_paths[-1])
+        _, seconds = timed(markov_file.merge_files, shard_paths, os.path.join(tmp, "merged.mkv"))
+        print(f"  merge {shards} shards         {seconds:7.2f}s")
+
+        _, seconds = timed(model.generate, count, 0)
+        print(f"  generate, in memory    {count / seconds:9.0f} sentences/s")
+        _, seconds = timed(mapped.generate, count, 0)
+        print(f"  generate, mmap         {count / seconds:9.0f} sentences/s")
+        mapped.close()
+
+        workers = 1
+        while workers <= os.cpu_count():
+            _, seconds = timed(markov_file.generate_parallel, model_path, count, workers=workers)
+            print(f"  parallel, {workers:2} workers   {count / seconds:9.0f} sentences/s")
+            workers *= 2
@@ -1,13 +1,372 @@
+"""
+Markov chain sentence generator.
+
+Words are interned to integer IDs. For every prefix of `order` words the
+model keeps which words followed it as two parallel arrays (follower IDs
+and how often each followed), in a HashTable keyed by the prefix's ID
+tuple. Sampling the next word uses an alias table built from those
+counts, so it's O(1) however many followers a prefix has.
+
+    python markov.py [path] [sentences] [order]
+"""
+
+import os
 import random
+import sys
+from abc import ABC, abstractmethod
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "hashtable"))
+from hashtable import HashTable
+
+INPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "input.txt")
+
+# Give up on sentences that never reach a stop word
+MAX_WORDS = 200
+
+# Words read from a file before they're counted, see add_file
+BLOCK_WORDS = 100000
+
+
+def is_start_word(word):
+    """
+    Starts with a capital, or a " followed by a capital.
+    """
+    if word.startswith('"'):
+        word = word[1:]
+    return word[:1].isupper()
+
+
+def is_stop_word(word):
+    """
+    Ends in . ? or !, or one of them followed by a ".
+    """
+    if word.endswith('"'):
+        word = word[:-1]
+    return word[-1:] in (".", "?", "!")
+
+
+class AliasTable:
+    """
+    Vose's alias method: after O(n) setup, draws index i with probability
+    weights[i] / sum(weights) using one random number.
+    """
+
+    __slots__ = ("prob", "alias")
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        self.prob = array("d", [1.0]) * n
+        self.alias = array("l", range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1 - scaled[s]
+            (small if scaled[l] < 1 else large).append(l)
+        # Whatever is left is 1 up to rounding error
+
+    def sample(self, rng):
+        u = rng.random() * len(self.prob)
+        i = int(u)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+
+class Followers:
+    """
+    The words seen after one prefix: IDs and counts in parallel arrays,
+    with the alias table built on first sample.
+    """
+
+    __slots__ = ("ids", "counts", "_alias")
+
+    def __init__(self, ids=(), counts=()):
+        self.ids = array("l", ids)
+        self.counts = array("l", counts)
+        self._alias = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, counts):
+        """
+        Merge a mapping of follower ID -> count into the arrays.
+        """
+        merged = dict(zip(self.ids, self.counts))
+        for word_id, count in counts.items():
+            merged[word_id] = merged.get(word_id, 0) + count
+        self.ids = array("l", merged.keys())
+        self.counts = array("l", merged.values())
+        self._alias = None
+
+    def sample(self, rng):
+        if self._alias is None:
+            self._alias = AliasTable(self.counts)
+        return self.ids[self._alias.sample(rng)]
+
+
+class Vocabulary:
+    """
+    Word <-> integer ID, IDs handed out in order of first appearance.
+    """
+
+    def __init__(self):
+        self.ids = HashTable()
+        self.words = []
+        # Per ID flags, so generation doesn't re-examine strings
+        self.stops = bytearray()
+
+    def __len__(self):
+        return len(self.words)
+
+    def intern(self, word):
+        word_id = self.ids.get(word)
+        if word_id is None:
+            word_id = len(self.words)
+            self.ids.put(word, word_id)
+            self.words.append(word)
+            self.stops.append(is_stop_word(word))
+        return word_id
+
+
+class SentenceGenerator(ABC):
+    """
+    Sentence generation shared by MarkovModel and the memory-mapped model
+    in markov_file. Subclasses provide the sampling primitives.
+    """
+
+    order = 1
+
+    @abstractmethod
+    def _sample_start(self, rng):
+        """
+        A random sentence-starting prefix (a tuple of IDs), or None.
+        """
+
+    @abstractmethod
+    def _sample_next(self, prefix, rng):
+        """
+        A random follower ID of `prefix`, or None if nothing follows it.
+        """
+
+    @abstractmethod
+    def _is_stop(self, word_id):
+        """
+        Whether word `word_id` ends a sentence.
+        """
+
+    @abstractmethod
+    def _word(self, word_id):
+        """
+        The text of word `word_id`.
+        """
+
+    def generate_sentence(self, rng=random, max_words=MAX_WORDS):
+        """
+        One sentence: a random start prefix, then followers until a stop
+        word (or a prefix nothing ever followed).
+        """
+        prefix = self._sample_start(rng)
+        if prefix is None:
+            return ""
+        sentence = list(prefix)
+        while not self._is_stop(sentence[-1]) and len(sentence) < max_words:
+            word_id = self._sample_next(prefix, rng)
+            if word_id is None:
+                break
+            sentence.append(word_id)
+            prefix = prefix[1:] + (word_id,)
+        return " ".join([self._word(word_id) for word_id in sentence])
+
+    def generate(self, count, seed=None):
+        """
+        `count` sentences, reproducible for a given seed.
+        """
+        rng = random.Random(seed)
+        return [self.generate_sentence(rng) for _ in range(count)]
+
+
+class MarkovModel(SentenceGenerator):
+    """
+    Order-k Markov model of a text: the next word depends on the previous
+    `order` words.
+
+        model = MarkovModel(order=2)
+        model.add_text(text)
+        model.generate(5, seed=1)
+    """
+
+    def __init__(self, order=1):
+        if order < 1:
+            raise ValueError("order must be at least 1")
+        self.order = order
+        self.vocab = Vocabulary()
+        # prefix ID tuple -> Followers
+        self.transitions = HashTable(hash_function=hash)
+        # Prefixes that begin a sentence, as Followers over start IDs
+        self.start_prefixes = []
+        self.starts = Followers()
+        self._start_ids = HashTable(hash_function=hash)
+
+        # Counts added since the last compile, merged in bulk
+        self._pending = HashTable(hash_function=hash)
+        self._pending_starts = HashTable(hash_function=hash)
+
+    def add_text(self, text):
+        self.add_words(text.split())
+
+    def add_words(self, words):
+        """
+        Count the transitions in a list of words. The model can keep
+        learning; later text adds to what's already there.
+        """
+        order = self.order
+        ids = [self.vocab.intern(word) for word in words]
+        pending = self._pending
+        pending_starts = self._pending_starts
+        for i in range(len(ids) - order):
+            pending.increment(tuple(ids[i:i + order + 1]))
+            if is_start_word(words[i]):
+                pending_starts.increment(tuple(ids[i:i + order]))
+
+    def compile(self):
+        """
+        Fold pending counts into the per-prefix follower arrays. Called by
+        generate(); only prefixes that gained followers are rebuilt.
+        """
+        if not self._pending and not self._pending_starts:
+            return
+        grouped = HashTable(hash_function=hash)
+        for edge, count in self._pending.items():
+            prefix = edge[:-1]
+            followers = grouped.get(prefix)
+            if followers is None:
+                followers = {}
+                grouped.put(prefix, followers)
+            followers[edge[-1]] = count
+
+        for prefix, counts in grouped.items():
+            followers = self.transitions.get(prefix)
+            if followers is None:
+                followers = Followers()
+                self.transitions.put(prefix, followers)
+            followers.add(counts)
+
+        start_counts = {}
+        for prefix, count in self._pending_starts.items():
+            start_id = self._start_ids.get(prefix)
+            if start_id is None:
+                start_id = len(self.start_prefixes)
+                self._start_ids.put(prefix, start_id)
+                self.start_prefixes.append(prefix)
+            start_counts[start_id] = count
+        self.starts.add(start_counts)
+
+        self._pending.clear()
+        self._pending_starts.clear()
+
+    def _sample_start(self, rng):
+        self.compile()
+        if not self.start_prefixes:
+            return None
+        return self.start_prefixes[self.starts.sample(rng)]
+
+    def _sample_next(self, prefix, rng):
+        followers = self.transitions.get(prefix)
+        if followers is None:
+            return None
+        return followers.sample(rng)
+
+    def _is_stop(self, word_id):
+        return self.vocab.stops[word_id]
+
+    def _word(self, word_id):
+        return self.vocab.words[word_id]
+
+    @property
+    def words(self):
+        return self.vocab.words
+
+    def iter_transitions(self):
+        """
+        Yield (prefix, follower IDs, counts) for every prefix.
+        """
+        self.compile()
+        for prefix, followers in self.transitions.items():
+            yield prefix, followers.ids, followers.counts
+
+    def iter_starts(self):
+        """
+        Yield (prefix, count) for every sentence-starting prefix.
+        """
+        self.compile()
+        for start_id, count in zip(self.starts.ids, self.starts.counts):
+            yield self.start_prefixes[start_id], count
+
+    def merge(self, other):
+        """
+        Add the counts of another model of the same order: a MarkovModel
+        or a MappedMarkovModel, for example one built on another shard.
+        """
+        if other.order != self.order:
+            raise ValueError(f"Can't merge an order {other.order} model into order {self.order}")
+        intern = self.vocab.intern
+        ids = [intern(word) for word in other.words]
+        pending = self._pending
+        for prefix, follower_ids, counts in other.iter_transitions():
+            prefix = tuple(ids[word_id] for word_id in prefix)
+            for word_id, count in zip(follower_ids, counts):
+                pending.increment(prefix + (ids[word_id],), count)
+        for prefix, count in other.iter_starts():
+            self._pending_starts.increment(tuple(ids[word_id] for word_id in prefix), count)
+
+    def add_file(self, path, block_words=BLOCK_WORDS):
+        """
+        Learn from a text file, reading it in blocks of about
+        `block_words` words instead of all at once.
+        """
+        carry = []
+        block = []
+        with open(path) as f:
+            for line in f:
+                block += line.split()
+                if len(block) >= block_words:
+                    self.add_words(carry + block)
+                    # The last `order` words start transitions into the
+                    # next block, and haven't been counted yet
+                    carry = (carry + block)[-self.order:]
+                    block = []
+        self.add_words(carry + block)
 
-# Read in all the words in one go
-with open("input.txt") as f:
-    words = f.read()
+    def save(self, path):
+        """
+        Write the model to `path` in markov_file's binary format.
+        """
+        import markov_file
+        markov_file.save(self, path)
 
-# TODO: analyze which words can follow other words
-# Your code here
 
+def build_model(paths=INPUT, order=1):
+    """
+    Model of one file or an iterable of files, each read in blocks.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    model = MarkovModel(order)
+    for path in paths:
+        model.add_file(path)
+    return model
 
-# TODO: construct 5 random sentences
-# Your code here
 
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else INPUT
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    order = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+    for sentence in build_model(path, order).generate(count):
+        print(sentence)
+        print()
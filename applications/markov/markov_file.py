@@ -0,0 +1,353 @@
+"""
+Binary file format for Markov models. A saved model generates sentences
+through mmap without being loaded.
+
+Layout (native little-endian arrays, each section 8-byte aligned):
+
+    header          magic b"MRKV", format version, order, number of words,
+                    prefixes, followers, starts and slots, and the size of
+                    the word text
+    word_offsets    int64, num_words + 1: word i is text[offsets[i]:offsets[i+1]]
+    word_text       UTF-8 of every word back to back
+    stops           uint8 per word, 1 for stop words
+    prefix_ids      int32, order per prefix
+    follower_start  int64, num_prefixes + 1: prefix i's followers are
+                    entries follower_start[i] to follower_start[i+1]
+    follower_ids    int32 per follower
+    follower_counts int64 per follower
+    follower_prob   float64 per follower, and
+    follower_alias  int32 per follower: each prefix's alias table, with
+                    indexes local to the prefix
+    start_prefix    int32 per start: the prefix index it starts with
+    start_counts    int64 per start
+    start_prob      float64 per start
+    start_alias     int32 per start
+    slots           (hash, prefix index + 1) uint64 pairs, an open-addressing
+                    index from prefix to prefix index; 0 marks an empty slot
+
+Alias tables are stored precomputed, so a mapped model samples in O(1)
+straight from the file, the same way and with the same results as the
+MarkovModel it was saved from.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from markov import AliasTable, MarkovModel, SentenceGenerator
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "hashtable"))
+from hashing import FNV_OFFSET_64, FNV_PRIME_64, MASK_64
+
+MAGIC = b"MRKV"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sIQQQQQQQ")
+
+# Sentences per job in generate_parallel, so results don't depend on the
+# number of workers
+BATCH_SIZE = 1000
+
+
+def prefix_hash(prefix):
+    """
+    FNV-1a over the IDs of a prefix. Unlike hash(), it's the same in
+    every Python version.
+    """
+    h = FNV_OFFSET_64
+    for word_id in prefix:
+        h = ((h ^ word_id) * FNV_PRIME_64) & MASK_64
+    return h
+
+
+def _sections(order, num_words, num_prefixes, num_followers, num_starts, num_slots, text_size):
+    """
+    (name, typecode, length) of each section after the header, in order.
+    """
+    return [
+        ("word_offsets", "q", num_words + 1),
+        ("word_text", "B", text_size),
+        ("stops", "B", num_words),
+        ("prefix_ids", "i", num_prefixes * order),
+        ("follower_start", "q", num_prefixes + 1),
+        ("follower_ids", "i", num_followers),
+        ("follower_counts", "q", num_followers),
+        ("follower_prob", "d", num_followers),
+        ("follower_alias", "i", num_followers),
+        ("start_prefix", "i", num_starts),
+        ("start_counts", "q", num_starts),
+        ("start_prob", "d", num_starts),
+        ("start_alias", "i", num_starts),
+        ("slots", "Q", num_slots * 2),
+    ]
+
+
+def _aligned(offset):
+    return (offset + 7) & ~7
+
+
+def save(model, path):
+    """
+    Write a model (MarkovModel or MappedMarkovModel) to `path`.
+    """
+    order = model.order
+    words = list(model.words)
+    encoded = [word.encode() for word in words]
+    word_offsets = array("q", [0])
+    for raw in encoded:
+        word_offsets.append(word_offsets[-1] + len(raw))
+    stops = bytearray(model._is_stop(i) for i in range(len(words)))
+
+    prefix_ids = array("i")
+    follower_start = array("q", [0])
+    follower_ids = array("i")
+    follower_counts = array("q")
+    follower_prob = array("d")
+    follower_alias = array("i")
+    prefix_index = {}
+    for prefix, ids, counts in model.iter_transitions():
+        prefix_index[tuple(prefix)] = len(prefix_index)
+        prefix_ids.extend(prefix)
+        follower_ids.fromlist(list(ids))
+        follower_counts.fromlist(list(counts))
+        alias = AliasTable(counts)
+        follower_prob.fromlist(alias.prob.tolist())
+        follower_alias.fromlist(alias.alias.tolist())
+        follower_start.append(len(follower_ids))
+
+    start_prefix = array("i")
+    start_counts = array("q")
+    for prefix, count in model.iter_starts():
+        start_prefix.append(prefix_index[tuple(prefix)])
+        start_counts.append(count)
+    alias = AliasTable(start_counts) if start_counts else None
+    start_prob = array("d", alias.prob if alias else ())
+    start_alias = array("i", alias.alias if alias else ())
+
+    num_prefixes = len(prefix_index)
+    num_slots = 8
+    while num_slots < num_prefixes * 2:
+        num_slots *= 2
+    mask = num_slots - 1
+    slots = array("Q", bytes(num_slots * 2 * 8))
+    for prefix, index in prefix_index.items():
+        h = prefix_hash(prefix)
+        slot = h & mask
+        while slots[slot * 2 + 1] != 0:
+            slot = (slot + 1) & mask
+        slots[slot * 2] = h
+        slots[slot * 2 + 1] = index + 1
+
+    data = {
+        "word_offsets": word_offsets,
+        "word_text": b"".join(encoded),
+        "stops": bytes(stops),
+        "prefix_ids": prefix_ids,
+        "follower_start": follower_start,
+        "follower_ids": follower_ids,
+        "follower_counts": follower_counts,
+        "follower_prob": follower_prob,
+        "follower_alias": follower_alias,
+        "start_prefix": start_prefix,
+        "start_counts": start_counts,
+        "start_prob": start_prob,
+        "start_alias": start_alias,
+        "slots": slots,
+    }
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, order, len(words), num_prefixes,
+                            len(follower_ids), len(start_counts), num_slots,
+                            word_offsets[-1]))
+        offset = HEADER.size
+        for name, _, _ in _sections(order, len(words), num_prefixes, len(follower_ids),
+                                    len(start_counts), num_slots, word_offsets[-1]):
+            f.write(bytes(_aligned(offset) - offset))
+            section = data[name]
+            if isinstance(section, array):
+                if sys.byteorder != "little":
+                    section = array(section.typecode, section)
+                    section.byteswap()
+                section = section.tobytes()
+            f.write(section)
+            offset = _aligned(offset) + len(section)
+    # Readers never see a half-written file
+    os.replace(tmp_path, path)
+
+
+class MappedMarkovModel(SentenceGenerator):
+    """
+    Read-only model over a file written by save(). Sections are viewed in
+    place through the mapping; opening it reads only the header.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"{path} is not a Markov model file")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, order, num_words, num_prefixes, num_followers, num_starts,
+         num_slots, text_size) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a Markov model file")
+        if version != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"Unsupported Markov model file version {version}")
+
+        self.path = path
+        self.order = order
+        self.num_words = num_words
+        self.num_prefixes = num_prefixes
+        self.num_slots = num_slots
+
+        view = memoryview(self._mm)
+        self._views = [view]
+        offset = HEADER.size
+        for name, typecode, length in _sections(order, num_words, num_prefixes, num_followers,
+                                                num_starts, num_slots, text_size):
+            offset = _aligned(offset)
+            size = length * array(typecode).itemsize
+            section = view[offset:offset + size].cast(typecode)
+            if sys.byteorder != "little" and typecode != "B":
+                section = array(typecode, section)
+                section.byteswap()
+            else:
+                self._views.append(section)
+            setattr(self, name, section)
+            offset += size
+
+    def _find(self, prefix):
+        """
+        Index of `prefix`, or -1 if nothing ever followed it.
+        """
+        h = prefix_hash(prefix)
+        slots = self.slots
+        mask = self.num_slots - 1
+        slot = h & mask
+        order = self.order
+        while True:
+            index = slots[slot * 2 + 1]
+            if index == 0:
+                return -1
+            index -= 1
+            if slots[slot * 2] == h and \
+                    tuple(self.prefix_ids[index * order:(index + 1) * order]) == prefix:
+                return index
+            slot = (slot + 1) & mask
+
+    def _sample_start(self, rng):
+        n = len(self.start_prefix)
+        if n == 0:
+            return None
+        u = rng.random() * n
+        i = int(u)
+        if u - i >= self.start_prob[i]:
+            i = self.start_alias[i]
+        index = self.start_prefix[i]
+        return tuple(self.prefix_ids[index * self.order:(index + 1) * self.order])
+
+    def _sample_next(self, prefix, rng):
+        index = self._find(prefix)
+        if index < 0:
+            return None
+        base = self.follower_start[index]
+        u = rng.random() * (self.follower_start[index + 1] - base)
+        i = int(u)
+        if u - i >= self.follower_prob[base + i]:
+            i = self.follower_alias[base + i]
+        return self.follower_ids[base + i]
+
+    def _is_stop(self, word_id):
+        return self.stops[word_id]
+
+    def _word(self, word_id):
+        return bytes(self.word_text[self.word_offsets[word_id]:self.word_offsets[word_id + 1]]).decode()
+
+    @property
+    def words(self):
+        return [self._word(i) for i in range(self.num_words)]
+
+    def iter_transitions(self):
+        order = self.order
+        start = self.follower_start
+        for index in range(self.num_prefixes):
+            lo, hi = start[index], start[index + 1]
+            yield (tuple(self.prefix_ids[index * order:(index + 1) * order]),
+                   self.follower_ids[lo:hi], self.follower_counts[lo:hi])
+
+    def iter_starts(self):
+        order = self.order
+        for index, count in zip(self.start_prefix, self.start_counts):
+            yield tuple(self.prefix_ids[index * order:(index + 1) * order]), count
+
+    def close(self):
+        # Views into the mapping have to go before it can close
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_mmap(path):
+    return MappedMarkovModel(path)
+
+
+def load(path):
+    """
+    Read a saved model back into a MarkovModel that can keep learning.
+    """
+    with MappedMarkovModel(path) as mapped:
+        model = MarkovModel(mapped.order)
+        model.merge(mapped)
+        model.compile()
+    return model
+
+
+def merge_files(paths, out_path):
+    """
+    Merge models saved from separate shards into one file.
+    """
+    model = None
+    for path in paths:
+        with MappedMarkovModel(path) as shard:
+            if model is None:
+                model = MarkovModel(shard.order)
+            model.merge(shard)
+    model.save(out_path)
+    return model
+
+
+def _generate_batch(job):
+    path, count, seed = job
+    with MappedMarkovModel(path) as model:
+        return model.generate(count, seed)
+
+
+def generate_parallel(path, count, workers=None, seed=0, batch_size=BATCH_SIZE):
+    """
+    `count` sentences from the model saved at `path`, generated in batches
+    across `workers` processes (default: one per CPU). Each batch has its
+    own RNG seeded from (seed, batch number), so the output is the same
+    for any number of workers.
+    """
+    jobs = [(path, min(batch_size, count - start), f"{seed}:{start // batch_size}")
+            for start in range(0, count, batch_size)]
+    if workers == 1:
+        batches = [_generate_batch(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            batches = list(pool.map(_generate_batch, jobs))
+    return [sentence for batch in batches for sentence in batch]
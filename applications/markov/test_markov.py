@@ -0,0 +1,97 @@
+import random
+import unittest
+from collections import Counter
+
+from markov import (INPUT, AliasTable, MarkovModel, SentenceGenerator, build_model,
+                    is_start_word, is_stop_word)
+
+
+def transition_counts(model):
+    model.compile()
+    words = model.vocab.words
+    return {
+        (tuple(words[i] for i in prefix), words[word_id]): count
+        for prefix, followers in model.transitions.items()
+        for word_id, count in zip(followers.ids, followers.counts)
+    }
+
+
+class TestMarkov(unittest.TestCase):
+
+    def test_start_and_stop_words(self):
+        self.assertTrue(is_start_word("Alice") and is_start_word('"Kitty'))
+        self.assertTrue(not is_start_word("alice") and not is_start_word('"'))
+        self.assertTrue(is_stop_word("end.") and is_stop_word('how?"') and is_stop_word("oh!"))
+        self.assertTrue(not is_stop_word("and,") and not is_stop_word(""))
+
+    def test_alias_table(self):
+        rng = random.Random(0)
+        table = AliasTable([1, 0, 3, 6])
+        draws = Counter(table.sample(rng) for _ in range(20000))
+        self.assertTrue(draws[1] == 0)
+        for i, weight in ((0, 1), (2, 3), (3, 6)):
+            self.assertTrue(abs(draws[i] / 20000 - weight / 10) < 0.02)
+        self.assertTrue(AliasTable([5]).sample(rng) == 0)
+
+    def test_readme_example(self):
+        model = MarkovModel()
+        model.add_text("Cats and dogs and birds and fish dogs birds")
+        counts = transition_counts(model)
+        self.assertTrue(counts[(("and",), "dogs")] == 1)
+        self.assertTrue(counts[(("dogs",), "and")] == 1 and counts[(("dogs",), "birds")] == 1)
+        self.assertTrue(sum(1 for prefix, _ in counts if prefix == ("and",)) == 3)
+        self.assertTrue(model.start_prefixes == [(model.vocab.ids["Cats"],)])
+
+    def test_generate(self):
+        with open(INPUT) as f:
+            text = f.read()
+        words = text.split()
+        for order in (1, 2, 3):
+            model = build_model(INPUT, order)
+            seen = {tuple(words[i:i + order + 1]) for i in range(len(words) - order)}
+            sentences = model.generate(50, seed=order)
+            self.assertTrue(sentences == model.generate(50, seed=order))
+            for sentence in sentences:
+                out = sentence.split()
+                self.assertTrue(is_start_word(out[0]))
+                self.assertTrue(is_stop_word(out[-1]) or len(out) >= 200
+                                or tuple(out[-order:]) not in {gram[:-1] for gram in seen})
+                for i in range(len(out) - order):
+                    self.assertTrue(tuple(out[i:i + order + 1]) in seen)
+
+        with self.assertRaises(ValueError):
+            MarkovModel(order=0)
+        self.assertTrue(MarkovModel().generate(2) == ["", ""])
+
+    def test_incremental(self):
+        with open(INPUT) as f:
+            words = f.read().split()
+        half = len(words) // 2
+
+        whole = MarkovModel(order=2)
+        whole.add_words(words)
+
+        pieces = MarkovModel(order=2)
+        pieces.add_words(words[:half + 2])
+        pieces.generate(3, seed=1)
+        pieces.add_words(words[half:])
+        self.assertTrue(transition_counts(pieces) == transition_counts(whole))
+
+    def test_incomplete_generator(self):
+        class NoWords(SentenceGenerator):
+            def _sample_start(self, rng):
+                return None
+
+            def _sample_next(self, prefix, rng):
+                return None
+
+            def _is_stop(self, word_id):
+                return True
+
+        # Fails when it's made, not halfway through a sentence
+        with self.assertRaises(TypeError):
+            NoWords()
+
+
+if __name__ == '__main__':
+    unittest.main()
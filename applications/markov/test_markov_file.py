@@ -0,0 +1,96 @@
+import os
+import tempfile
+import unittest
+
+import markov_file
+from markov import INPUT, MarkovModel, build_model
+from test_markov import transition_counts
+
+
+class TestMarkovFile(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "model.mkv")
+        with open(INPUT) as f:
+            self.words = f.read().split()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_add_file_in_blocks(self):
+        whole = MarkovModel(order=2)
+        whole.add_words(self.words)
+        blocks = MarkovModel(order=2)
+        blocks.add_file(INPUT, block_words=50)
+        self.assertTrue(transition_counts(blocks) == transition_counts(whole))
+        self.assertTrue(list(blocks.iter_starts()) == list(whole.iter_starts()))
+
+    def test_save_and_mmap(self):
+        for order in (1, 3):
+            model = build_model(INPUT, order)
+            model.save(self.path)
+            with markov_file.open_mmap(self.path) as mapped:
+                self.assertTrue(mapped.order == order)
+                self.assertTrue(mapped.words == model.words)
+                # Same alias tables, so the same sentences for a seed
+                self.assertTrue(mapped.generate(100, seed=7) == model.generate(100, seed=7))
+                self.assertTrue(mapped._sample_next((-1,) * order, None) is None)
+
+        loaded = markov_file.load(self.path)
+        self.assertTrue(transition_counts(loaded) == transition_counts(model))
+
+    def test_bad_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a model" * 10)
+        with self.assertRaises(ValueError):
+            markov_file.open_mmap(self.path)
+
+        MarkovModel().save(self.path)
+        with markov_file.open_mmap(self.path) as mapped:
+            self.assertTrue(mapped.generate(2) == ["", ""])
+
+    def test_incremental_update(self):
+        half = len(self.words) // 2
+        model = MarkovModel()
+        model.add_words(self.words[:half + 1])
+        model.save(self.path)
+
+        model = markov_file.load(self.path)
+        model.add_words(self.words[half:])
+        model.save(self.path)
+
+        whole = MarkovModel()
+        whole.add_words(self.words)
+        self.assertTrue(transition_counts(markov_file.load(self.path)) == transition_counts(whole))
+
+    def test_merge_shards(self):
+        half = len(self.words) // 2
+        shards = []
+        for i, words in enumerate((self.words[:half + 2], self.words[half:])):
+            shard = MarkovModel(order=2)
+            shard.add_words(words)
+            shards.append(os.path.join(self.tmp.name, f"shard{i}.mkv"))
+            shard.save(shards[-1])
+
+        merged = markov_file.merge_files(shards, self.path)
+        whole = MarkovModel(order=2)
+        whole.add_words(self.words)
+        self.assertTrue(transition_counts(merged) == transition_counts(whole))
+        self.assertTrue(transition_counts(markov_file.load(self.path)) == transition_counts(whole))
+
+        with self.assertRaises(ValueError):
+            MarkovModel(order=1).merge(merged)
+
+    def test_generate_parallel(self):
+        build_model(INPUT, 2).save(self.path)
+        serial = markov_file.generate_parallel(self.path, 250, workers=1, seed=3, batch_size=100)
+        self.assertTrue(len(serial) == 250)
+        self.assertTrue(serial == markov_file.generate_parallel(self.path, 250, workers=2,
+                                                                seed=3, batch_size=100))
+        self.assertTrue(serial != markov_file.generate_parallel(self.path, 250, workers=1,
+                                                                seed=4, batch_size=100))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Deduplicating a generated token file: dict.fromkeys on the whole text,
+iter_unique over a stream, and the two-pass Bloom filter mode. Reports
+time and peak traced memory.
+
+    python bench_no_dups.py [tokens] [distinct]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from no_dups import iter_file_tokens, iter_unique, iter_unique_bounded
+
+
+def make_tokens(path, tokens, distinct, seed=0):
+    """
+    Most tokens appear once; a small vocabulary repeats often.
+    """
+    rng = random.Random(seed)
+    common = [f"c{i}" for i in range(distinct // 100 + 1)]
+    with open(path, "w") as f:
+        for start in range(0, tokens, 10000):
+            line = [rng.choice(common) if rng.random() < 0.5 else f"u{rng.randrange(distinct)}"
+                    for _ in range(min(10000, tokens - start))]
+            f.write(" ".join(line) + "\n")
+
+
+def in_memory(path):
+    with open(path) as f:
+        return sum(1 for _ in dict.fromkeys(f.read().split()))
+
+
+def streaming(path):
+    return sum(1 for _ in iter_unique(iter_file_tokens(path)))
+
+
+def bounded(path, capacity):
+    return sum(1 for _ in iter_unique_bounded(lambda: iter_file_tokens(path), capacity))
+
+
+def measure(fn, *args):
+    start = time.perf_counter()
+    count = fn(*args)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    fn(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return count, seconds, peak
+
+
+if __name__ == "__main__":
+    tokens = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    distinct = int(sys.argv[2]) if len(sys.argv) > 2 else 400000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tokens.txt")
+        make_tokens(path, tokens, distinct)
+        print(f"{tokens} tokens, {os.path.getsize(path) / 2 ** 20:.1f} MiB")
+        runs = [
+            ("dict.fromkeys(text)", in_memory, path),
+            ("iter_unique", streaming, path),
+            ("bounded, 1% filter", bounded, path, distinct),
+        ]
+        for label, fn, *args in runs:
+            count, seconds, peak = measure(fn, *args)
+            print(f"  {label:20} {count:8} unique  {seconds:6.2f}s  peak {peak / 2 ** 20:7.1f} MiB")
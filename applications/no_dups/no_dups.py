@@ -1,8 +1,105 @@
+import math
+import os
+import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "hashtable"))
+from hashtable import HashTable
+
+
+class BloomFilter:
+    """
+    Set membership in a fixed number of bits. `in` can answer True for a
+    word never added (with probability about `error_rate` once `capacity`
+    words are in) but never False for one that was.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(1, capacity)
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, word):
+        # Double hashing: num_hashes bit positions from one 64-bit hash.
+        # Python's hash() is only stable within a process, which is all a
+        # filter held in memory needs
+        key_hash = hash(word) & 0xffffffffffffffff
+        h1 = key_hash & 0xffffffff
+        h2 = (key_hash >> 32) | 1
+        num_bits = self.num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self.num_hashes)]
+
+    def add(self, word):
+        """
+        Add a word; return True if it may have been added before.
+        """
+        bits = self.bits
+        present = True
+        for position in self._positions(word):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not bits[byte] & mask:
+                present = False
+                bits[byte] |= mask
+        return present
+
+    def __contains__(self, word):
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(word))
+
+
+def iter_unique(tokens):
+    """
+    Yield each token the first time it appears, in order. Memory grows
+    with the number of distinct tokens.
+    """
+    # HashTable iteration order isn't insertion order, so tokens are
+    # yielded as they're first seen instead of collected in the table
+    seen = HashTable()
+    for token in tokens:
+        if token not in seen:
+            seen[token] = True
+            yield token
+
+
+def iter_unique_bounded(make_tokens, capacity, error_rate=0.01):
+    """
+    iter_unique for inputs with too many distinct tokens to hold. Takes a
+    callable returning a fresh token iterator, since the input is read
+    twice:
+
+    1. Every token goes into a Bloom filter sized for `capacity` distinct
+       tokens. Tokens the filter has (maybe) already seen are candidate
+       repeats and are kept exactly.
+    2. A token that's not a candidate occurred once and is yielded as is;
+       candidates are yielded on their first occurrence.
+
+    Exact memory is only spent on repeated tokens (plus false positives),
+    not on the whole vocabulary.
+    """
+    bloom = BloomFilter(capacity, error_rate)
+    candidates = HashTable()
+    for token in make_tokens():
+        if bloom.add(token):
+            candidates[token] = False
+
+    for token in make_tokens():
+        emitted = candidates.get(token)
+        if emitted is None:
+            yield token
+        elif not emitted:
+            candidates[token] = True
+            yield token
+
+
+def iter_file_tokens(path):
+    """
+    Whitespace-separated tokens of a file, read a line at a time.
+    """
+    with open(path) as f:
+        for line in f:
+            yield from line.split()
 
-cache = {}
 
-# could use fromkeys() method instead?
 def no_dups(s):
     """
     Input: a string of words separated by spaces. Only the letters a-z are utilized.
@@ -11,15 +108,7 @@ def no_dups(s):
     There must be no extra spaces at the end of your returned string.
     The solution must be O(n).
     """
-    words = s.split()
-
-    for word in words:
-        if word in cache:
-            pass
-        else:
-            cache[word] = 1
-    return " ".join(list(cache.keys()))
-
+    return " ".join(iter_unique(s.split()))
 
 
 if __name__ == "__main__":
@@ -27,4 +116,4 @@ if __name__ == "__main__":
     print(no_dups("hello"))
     print(no_dups("hello hello"))
     print(no_dups("cats dogs fish cats dogs"))
-    print(no_dups("spam spam spam eggs spam sausage spam spam and spam"))
\ No newline at end of file
+    print(no_dups("spam spam spam eggs spam sausage spam spam and spam"))
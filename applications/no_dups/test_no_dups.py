@@ -1,6 +1,9 @@
+import os
+import random
+import tempfile
 import unittest
 
-from no_dups import no_dups
+from no_dups import BloomFilter, iter_file_tokens, iter_unique, iter_unique_bounded, no_dups
 
 
 class TestNoDups(unittest.TestCase):
@@ -17,6 +20,53 @@ class TestNoDups(unittest.TestCase):
         x = no_dups("spam spam spam eggs spam sausage spam spam and spam")
         self.assertTrue(x == "spam eggs sausage and")
 
+    def test_no_state_between_calls(self):
+        self.assertTrue(no_dups("cats dogs") == "cats dogs")
+        self.assertTrue(no_dups("dogs fish") == "dogs fish")
+
+    def test_iter_unique_is_lazy(self):
+        def tokens():
+            yield "a"
+            yield "a"
+            yield "b"
+            raise AssertionError("read past what was asked for")
+
+        unique = iter_unique(tokens())
+        self.assertTrue(next(unique) == "a")
+        self.assertTrue(next(unique) == "b")
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter(1000, error_rate=0.01)
+        words = [f"word{i}" for i in range(1000)]
+        for word in words:
+            self.assertTrue(not bloom.add(word) or word in bloom)
+        for word in words:
+            self.assertTrue(word in bloom)
+            self.assertTrue(bloom.add(word))
+
+        false_positives = sum(f"other{i}" in bloom for i in range(10000))
+        self.assertTrue(false_positives < 300)
+
+    def test_iter_unique_bounded(self):
+        rng = random.Random(3)
+        tokens = [f"w{rng.randrange(5000)}" for _ in range(20000)]
+        expected = list(iter_unique(tokens))
+
+        # Exact even when the filter is far too small
+        for capacity in (10, 1000, 10000):
+            x = list(iter_unique_bounded(lambda: iter(tokens), capacity))
+            self.assertTrue(x == expected)
+
+        self.assertTrue(list(iter_unique_bounded(lambda: iter([]), 10)) == [])
+
+    def test_file_tokens(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.txt")
+            with open(path, "w") as f:
+                f.write("spam eggs\nspam  sausage\n\neggs and\n")
+            x = list(iter_unique_bounded(lambda: iter_file_tokens(path), 100))
+            self.assertTrue(x == ["spam", "eggs", "sausage", "and"])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,44 @@
+"""
+sumdiff solvers against the O(n^4) loops: the HashTable join and the
+NumPy sort join, on random q of n numbers drawn from a wide range (few
+matches, so the join itself is measured, not the output).
+
+    python bench_sumdiff.py [max_n] [max_n for HashTable]
+"""
+
+import random
+import sys
+import time
+
+import sumdiff as sumdiff_module
+from sumdiff import sumdiff, sumdiff_numpy
+from test_sumdiff import naive
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    max_n = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    max_table_n = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    rng = random.Random(0)
+
+    print(f"{'n':>6} {'matches':>8} {'naive':>9} {'HashTable':>10} {'NumPy':>9}")
+    n = 10
+    while n <= max_n:
+        q = rng.sample(range(n * n * 4), n)
+        matches = "-"
+        naive_time = table_time = numpy_time = "-"
+        if n <= 40:
+            naive_time = f"{timed(naive, q)[1]:.2f}s"
+        if n <= max_table_n:
+            result, seconds = timed(sumdiff, q)
+            matches, table_time = len(result), f"{seconds:.3f}s"
+        if sumdiff_module.np is not None:
+            result, seconds = timed(sumdiff_numpy, q)
+            matches, numpy_time = len(result), f"{seconds:.3f}s"
+        print(f"{n:6} {matches:>8} {naive_time:>9} {table_time:>10} {numpy_time:>9}")
+        n *= 2
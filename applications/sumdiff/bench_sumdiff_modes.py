@@ -0,0 +1,60 @@
+"""
+sumdiff output modes on q = 1..n, where matches grow like n^3: building
+the full list, consuming the generator, counting only, and the
+partitioned solver across 1..N worker processes. Reports time and peak
+traced memory (the partitioned runs only trace the parent process).
+
+    python bench_sumdiff_modes.py [n]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+import sumdiff as sumdiff_module
+from sumdiff import count_sumdiff, count_sumdiff_numpy, iter_sumdiff, sumdiff, sumdiff_partitioned
+
+
+def consume(q):
+    count = 0
+    for _ in iter_sumdiff(q):
+        count += 1
+    return count
+
+
+def measure(fn, *args, **kwargs):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result if isinstance(result, int) else len(result), seconds, peak
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    q = range(1, n + 1)
+
+    runs = [
+        ("full list", sumdiff, {}),
+        ("generator", consume, {}),
+        ("count only", count_sumdiff, {}),
+    ]
+    if sumdiff_module.np is not None:
+        runs.append(("count only, NumPy", count_sumdiff_numpy, {}))
+    workers = 1
+    while workers <= os.cpu_count():
+        runs.append((f"partitioned x{workers}", sumdiff_partitioned, {"workers": workers}))
+        runs.append((f"partitioned x{workers}, count", sumdiff_partitioned,
+                     {"workers": workers, "count_only": True}))
+        workers *= 2
+
+    print(f"q = 1..{n}, {os.cpu_count()} CPUs")
+    baseline = None
+    for label, fn, kwargs in runs:
+        matches, seconds, peak = measure(fn, q, **kwargs)
+        baseline = baseline or seconds
+        print(f"  {label:26} {matches:10} matches  {seconds:7.2f}s  x{baseline / seconds:6.1f}"
+              f"  peak {peak / 2 ** 20:8.1f} MiB")
@@ -3,6 +3,18 @@ find all a, b, c, d in q such that
 f(a) + f(b) = f(c) - f(d)
 """
 
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "hashtable"))
+from hashtable import HashTable
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
 #q = set(range(1, 10))
 #q = set(range(1, 200))
 q = (1, 3, 4, 7, 12)
@@ -11,5 +23,178 @@ q = (1, 3, 4, 7, 12)
 def f(x):
     return x * 4 + 6
 
-# Your code here
 
+def sum_table(q, fn=f, part=0, parts=1):
+    """
+    HashTable of every f(a) + f(b) over ordered pairs from q -> list of
+    the (a, b) pairs giving it. f is called once per element. With
+    parts > 1, only sums with hash(sum) % parts == part are kept.
+    """
+    values = [(x, fn(x)) for x in q]
+    sums = HashTable(hash_function=hash)
+    # f(a) + f(b) == f(b) + f(a), so at most n(n+1)/2 distinct sums
+    sums.reserve(len(values) * (len(values) + 1) // 2 // parts)
+    for a, fa in values:
+        for b, fb in values:
+            total = fa + fb
+            if parts > 1 and hash(total) % parts != part:
+                continue
+            pairs = sums.get(total)
+            if pairs is None:
+                sums.put(total, [(a, b)])
+            else:
+                pairs.append((a, b))
+    return sums
+
+
+def iter_sumdiff(q, fn=f):
+    """
+    Yield every (a, b, c, d) from q with f(a) + f(b) == f(c) - f(d), as
+    a hash join: sums go into a table, then each difference is looked up
+    in it. O(n^2) plus the size of the output, instead of O(n^4), and
+    matches come out one at a time instead of all in a list.
+    """
+    q = list(q)
+    sums = sum_table(q, fn)
+    values = [(x, fn(x)) for x in q]
+    for c, fc in values:
+        for d, fd in values:
+            pairs = sums.get(fc - fd)
+            if pairs is not None:
+                for a, b in pairs:
+                    yield a, b, c, d
+
+
+def sumdiff(q, fn=f):
+    """
+    List of every (a, b, c, d) from q with f(a) + f(b) == f(c) - f(d).
+    """
+    return list(iter_sumdiff(q, fn))
+
+
+def _count_part(fx, part, parts):
+    # Pairs per sum times pairs per equal difference, for the values in
+    # one partition of the keyspace
+    sum_counts = HashTable(hash_function=hash)
+    diff_counts = HashTable(hash_function=hash)
+    for fa in fx:
+        for fb in fx:
+            total, diff = fa + fb, fa - fb
+            if parts == 1 or hash(total) % parts == part:
+                sum_counts.increment(total)
+            if parts == 1 or hash(diff) % parts == part:
+                diff_counts.increment(diff)
+    return sum(count * sum_counts.get(diff, 0) for diff, count in diff_counts.items())
+
+
+def count_sumdiff(q, fn=f):
+    """
+    Number of matches without listing them: how many pairs give each sum
+    times how many give the same difference, added up over all values.
+    O(n^2) whatever the size of the output.
+    """
+    return _count_part([fn(x) for x in q], 0, 1)
+
+
+def _solve_part(job):
+    """
+    Matches (or their count) whose sum falls in one partition of the sum
+    keyspace: hash(sum) % parts == part. Runs in pool workers.
+    """
+    q, fn, part, parts, count_only = job
+    if count_only:
+        return _count_part([fn(x) for x in q], part, parts)
+
+    sums = sum_table(q, fn, part, parts)
+    values = [(x, fn(x)) for x in q]
+    matches = []
+    for c, fc in values:
+        for d, fd in values:
+            pairs = sums.get(fc - fd)
+            if pairs is not None:
+                matches.extend((a, b, c, d) for a, b in pairs)
+    return matches
+
+
+def sumdiff_partitioned(q, fn=f, workers=None, parts=None, count_only=False):
+    """
+    sumdiff (or count_sumdiff with count_only) with the sum keyspace split
+    into `parts` partitions (default: one per worker) solved in separate
+    processes. Each process only holds the sum table of its partition.
+    fn has to be picklable, so a module-level function, not a lambda.
+    """
+    q = list(q)
+    workers = workers or os.cpu_count()
+    parts = parts or workers
+    jobs = [(q, fn, part, parts, count_only) for part in range(parts)]
+    if workers == 1:
+        results = [_solve_part(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_solve_part, jobs))
+
+    if count_only:
+        return sum(results)
+    return [match for result in results for match in result]
+
+
+def sumdiff_numpy(q, fn=f):
+    """
+    sumdiff with the pairs generated by broadcasting. fn must work on
+    NumPy arrays. Sums are sorted once and every difference finds its
+    range of equal sums with searchsorted, the vectorized form of the
+    hash join (a sort join).
+
+    Returns an (n, 4) array of (a, b, c, d) rows.
+    """
+    if np is None:
+        raise ImportError("sumdiff_numpy needs NumPy")
+    q = np.asarray(list(q))
+    n = len(q)
+    if n == 0:
+        return np.empty((0, 4), dtype=q.dtype)
+    fx = fn(q)
+    sums = (fx[:, None] + fx[None, :]).ravel()
+    diffs = (fx[:, None] - fx[None, :]).ravel()
+
+    order = np.argsort(sums)
+    sorted_sums = sums[order]
+    # Only differences inside the range of sums can match. Searching for
+    # them in sorted order walks sorted_sums forward instead of jumping
+    # around it, which is several times faster for large n
+    candidates = np.flatnonzero((diffs >= sorted_sums[0]) & (diffs <= sorted_sums[-1]))
+    candidates = candidates[np.argsort(diffs[candidates])]
+    needles = diffs[candidates]
+    lo = np.searchsorted(sorted_sums, needles, side="left")
+    counts = np.searchsorted(sorted_sums, needles, side="right") - lo
+
+    # One output row per (difference, matching sum) combination
+    diff_index = np.repeat(candidates, counts)
+    starts = np.repeat(lo - np.cumsum(counts) + counts, counts)
+    sum_index = order[starts + np.arange(len(diff_index))]
+
+    return np.stack([q[sum_index // n], q[sum_index % n],
+                     q[diff_index // n], q[diff_index % n]], axis=1)
+
+
+def count_sumdiff_numpy(q, fn=f):
+    """
+    count_sumdiff over the distinct sums and differences from np.unique.
+    """
+    if np is None:
+        raise ImportError("count_sumdiff_numpy needs NumPy")
+    fx = fn(np.asarray(list(q)))
+    sums, sum_counts = np.unique((fx[:, None] + fx[None, :]).ravel(), return_counts=True)
+    diffs, diff_counts = np.unique((fx[:, None] - fx[None, :]).ravel(), return_counts=True)
+    _, in_sums, in_diffs = np.intersect1d(sums, diffs, assume_unique=True, return_indices=True)
+    return int((sum_counts[in_sums].astype(np.int64) * diff_counts[in_diffs]).sum())
+
+
+def format_match(a, b, c, d, fn=f):
+    left = f"f({a}) + f({b}) = f({c}) - f({d})"
+    return f"{left:30}{fn(a)} + {fn(b)} = {fn(c)} - {fn(d)}"
+
+
+if __name__ == "__main__":
+    for match in iter_sumdiff(q):
+        print(format_match(*match))
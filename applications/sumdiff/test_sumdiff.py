@@ -0,0 +1,78 @@
+import random
+import unittest
+
+import sumdiff as sumdiff_module
+from sumdiff import (count_sumdiff, count_sumdiff_numpy, f, format_match, iter_sumdiff, q, sum_table,
+                     sumdiff, sumdiff_numpy, sumdiff_partitioned)
+
+README_SAMPLE = [
+    (1, 1, 12, 7), (1, 4, 12, 4), (4, 1, 12, 4), (1, 7, 12, 1),
+    (4, 4, 12, 1), (7, 1, 12, 1), (3, 3, 12, 3),
+]
+
+
+def naive(q, fn=f):
+    return [(a, b, c, d) for a in q for b in q for c in q for d in q
+            if fn(a) + fn(b) == fn(c) - fn(d)]
+
+
+class TestSumDiff(unittest.TestCase):
+
+    def test_readme_sample(self):
+        self.assertTrue(sorted(sumdiff(q)) == sorted(README_SAMPLE))
+        self.assertTrue(format_match(1, 1, 12, 7) == "f(1) + f(1) = f(12) - f(7)    10 + 10 = 54 - 34")
+
+    def test_against_naive(self):
+        rng = random.Random(2)
+        for values in (range(1, 10), rng.sample(range(-20, 40), 25), [5], []):
+            self.assertTrue(sorted(sumdiff(values)) == sorted(naive(values)))
+        values = range(1, 15)
+        self.assertTrue(sorted(sumdiff(values, lambda x: x * x)) == sorted(naive(values, lambda x: x * x)))
+
+    def test_sum_table(self):
+        sums = sum_table([1, 2])
+        self.assertTrue(sums[20] == [(1, 1)])
+        self.assertTrue(sums[24] == [(1, 2), (2, 1)])
+        self.assertTrue(len(sums) == 3)
+
+    def test_sum_table_partitions(self):
+        values = range(1, 12)
+        whole = sum_table(values)
+        parts = [sum_table(values, part=p, parts=3) for p in range(3)]
+        self.assertTrue(sum(len(part) for part in parts) == len(whole))
+        for part in parts:
+            for total, pairs in part.items():
+                self.assertTrue(whole[total] == pairs)
+
+    def test_iter_sumdiff_is_lazy(self):
+        matches = iter_sumdiff(range(1, 200))
+        self.assertTrue(next(matches) == (1, 1, 6, 1))
+
+    def test_count(self):
+        for values in (q, range(1, 30), random.Random(4).sample(range(-30, 60), 30), []):
+            self.assertTrue(count_sumdiff(values) == len(sumdiff(values)))
+
+    def test_partitioned(self):
+        values = range(1, 25)
+        expected = sorted(sumdiff(values))
+        for parts in (1, 3):
+            self.assertTrue(sorted(sumdiff_partitioned(values, workers=1, parts=parts)) == expected)
+            self.assertTrue(sumdiff_partitioned(values, workers=1, parts=parts, count_only=True) == len(expected))
+        self.assertTrue(sorted(sumdiff_partitioned(values, workers=2)) == expected)
+        self.assertTrue(sumdiff_partitioned(values, workers=2, parts=5, count_only=True) == len(expected))
+
+    @unittest.skipIf(sumdiff_module.np is None, "NumPy not installed")
+    def test_numpy(self):
+        values = random.Random(3).sample(range(-50, 200), 60)
+        rows = sumdiff_numpy(values)
+        self.assertTrue(rows.shape[1] == 4)
+        self.assertTrue(sorted(map(tuple, rows.tolist())) == sorted(sumdiff(values)))
+        self.assertTrue(sorted(map(tuple, sumdiff_numpy(q).tolist())) == sorted(README_SAMPLE))
+        self.assertTrue(sumdiff_numpy([5]).shape == (0, 4))
+        self.assertTrue(sumdiff_numpy([]).shape == (0, 4))
+        self.assertTrue(count_sumdiff_numpy(range(1, 40)) == count_sumdiff(range(1, 40)))
+        self.assertTrue(count_sumdiff_numpy(values) == len(rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
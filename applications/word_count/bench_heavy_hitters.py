@@ -0,0 +1,54 @@
+"""
+Accuracy against memory for the approximate top-k summaries, on
+robin.txt and a generated corpus. Recall is the share of the exact top k
+found; error is the mean absolute count error over the words returned.
+
+    python bench_heavy_hitters.py [megabytes] [k]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from bench_word_count import make_corpus
+from heavy_hitters import CountMinTopK, SpaceSaving, top_k
+from word_count import iter_chunks, iter_words, word_count_file
+
+ROBIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "histo", "robin.txt")
+
+
+def report(name, path, k):
+    start = time.perf_counter()
+    counts = word_count_file(path)
+    exact = top_k(counts, k)
+    seconds = time.perf_counter() - start
+    exact_words = {word for word, _ in exact}
+    print(f"{name}: {len(counts)} distinct words, top {k}")
+    print(f"  {'exact':24} {counts.memory_usage()['total'] / 1024:9.0f} KiB"
+          f"  recall 1.00  error    0.0  {seconds:6.2f}s")
+
+    summaries = [(f"space-saving {c}", SpaceSaving(c)) for c in (k, 4 * k, 16 * k)]
+    summaries += [(f"count-min {w}x4", CountMinTopK(k, width=w)) for w in (256, 1024, 4096)]
+    for label, summary in summaries:
+        start = time.perf_counter()
+        for words in iter_words(iter_chunks(path)):
+            summary.update_many(words)
+        result = summary.top(k)
+        seconds = time.perf_counter() - start
+
+        recall = len(exact_words & {word for word, _ in result}) / len(exact)
+        error = sum(abs(count - counts[word]) for word, count in result) / len(result)
+        print(f"  {label:24} {summary.memory_bytes() / 1024:9.0f} KiB"
+              f"  recall {recall:4.2f}  error {error:6.1f}  {seconds:6.2f}s")
+
+
+if __name__ == "__main__":
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    k = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    report("robin.txt", ROBIN, k)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.txt")
+        make_corpus(path, megabytes)
+        report(f"{megabytes} MiB corpus", path, k)
@@ -0,0 +1,64 @@
+"""
+Word counting on a generated corpus: in memory, streaming, and
+map-reduce across 1..N worker processes.
+
+    python bench_word_count.py [megabytes] [max_workers]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from parallel_word_count import word_count_parallel
+from word_count import word_count, word_count_file
+
+
+def make_corpus(path, megabytes, seed=0):
+    """
+    Write roughly `megabytes` of text drawn from a Zipf-like vocabulary
+    with some punctuation mixed in.
+    """
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(2, 10)))
+                  for _ in range(50000)]
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    punctuation = ["", "", "", "", ",", ".", ";", '"', "-"]
+
+    with open(path, "w") as f:
+        written = 0
+        while written < megabytes * 2 ** 20:
+            words = rng.choices(vocabulary, weights, k=10000)
+            line = " ".join(w + rng.choice(punctuation) for w in words) + "\n"
+            f.write(line)
+            written += len(line)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.txt")
+        make_corpus(path, megabytes)
+        print(f"{megabytes} MiB corpus, {os.cpu_count()} CPUs")
+
+        def in_memory():
+            with open(path) as f:
+                word_count(f.read())
+
+        print(f"  word_count(whole file)   {timed(in_memory):7.2f}s")
+        print(f"  word_count_file          {timed(lambda: word_count_file(path)):7.2f}s")
+
+        workers = 1
+        while workers <= max_workers:
+            seconds = timed(lambda: word_count_parallel(path, workers=workers))
+            print(f"  parallel, {workers:2} workers     {seconds:7.2f}s")
+            workers *= 2
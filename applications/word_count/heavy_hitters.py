@@ -0,0 +1,234 @@
+"""
+Most frequent words without sorting the whole vocabulary.
+
+top_k           exact: a size-k heap over a full count table, O(n log k)
+SpaceSaving     approximate, k counters: a new word takes over the
+                smallest counter (inheriting its count as possible
+                overcount). Any word more frequent than total / k is
+                guaranteed to be kept.
+CountMinSketch  approximate counts in depth x width fixed counters, never
+                undercounting. CountMinTopK pairs it with k candidates.
+
+All results are (word, count) pairs ordered by (-count, word), like the
+histogram in applications/histo.
+"""
+
+import heapq
+import os
+import sys
+from array import array
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "hashtable"))
+from hashing import fnv1a_64
+from hashtable import HashTable
+
+
+def _rank(item):
+    word, count = item
+    return -count, word
+
+
+def top_k(counts, k):
+    """
+    Exact k most frequent (word, count) pairs of a count mapping.
+    """
+    return heapq.nsmallest(k, counts.items(), key=_rank)
+
+
+class _MinTable:
+    """
+    Up to `size` word -> count entries that can hand back the smallest
+    count quickly. The heap is updated lazily: superseded (count, word)
+    entries are skipped when they reach the top.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.counts = HashTable()
+        self.heap = []
+
+    def __len__(self):
+        return len(self.counts)
+
+    def __contains__(self, word):
+        return word in self.counts
+
+    def get(self, word, default=None):
+        return self.counts.get(word, default)
+
+    def set(self, word, count):
+        self.counts.put(word, count)
+        heapq.heappush(self.heap, (count, word))
+        if len(self.heap) > 4 * self.size + 64:
+            # Too many stale entries, rebuild from the live counts
+            self.heap = [(c, w) for w, c in self.counts.items()]
+            heapq.heapify(self.heap)
+
+    def min(self):
+        """
+        (count, word) of the smallest live entry.
+        """
+        heap = self.heap
+        while True:
+            count, word = heap[0]
+            if self.counts.get(word) == count:
+                return count, word
+            heapq.heappop(heap)
+
+    def remove(self, word):
+        self.counts.delete(word)
+
+    def items(self):
+        return self.counts.items()
+
+
+class SpaceSaving:
+    """
+    Space-Saving heavy hitters with `capacity` counters. Each kept word's
+    count is an upper bound and count - error a lower bound of its real
+    frequency.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counters = _MinTable(capacity)
+        self.errors = HashTable()
+        self.total = 0
+
+    def update(self, word, n=1):
+        self.total += n
+        counters = self.counters
+        count = counters.get(word)
+        if count is not None:
+            counters.set(word, count + n)
+        elif len(counters) < self.capacity:
+            counters.set(word, n)
+            self.errors.put(word, 0)
+        else:
+            # Replace the smallest counter; its count becomes our error
+            min_count, min_word = counters.min()
+            counters.remove(min_word)
+            self.errors.delete(min_word)
+            counters.set(word, min_count + n)
+            self.errors.put(word, min_count)
+
+    def update_many(self, words):
+        # Weighted updates keep the same guarantees and collapse repeats
+        for word, n in Counter(words).items():
+            self.update(word, n)
+
+    def error(self, word):
+        return self.errors.get(word, 0)
+
+    def top(self, k=None):
+        return sorted(self.counters.items(), key=_rank)[:k]
+
+    def memory_bytes(self):
+        return (self.counters.counts.memory_usage()["total"]
+                + self.errors.memory_usage()["total"])
+
+
+class CountMinSketch:
+    """
+    `depth` rows of `width` counters. estimate() is never below the real
+    count and, with probability 1 - e^-depth, at most e / width * total
+    above it.
+    """
+
+    def __init__(self, width=2048, depth=4):
+        self.width = width
+        self.depth = depth
+        self.rows = [array("q", bytes(8 * width)) for _ in range(depth)]
+        self.total = 0
+
+    def _indexes(self, word):
+        # Double hashing: depth indexes from one 64-bit hash
+        key_hash = fnv1a_64(word)
+        h1 = key_hash & 0xffffffff
+        h2 = (key_hash >> 32) | 1
+        width = self.width
+        return [(h1 + i * h2) % width for i in range(self.depth)]
+
+    def update(self, word, n=1):
+        """
+        Add `n` to `word` and return its new estimate. Uses conservative
+        update: only counters below the new estimate are raised, which
+        keeps overcounting down.
+        """
+        self.total += n
+        indexes = self._indexes(word)
+        rows = self.rows
+        estimate = min(row[i] for row, i in zip(rows, indexes)) + n
+        for row, i in zip(rows, indexes):
+            if row[i] < estimate:
+                row[i] = estimate
+        return estimate
+
+    def estimate(self, word):
+        return min(row[i] for row, i in zip(self.rows, self._indexes(word)))
+
+    def memory_bytes(self):
+        return sum(sys.getsizeof(row) for row in self.rows)
+
+
+class CountMinTopK:
+    """
+    Top-k tracking over a CountMinSketch: keeps the `k` words with the
+    highest estimates seen so far.
+    """
+
+    def __init__(self, k, width=2048, depth=4):
+        self.k = k
+        self.sketch = CountMinSketch(width, depth)
+        self.candidates = _MinTable(k)
+
+    def update(self, word, n=1):
+        estimate = self.sketch.update(word, n)
+        candidates = self.candidates
+        if word in candidates or len(candidates) < self.k:
+            candidates.set(word, estimate)
+        else:
+            min_count, min_word = candidates.min()
+            if estimate > min_count:
+                candidates.remove(min_word)
+                candidates.set(word, estimate)
+
+    def update_many(self, words):
+        # Weighted updates keep the same guarantees and collapse repeats
+        for word, n in Counter(words).items():
+            self.update(word, n)
+
+    def top(self, k=None):
+        return sorted(self.candidates.items(), key=_rank)[:k]
+
+    def memory_bytes(self):
+        return self.sketch.memory_bytes() + self.candidates.counts.memory_usage()["total"]
+
+
+def heavy_hitters(word_batches, k, method="exact", **options):
+    """
+    The k most frequent words in an iterable of word lists (for example
+    word_count.iter_words()).
+
+    method="exact"         full count table, exact top k
+    method="space-saving"  `capacity` counters (default 10 * k)
+    method="count-min"     sketch of `width` x `depth` counters
+    """
+    if method == "exact":
+        counts = HashTable()
+        for words in word_batches:
+            for word in words:
+                counts.increment(word)
+        return top_k(counts, k)
+
+    if method == "space-saving":
+        summary = SpaceSaving(options.get("capacity", 10 * k))
+    elif method == "count-min":
+        summary = CountMinTopK(k, options.get("width", 2048), options.get("depth", 4))
+    else:
+        raise ValueError(f"Unknown heavy hitters method: {method!r}")
+
+    for words in word_batches:
+        summary.update_many(words)
+    return summary.top(k)
@@ -0,0 +1,88 @@
+import io
+import os
+import random
+import unittest
+from collections import Counter
+
+from heavy_hitters import CountMinSketch, CountMinTopK, SpaceSaving, heavy_hitters, top_k
+from word_count import top_words, word_count
+
+ROBIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "histo", "robin.txt")
+
+
+def zipf_words(n, vocabulary=2000, seed=1):
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(vocabulary)]
+    weights = [1 / (i + 1) for i in range(vocabulary)]
+    return rng.choices(words, weights, k=n)
+
+
+class TestHeavyHitters(unittest.TestCase):
+
+    def test_top_k(self):
+        counts = word_count("b a c b a d b")
+        self.assertTrue(top_k(counts, 2) == [("b", 3), ("a", 2)])
+        # Ties break alphabetically
+        self.assertTrue(top_k(counts, 4) == [("b", 3), ("a", 2), ("c", 1), ("d", 1)])
+        self.assertTrue(top_k(counts, 10) == top_k(counts, 4))
+        self.assertTrue(top_k(counts, 0) == [])
+
+    def test_top_words_exact(self):
+        with open(ROBIN) as f:
+            counts = word_count(f.read())
+        expected = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:10]
+        self.assertTrue(top_words(ROBIN, 10) == expected)
+        self.assertTrue(top_words(io.StringIO("x y y"), 1) == [("y", 2)])
+
+    def test_space_saving_bounds(self):
+        words = zipf_words(20000)
+        exact = Counter(words)
+        summary = SpaceSaving(100)
+        summary.update_many(words)
+
+        self.assertTrue(summary.total == len(words))
+        self.assertTrue(len(summary.counters) == 100)
+        for word, count in summary.top():
+            # Never under, and overcount bounded by the recorded error
+            self.assertTrue(count - summary.error(word) <= exact[word] <= count)
+
+        # Anything above total / capacity must be kept
+        kept = {word for word, _ in summary.top()}
+        for word, count in exact.items():
+            if count > len(words) / 100:
+                self.assertTrue(word in kept)
+
+    def test_count_min_never_undercounts(self):
+        words = zipf_words(20000)
+        exact = Counter(words)
+        sketch = CountMinSketch(width=256, depth=4)
+        for word in words:
+            sketch.update(word)
+        for word, count in exact.items():
+            self.assertTrue(sketch.estimate(word) >= count)
+        self.assertTrue(sketch.estimate("never seen") >= 0)
+
+        # Wide enough to be exact on a small vocabulary
+        sketch = CountMinSketch(width=4096, depth=4)
+        for word in "a b b c c c".split():
+            sketch.update(word)
+        self.assertTrue([sketch.estimate(w) for w in "abc"] == [1, 2, 3])
+
+    def test_approximate_top_k_matches_exact(self):
+        words = zipf_words(50000)
+        exact = [word for word, _ in Counter(words).most_common(5)]
+
+        summary = CountMinTopK(5, width=1024)
+        summary.update_many(words)
+        self.assertTrue(set(word for word, _ in summary.top()) == set(exact))
+
+        for method in ("space-saving", "count-min"):
+            result = heavy_hitters([words[:25000], words[25000:]], 5, method)
+            self.assertTrue(set(word for word, _ in result) == set(exact))
+
+        with self.assertRaises(ValueError):
+            heavy_hitters([words], 5, "sorted")
+
+
+if __name__ == '__main__':
+    unittest.main()
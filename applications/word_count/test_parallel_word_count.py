@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+from parallel_word_count import split_ranges, word_count_parallel
+from word_count import word_count
+
+
+class TestParallelWordCount(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "corpus.txt")
+        self.text = ('Héllo, my cät.  And my cat doesn\'t say "hello" back.\n'
+                     'This is a test of the  Emergency  Broadcast  Network.\r\n') * 50
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(self.text)
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_ranges_cover_file_and_end_on_whitespace(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        for parts in (1, 2, 3, 8, 100):
+            ranges = split_ranges(self.path, parts)
+            self.assertTrue(ranges[0][0] == 0 and ranges[-1][1] == len(data))
+            for (_, end), (start, _) in zip(ranges, ranges[1:]):
+                self.assertTrue(end == start)
+                self.assertTrue(data[start:start + 1].isspace())
+
+    def test_matches_word_count(self):
+        expected = word_count(self.text)
+        for workers in (1, 3):
+            for chunk_size in (5, 1 << 20):
+                x = word_count_parallel(self.path, workers=workers, chunk_size=chunk_size)
+                self.assertTrue(x == expected)
+
+    def test_final_sigma_across_chunks(self):
+        # A final sigma lowercases differently from a medial one, so words
+        # cut between chunks must be joined before they're lowercased
+        text = "ΟΔΟΣ ΚΑΙ ΟΔΟΣ. Ο ΛΟΓΟΣ\n" * 20
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(text)
+        expected = word_count(text)
+        for workers in (1, 3):
+            for chunk_size in range(1, 12):
+                x = word_count_parallel(self.path, workers=workers, chunk_size=chunk_size)
+                self.assertTrue(x == expected)
+
+    def test_empty_file(self):
+        open(self.path, "w").close()
+        self.assertTrue(word_count_parallel(self.path, workers=2) == {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,12 @@
+import gc
+import io
+import os
+import tempfile
 import unittest
 
-from word_count import word_count
+from word_count import word_count, word_count_file
+
+ROBIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "histo", "robin.txt")
 
 
 class TestWordCount(unittest.TestCase):
@@ -24,5 +30,53 @@ class TestWordCount(unittest.TestCase):
         x = word_count('a a\ra\na\ta \t\r\n')
         self.assertTrue(x == {"a": 5})
 
+    def test_word_count_file_matches_word_count(self):
+        text = 'Hello, my cat.  And my cat doesn\'t say "hello" back.\n' \
+               'This is a test of the  Emergency  Broadcast  Network.\r\n\t  a a\ra'
+        expected = word_count(text)
+
+        # Tiny chunks cut words, and stop characters, at every position
+        for chunk_size in (1, 2, 3, 7, 64, 1 << 20):
+            x = word_count_file(io.StringIO(text), chunk_size=chunk_size)
+            self.assertTrue(x == expected)
+
+        x = word_count_file(io.BytesIO(text.encode()), chunk_size=5)
+        self.assertTrue(x == expected)
+
+        # The caller's stream is left open
+        stream = io.BytesIO("naïve café naïve".encode())
+        x = word_count_file(stream, chunk_size=3)
+        gc.collect()
+        self.assertTrue(x == {"naïve": 2, "café": 1})
+        self.assertFalse(stream.closed)
+
+        # Lowercasing a final sigma depends on what follows it, so it
+        # mustn't happen before a word cut at a chunk boundary is whole
+        text = "ΟΔΟΣ ΚΑΙ ΟΔΟΣ"
+        self.assertTrue(word_count(text) == {"οδος": 2, "και": 1})
+        for chunk_size in range(1, len(text) + 1):
+            x = word_count_file(io.StringIO(text), chunk_size=chunk_size)
+            self.assertTrue(x == word_count(text))
+
+        self.assertTrue(word_count_file(io.StringIO("")) == {})
+        self.assertTrue(word_count_file(io.StringIO("word"), chunk_size=2) == {"word": 1})
+
+    def test_word_count_file_from_path(self):
+        with open(ROBIN) as f:
+            expected = word_count(f.read())
+        self.assertTrue(word_count_file(ROBIN, chunk_size=100) == expected)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words.txt")
+            with open(path, "w") as f:
+                f.write("one two two\nthree three three")
+            x = word_count_file(path, chunk_size=4)
+            self.assertTrue(x == {"one": 1, "two": 2, "three": 3})
+
+            # Counts accumulate across files
+            x = word_count_file(path, counts=x)
+            self.assertTrue(x["three"] == 6)
+
+
 if __name__ == '__main__':
     unittest.main()
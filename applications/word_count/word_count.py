@@ -1,7 +1,35 @@
+import codecs
+import io
+import os
+import sys
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "hashtable"))
+from hashtable import HashTable
+from heavy_hitters import heavy_hitters, top_k
+
+# have stop characters instead of stop words
+STOP_CHARS = ':;,."-+=/\\|[]{}()*^&'
+
+# str.translate table deleting every stop character in one pass
+STRIP_STOP_CHARS = str.maketrans("", "", STOP_CHARS)
+
+# Default read size for word_count_file, in characters
+CHUNK_SIZE = 1 << 20
+
+
+def tokenize(s):
+    """
+    Split a string into lowercase words the way word_count does: stop
+    characters removed, split on any whitespace.
+    """
+    return s.translate(STRIP_STOP_CHARS).lower().split()
+
+
 def word_count(s):
     """
     Input: This function takes a single string as an argument.
-    Output: It returns a dictionary of words and their counts.
+    Output: It returns a HashTable (a mapping) of words and their counts.
     
     Case should be ignored. Output keys must be lowercase.
     Key order in the dictionary doesn't matter.
@@ -9,30 +37,100 @@ def word_count(s):
     Ignore each of the following characters:
         " : ; , . - + = / \\ | [ ] { } ( ) * ^ &
     """
+    cache = HashTable()
+    for word in tokenize(s):
+        cache.increment(word)
+    return cache
 
-    # could use defaultdict from NLP lesson ?
-    # have stop characters instead of stop words
 
-    cache = {}
-    stop_chars = [':', ';', ',', '.', '"', '-', '+', '=', '/',
-             '\\', '|', '[', ']', '{', '}', '(', ')', '*', '^', '&']
-    
-    # replace stop characters
-    for i in stop_chars:
-        s = s.replace(i, '')
+def iter_chunks(path_or_stream, chunk_size=CHUNK_SIZE):
+    """
+    Yield text chunks of a file (path or open file, text or binary;
+    binary is decoded as UTF-8).
+    """
+    if isinstance(path_or_stream, (str, bytes, os.PathLike)):
+        with open(path_or_stream, encoding="utf-8", errors="replace") as f:
+            yield from iter_chunks(f, chunk_size)
+        return
 
-    words = s.lower().split()
-    
-    for word in words:
-        if word in cache:
-            cache[word] += 1
-        else:
-            cache[word] = 1
-    return cache
+    stream = path_or_stream
+    if isinstance(stream, (io.RawIOBase, io.BufferedIOBase)):
+        # Decoded here rather than through a TextIOWrapper, which would
+        # close the caller's stream when it's garbage collected
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        while True:
+            data = stream.read(chunk_size)
+            if not data:
+                break
+            chunk = decoder.decode(data)
+            if chunk:
+                yield chunk
+        chunk = decoder.decode(b"", final=True)
+        if chunk:
+            yield chunk
+        return
+
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_words(chunks):
+    """
+    Tokenize a stream of text chunks, joining words that were cut in two
+    at a chunk boundary.
+    """
+    carry = ""
+    for chunk in chunks:
+        text = carry + chunk.translate(STRIP_STOP_CHARS)
+        carry = ""
+        if text and not text[-1].isspace():
+            # Last word may continue in the next chunk
+            *head, carry = text.rsplit(None, 1)
+            text = head[0] if head else ""
+        # Lowercased only up to the last whole word: some case mappings
+        # depend on the letters after them (a Greek sigma ending a word),
+        # and whitespace is what bounds that, so this matches lowercasing
+        # the whole text
+        yield text.lower().split()
+    if carry:
+        yield [carry.lower()]
+
+
+def word_count_file(path_or_stream, chunk_size=CHUNK_SIZE, counts=None):
+    """
+    word_count() for a file too big to read in one go. Reads `chunk_size`
+    characters at a time, so memory depends on the vocabulary, not the
+    size of the input. Adds to `counts` (a HashTable) if given.
+    """
+    if counts is None:
+        counts = HashTable()
+
+    for words in iter_words(iter_chunks(path_or_stream, chunk_size)):
+        # Tally the chunk at C speed first, so the table is only touched
+        # once per distinct word per chunk
+        for word, n in Counter(words).items():
+            counts.increment(word, n)
+    return counts
+
+
+def top_words(path_or_stream, k, method="exact", chunk_size=CHUNK_SIZE, **options):
+    """
+    The k most frequent (word, count) pairs of a file or stream, ordered
+    by (-count, word). method="space-saving" or "count-min" trade exact
+    counts for memory bounded by k; see heavy_hitters.
+    """
+    return heavy_hitters(iter_words(iter_chunks(path_or_stream, chunk_size)), k, method, **options)
 
 
 if __name__ == "__main__":
-    print(word_count(""))
-    print(word_count("Hello"))
-    print(word_count('Hello, my cat. And my cat doesn\'t say "hello" back.'))
-    print(word_count('This is a test of the emergency broadcast network. This is only a test.'))
\ No newline at end of file
+    if len(sys.argv) > 1:
+        for word, n in top_k(word_count_file(sys.argv[1]), 20):
+            print(f"{n:8} {word}")
+    else:
+        print(word_count(""))
+        print(word_count("Hello"))
+        print(word_count('Hello, my cat. And my cat doesn\'t say "hello" back.'))
+        print(word_count('This is a test of the emergency broadcast network. This is only a test.'))
@@ -0,0 +1,386 @@
+"""
+Benchmark suite for HashTable and the applications.
+
+HashTable is measured against dict for put / get / get of missing keys /
+delete throughput, resize cost (filling a default table against one
+reserved up front) and memory, for each key count and key distribution.
+The applications run end to end on generated inputs.
+
+Results are written as JSON. Given a baseline (an earlier results file),
+every metric that got worse by more than the threshold is reported as a
+regression and the exit status is 1.
+
+    python bench_suite.py [--sizes 1e3,1e4,1e5] [--distributions ...]
+                          [--only hashtable|apps] [--quick]
+                          [--output bench_results.json]
+                          [--baseline bench_baseline.json] [--threshold 0.25]
+                          [--save-baseline]
+
+    python -m bench_suite ...        from the repository root
+
+Key counts up to 1e7 work, but HashTable is pure Python: allow minutes and
+a few GB of memory for the largest sizes.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+for directory in ("hashtable", "applications/word_count", "applications/no_dups",
+                  "applications/crack_caesar", "applications/expensive_seq",
+                  "applications/lookup_table"):
+    sys.path.insert(0, os.path.join(ROOT, directory))
+
+from hashtable import HashTable
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DISTRIBUTIONS = ("sequential", "random", "long_prefix")
+RESULTS_PATH = os.path.join(ROOT, "bench_results.json")
+BASELINE_PATH = os.path.join(ROOT, "bench_baseline.json")
+# A metric this much worse than the baseline (as a fraction) is a regression
+THRESHOLD = 0.25
+# Timings this short are mostly noise and never flagged
+NOISE_SECONDS = 0.01
+
+
+def make_keys(n, distribution, seed=0):
+    """
+    `n` distinct string keys:
+
+    sequential   "key0", "key1", ...
+    random       random lowercase strings of 6 to 14 letters
+    long_prefix  one long shared prefix and a number, which makes string
+                 hashing (every character is hashed) the expensive part
+    """
+    if distribution == "sequential":
+        return [f"key{i}" for i in range(n)]
+    if distribution == "long_prefix":
+        return [f"/users/profiles/settings/notifications/{i}" for i in range(n)]
+    if distribution == "random":
+        rng = random.Random(seed)
+        keys = set()
+        while len(keys) < n:
+            keys.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(6, 14))))
+        keys = list(keys)
+        rng.shuffle(keys)
+        return keys
+    raise ValueError(f"Unknown key distribution: {distribution!r}")
+
+
+def timed(fn, *args):
+    """
+    (result, seconds) of fn(*args), with the garbage collector off so
+    collection pauses don't land in one measurement and not another.
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        result = fn(*args)
+        return result, time.perf_counter() - start
+    finally:
+        gc.enable()
+
+
+def traced_size(build):
+    """
+    Bytes still allocated once build() returns, and its result.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        return tracemalloc.get_traced_memory()[0], result
+    finally:
+        tracemalloc.stop()
+
+
+class Results:
+    """
+    Metrics by name, each with a value, a unit, and which way is better.
+    """
+
+    def __init__(self):
+        self.metrics = {}
+
+    def add(self, name, value, unit, higher_is_better):
+        self.metrics[name] = {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+        print(f"  {name:55} {value:14.6g} {unit}")
+
+    def rate(self, name, count, seconds, unit="ops/s"):
+        self.add(name, count / seconds if seconds > 0 else float("inf"), unit, True)
+
+    def seconds(self, name, seconds):
+        self.add(name, seconds, "s", False)
+
+    def to_json(self, meta):
+        return {"meta": meta, "metrics": self.metrics}
+
+
+# HashTable vs dict
+
+
+def _fill_table(keys, table):
+    put = table.put
+    for i, key in enumerate(keys):
+        put(key, i)
+    return table
+
+
+def _fill_dict(keys):
+    d = {}
+    for i, key in enumerate(keys):
+        d[key] = i
+    return d
+
+
+def _get_all(get, keys):
+    for key in keys:
+        get(key)
+
+
+def _delete_table(table, keys):
+    delete = table.delete
+    for key in keys:
+        delete(key)
+
+
+def _delete_dict(d, keys):
+    for key in keys:
+        del d[key]
+
+
+def bench_hashtable(results, sizes, distributions):
+    for distribution in distributions:
+        for n in sizes:
+            keys = make_keys(n, distribution)
+            missing = [key + "!" for key in keys]
+            prefix = f"hashtable.{distribution}.{n}"
+
+            table, put_time = timed(_fill_table, keys, HashTable())
+            d, dict_put_time = timed(_fill_dict, keys)
+            results.rate(f"{prefix}.put.HashTable", n, put_time)
+            results.rate(f"{prefix}.put.dict", n, dict_put_time)
+
+            _, seconds = timed(_get_all, table.get, keys)
+            results.rate(f"{prefix}.get.HashTable", n, seconds)
+            _, seconds = timed(_get_all, d.get, keys)
+            results.rate(f"{prefix}.get.dict", n, seconds)
+
+            _, seconds = timed(_get_all, table.get, missing)
+            results.rate(f"{prefix}.get_missing.HashTable", n, seconds)
+            _, seconds = timed(_get_all, d.get, missing)
+            results.rate(f"{prefix}.get_missing.dict", n, seconds)
+
+            _, seconds = timed(_delete_table, table, keys)
+            results.rate(f"{prefix}.delete.HashTable", n, seconds)
+            _, seconds = timed(_delete_dict, d, keys)
+            results.rate(f"{prefix}.delete.dict", n, seconds)
+            del table, d
+
+            # Resize cost: the same fill into a table that never grows
+            reserved = HashTable()
+            reserved.reserve(n)
+            _, reserved_time = timed(_fill_table, keys, reserved)
+            del reserved
+            results.seconds(f"{prefix}.resize_overhead.HashTable", max(0.0, put_time - reserved_time))
+
+            size, table = traced_size(lambda: _fill_table(keys, HashTable()))
+            del table
+            results.add(f"{prefix}.memory.HashTable", size / n, "bytes/key", False)
+            size, d = traced_size(lambda: _fill_dict(keys))
+            del d
+            results.add(f"{prefix}.memory.dict", size / n, "bytes/key", False)
+
+
+# Applications
+
+
+def bench_word_count(results, quick):
+    from bench_word_count import make_corpus
+    from word_count import top_words, word_count_file
+
+    megabytes = 1 if quick else 10
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.txt")
+        make_corpus(path, megabytes)
+        _, seconds = timed(word_count_file, path)
+        results.rate("apps.word_count.word_count_file", megabytes, seconds, "MiB/s")
+        _, seconds = timed(top_words, path, 20, "space-saving")
+        results.rate("apps.word_count.top_words_space_saving", megabytes, seconds, "MiB/s")
+
+
+def bench_no_dups(results, quick):
+    from no_dups import no_dups
+
+    n = 100000 if quick else 1000000
+    rng = random.Random(0)
+    text = " ".join(f"w{int(rng.paretovariate(1.1)) % (n // 4)}" for _ in range(n))
+    _, seconds = timed(no_dups, text)
+    results.rate("apps.no_dups.no_dups", n, seconds, "tokens/s")
+
+
+def bench_crack_caesar(results, quick):
+    from crack_caesar import frequency_decode
+    from solver import CIPHERTEXT, crack
+
+    with open(CIPHERTEXT) as f:
+        ciphertext = f.read()
+    copies = 20 if quick else 200
+    data = (ciphertext * copies).encode()
+    _, seconds = timed(frequency_decode, data)
+    results.rate("apps.crack_caesar.frequency_decode", len(data) / 2 ** 20, seconds, "MiB/s")
+    _, seconds = timed(crack, ciphertext, 1 if quick else 4)
+    results.seconds("apps.crack_caesar.crack", seconds)
+
+
+def bench_expensive_seq(results, quick):
+    from expensive_seq import expensive_seq, expensive_seq_many
+
+    expensive_seq.cache_clear()
+    _, seconds = timed(expensive_seq, 150, 400, 800)
+    results.seconds("apps.expensive_seq.memoized_150", seconds)
+
+    rng = random.Random(0)
+    n = 1000 if quick else 10000
+    queries = [(rng.randrange(1, 2000), rng.randrange(500), rng.randrange(500)) for _ in range(n)]
+    _, seconds = timed(expensive_seq_many, queries)
+    results.rate("apps.expensive_seq.many", n, seconds, "queries/s")
+
+
+def bench_lookup_table(results, quick):
+    from lookup_builder import build_table, load_table, table_key
+
+    # The real domain takes minutes to build; a cheaper corner of it still
+    # exercises the build, save, load and lookup path
+    domain = [(x, y) for x in range(2, 6 if quick else 8) for y in range(3, 6)]
+    table, seconds = timed(build_table, domain, 1)
+    results.seconds("apps.lookup_table.build", seconds)
+
+    n = 50000
+    rng = random.Random(0)
+    keys = [table_key(*rng.choice(domain)) for _ in range(n)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "slowfun.htbl")
+        table.save(path)
+        mapped, seconds = timed(load_table, path)
+        results.seconds("apps.lookup_table.load", seconds)
+        _, seconds = timed(_get_all, mapped.get, keys)
+        results.rate("apps.lookup_table.lookups", n, seconds)
+        mapped.close()
+
+
+APPLICATIONS = {
+    "word_count": bench_word_count,
+    "no_dups": bench_no_dups,
+    "crack_caesar": bench_crack_caesar,
+    "expensive_seq": bench_expensive_seq,
+    "lookup_table": bench_lookup_table,
+}
+
+
+# Baseline comparison
+
+
+def compare(metrics, baseline, threshold=THRESHOLD):
+    """
+    (name, baseline value, current value, change) for every metric that's
+    worse than in `baseline` by more than `threshold`. change is the
+    fraction lost: 0.5 is half the throughput, or twice the time.
+    """
+    regressions = []
+    for name, metric in metrics.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        old_value, value = old["value"], metric["value"]
+        if old_value <= 0 or value <= 0:
+            continue
+        if metric["unit"] == "s" and max(old_value, value) < NOISE_SECONDS:
+            continue
+        if metric["higher_is_better"]:
+            change = 1 - value / old_value
+        else:
+            change = 1 - old_value / value
+        if change > threshold:
+            regressions.append((name, old_value, value, change))
+    return regressions
+
+
+def parse_sizes(text):
+    return [int(float(size)) for size in text.split(",")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark HashTable and the applications.")
+    parser.add_argument("--sizes", type=parse_sizes, default=list(DEFAULT_SIZES),
+                        help="comma-separated key counts, e.g. 1e3,1e4,1e7")
+    parser.add_argument("--distributions", type=lambda text: text.split(","),
+                        default=list(DISTRIBUTIONS), help=f"any of {','.join(DISTRIBUTIONS)}")
+    parser.add_argument("--only", choices=["hashtable", "apps", *APPLICATIONS],
+                        help="run one part of the suite")
+    parser.add_argument("--quick", action="store_true",
+                        help="small inputs, for checking the suite itself")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="also write the results as the new baseline")
+    args = parser.parse_args(argv)
+    if args.quick and args.sizes == list(DEFAULT_SIZES):
+        args.sizes = [1000, 10000]
+
+    results = Results()
+    if args.only in (None, "hashtable"):
+        print("HashTable vs dict")
+        bench_hashtable(results, args.sizes, args.distributions)
+    for name, bench in APPLICATIONS.items():
+        if args.only in (None, "apps", name):
+            print(name)
+            bench(results, args.quick)
+
+    meta = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "sizes": args.sizes,
+        "quick": args.quick,
+    }
+    report = results.to_json(meta)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {args.output}")
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}, nothing to compare")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline["meta"].get("quick") != args.quick:
+        print("note: baseline and this run differ in --quick, so input sizes differ")
+    regressions = compare(results.metrics, baseline["metrics"], args.threshold)
+    for name, old_value, value, change in regressions:
+        print(f"REGRESSION {name}: {old_value:.6g} -> {value:.6g} ({change:.0%} worse)")
+    if not regressions:
+        print(f"no regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+"""
+Bulk load: a loop over put() vs put_many() vs HashTable.from_items().
+
+    python bench_bulk.py [num_keys]
+
+put_many() gets most of its win from hashing the keys as one batch, which
+needs NumPy; without it only the resize and bookkeeping savings remain.
+"""
+
+import sys
+import time
+
+from hashing import np
+from hashtable import HashTable
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def put_loop(items, **kwargs):
+    ht = HashTable(**kwargs)
+    for key, value in items:
+        ht.put(key, value)
+    return ht
+
+
+if __name__ == "__main__":
+    num_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    items = [(f"key-{i}", i) for i in range(num_keys)]
+    print(f"Loading {num_keys} keys (NumPy {'on' if np is not None else 'off'})")
+
+    for backend in ("chaining", "open"):
+        for hash_function in ("djb2", "fnv1a"):
+            kwargs = {"backend": backend, "hash_function": hash_function}
+            loop = timed(lambda: put_loop(items, **kwargs))
+            bulk = timed(lambda: HashTable(**kwargs).put_many(items))
+            built = timed(lambda: HashTable.from_items(items, **kwargs))
+            print(f"{backend:<9} {hash_function:<6} put loop {loop:6.2f}s  "
+                  f"put_many {bulk:6.2f}s ({loop / bulk:4.1f}x)  "
+                  f"from_items {built:6.2f}s ({loop / built:4.1f}x)")
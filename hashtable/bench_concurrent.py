@@ -0,0 +1,83 @@
+"""
+Throughput of ConcurrentHashTable vs a HashTable behind one global lock.
+
+    python bench_concurrent.py [ops_per_thread]
+
+Each thread runs a read-heavy mix (8 gets : 1 put : 1 delete). On a
+GIL build of CPython threads never run Python code in parallel, so the
+gain comes from lock-free reads and less lock traffic rather than from
+parallelism; on a free-threaded build stripes stop writers from
+serializing as well.
+"""
+
+import random
+import sys
+import threading
+import time
+
+from concurrent_hashtable import ConcurrentHashTable
+from hashtable import HashTable
+
+
+class GlobalLockHashTable:
+    """
+    What we used before: every operation under one lock.
+    """
+
+    def __init__(self):
+        self.table = HashTable()
+        self.lock = threading.Lock()
+
+    def put(self, key, value):
+        with self.lock:
+            self.table.put(key, value)
+
+    def get(self, key):
+        with self.lock:
+            return self.table.get(key)
+
+    def delete(self, key):
+        with self.lock:
+            return self.table.delete(key)
+
+    def delete_many(self, keys):
+        with self.lock:
+            return self.table.delete_many(keys)
+
+
+def worker(ht, seed, ops, keys):
+    rng = random.Random(seed)
+    for _ in range(ops):
+        key = rng.choice(keys)
+        r = rng.random()
+        if r < 0.8:
+            ht.get(key)
+        elif r < 0.9:
+            ht.put(key, r)
+        else:
+            # Another thread may have deleted it already
+            ht.delete_many([key])
+
+
+def run(ht, num_threads, ops, keys):
+    for key in keys:
+        ht.put(key, 0)
+    threads = [threading.Thread(target=worker, args=(ht, n, ops, keys))
+               for n in range(num_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return num_threads * ops / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    keys = [f"key-{i}" for i in range(10000)]
+
+    for num_threads in (1, 2, 4, 8, 16):
+        single = run(GlobalLockHashTable(), num_threads, ops, keys)
+        striped = run(ConcurrentHashTable(), num_threads, ops, keys)
+        print(f"{num_threads:2} threads  global lock {single:10.0f} ops/s  "
+              f"striped {striped:10.0f} ops/s  ({striped / single:4.2f}x)")
@@ -0,0 +1,53 @@
+"""
+Cost of instrumentation: never enabled vs enabled then disabled vs on.
+
+    python bench_instrumentation.py [num_keys] [repeat]
+
+The first two should match within noise; a disabled table runs exactly
+the same class methods as one that was never instrumented.
+"""
+
+import statistics
+import sys
+import timeit
+
+from hashtable import HashTable
+
+
+def workload(ht, keys):
+    for key in keys:
+        ht.put(key, 1)
+    for key in keys:
+        ht.get(key)
+    for key in keys:
+        ht.delete(key)
+
+
+def make(mode):
+    ht = HashTable()
+    if mode != "never enabled":
+        ht.enable_instrumentation()
+    if mode == "disabled":
+        ht.disable_instrumentation()
+    return ht
+
+
+if __name__ == "__main__":
+    num_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    keys = [f"key-{i}" for i in range(num_keys)]
+    modes = ("never enabled", "disabled", "enabled")
+
+    # Modes take turns, each run on a fresh table, so a noisy stretch of
+    # the machine hits all of them alike
+    times = {mode: [] for mode in modes}
+    for _ in range(repeat):
+        for mode in modes:
+            ht = make(mode)
+            times[mode].append(timeit.timeit(lambda: workload(ht, keys), number=1))
+
+    base = statistics.median(times["never enabled"])
+    for mode in modes:
+        seconds = statistics.median(times[mode])
+        print(f"{mode:<14} median {seconds * 1000:8.1f} ms  ({(seconds / base - 1) * 100:+5.1f}%)"
+              f"  best {min(times[mode]) * 1000:8.1f} ms")
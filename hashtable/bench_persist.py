@@ -0,0 +1,55 @@
+"""
+Startup time: rebuilding a table with put() vs opening a saved file.
+
+    python bench_persist.py [num_keys]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from hashtable import HashTable
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def build_with_put(items):
+    ht = HashTable()
+    for key, value in items:
+        ht.put(key, value)
+    return ht
+
+
+if __name__ == "__main__":
+    num_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    items = [(f"word-{i}", f"definition of word {i}") for i in range(num_keys)]
+    probes = [key for key, _ in random.sample(items, 1000)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "table.htbl")
+
+        put_time, ht = timed(lambda: build_with_put(items))
+        bulk_time, ht = timed(lambda: HashTable.from_items(items))
+        save_time, _ = timed(lambda: ht.save(path))
+        size = os.path.getsize(path)
+
+        def open_and_query():
+            mapped = HashTable.open_mmap(path)
+            mapped.get(probes[0])
+            return mapped
+
+        open_time, mapped = timed(open_and_query)
+        get_time, _ = timed(lambda: [mapped.get(key) for key in probes])
+        mapped.close()
+
+    print(f"{num_keys} keys, file {size / 2 ** 20:.1f} MiB (save took {save_time:.2f}s)")
+    print(f"  rebuild with put()        {put_time * 1000:10.1f} ms")
+    print(f"  rebuild with from_items() {bulk_time * 1000:10.1f} ms")
+    print(f"  open_mmap + first get     {open_time * 1000:10.3f} ms")
+    print(f"  1000 mapped gets          {get_time * 1000:10.3f} ms")
@@ -0,0 +1,55 @@
+"""
+Per-put latency with one-shot vs incremental resizing.
+
+    python bench_resize.py [num_keys]
+
+One-shot resizing has a good median but its worst puts pay for rehashing
+the whole table; incremental resizing trades a little median time for a
+bounded maximum.
+"""
+
+import gc
+import sys
+import time
+
+from hashtable import HashTable
+
+
+def put_latencies(ht, num_keys):
+    clock = time.perf_counter_ns
+    latencies = []
+    # Collector pauses would swamp the resize pauses we're measuring
+    gc.disable()
+    try:
+        for i in range(num_keys):
+            key = f"key-{i}"
+            start = clock()
+            ht.put(key, i)
+            latencies.append(clock() - start)
+    finally:
+        gc.enable()
+    return latencies
+
+
+def percentile(sorted_values, pct):
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))
+    return sorted_values[index]
+
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+    p50 = percentile(latencies, 50) / 1000
+    p99 = percentile(latencies, 99) / 1000
+    p999 = percentile(latencies, 99.9) / 1000
+    worst = latencies[-1] / 1000
+    total = sum(latencies) / 1e6
+    print(f"{name:<12} p50 {p50:8.1f}us  p99 {p99:8.1f}us  "
+          f"p99.9 {p999:8.1f}us  max {worst:10.1f}us  total {total:8.1f}ms")
+
+
+if __name__ == "__main__":
+    num_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    print(f"Inserting {num_keys} keys")
+    report("one-shot", put_latencies(HashTable(), num_keys))
+    report("incremental", put_latencies(HashTable(incremental=True), num_keys))
@@ -0,0 +1,77 @@
+"""
+Insert/delete churn under different resize policies.
+
+    python bench_resize_policy.py [num_keys]
+
+"waves" repeatedly deletes 90% of the keys and puts them back, which
+makes a shrinking table give its memory back and regrow every wave.
+"jitter" adds and removes a few keys right at the grow threshold.
+"""
+
+import sys
+import time
+
+from hashtable import HashTable
+from resize_policy import NEVER_SHRINK, ResizePolicy
+
+POLICIES = {
+    "default": ResizePolicy(),
+    "never-shrink": NEVER_SHRINK,
+    "power-of-two": ResizePolicy(power_of_two=True),
+    "grow-x4": ResizePolicy(growth_factor=4, shrink_at=0.1),
+    "dense": ResizePolicy(grow_at=0.9, shrink_at=0.3),
+}
+
+
+def waves(ht, keys):
+    for key in keys:
+        ht.put(key, 0)
+    for _ in range(5):
+        doomed = keys[: len(keys) * 9 // 10]
+        for key in doomed:
+            ht.delete(key)
+        for key in doomed:
+            ht.put(key, 0)
+
+
+def jitter(ht, keys):
+    # Stop right at the grow threshold, then churn across it
+    limit = int(ht.get_num_slots() * ht.resize_policy.grow_at)
+    for key in keys:
+        if ht.count == limit:
+            break
+        ht.put(key, 0)
+    extra = [f"extra-{i}" for i in range(4)]
+    for _ in range(len(keys) // 4):
+        for key in extra:
+            ht.put(key, 0)
+        for key in extra:
+            ht.delete(key)
+
+
+def run(workload, policy, keys):
+    ht = HashTable(1024, resize_policy=policy)
+    resizes = [0]
+    resize = ht.resize
+
+    def counting_resize(*args):
+        resizes[0] += 1
+        resize(*args)
+
+    ht.resize = counting_resize
+    start = time.perf_counter()
+    workload(ht, keys)
+    elapsed = time.perf_counter() - start
+    return elapsed, resizes[0], ht.memory_usage()["buckets"]
+
+
+if __name__ == "__main__":
+    num_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    keys = [f"key-{i}" for i in range(num_keys)]
+
+    for workload in (waves, jitter):
+        print(f"{workload.__name__} ({num_keys} keys)")
+        for name, policy in POLICIES.items():
+            elapsed, resizes, memory = run(workload, policy, keys)
+            print(f"  {name:<13} {elapsed:6.2f}s  {resizes:4} resizes  "
+                  f"bucket array {memory / 1024:8.0f} KiB")
@@ -0,0 +1,304 @@
+"""
+Bounded caches built on HashTable, and a memoize decorator.
+
+Each cached key maps, in a HashTable, to a CacheEntry that is also a node
+of an intrusive doubly linked list, so finding, reordering and evicting
+an entry are all O(1):
+
+    LRUCache  one list in recency order, evicts from the cold end
+    LFUCache  one list per use count (HashTable of count -> list) plus
+              the lowest count in use; evicts the least recently used
+              entry among the least frequently used ones
+
+Both can be limited by number of entries and by bytes (key and value
+sizes from sys.getsizeof), and can expire entries `ttl` seconds after
+they were stored.
+"""
+
+import functools
+import sys
+import time
+
+from hashing import MASK_64
+from hashtable import HashTable
+
+
+def _builtin_hash(key):
+    """
+    Lets the cache tables take any hashable key (memoize uses argument
+    tuples), not just strings.
+    """
+    return hash(key) & MASK_64
+
+
+class CacheEntry:
+    """
+    Cached value, and a node in its cache's linked list
+    """
+    __slots__ = ("key", "value", "size", "expires", "uses", "prev", "next")
+
+    def __init__(self, key, value, size, expires):
+        self.key = key
+        self.value = value
+        self.size = size
+        self.expires = expires
+        self.uses = 1
+        self.prev = None
+        self.next = None
+
+
+class _LinkedList:
+    """
+    Circular doubly linked list of CacheEntry nodes around a sentinel.
+    The front is the most recently used end.
+    """
+    __slots__ = ("head", "length")
+
+    def __init__(self):
+        self.head = CacheEntry(None, None, 0, None)
+        self.head.prev = self.head.next = self.head
+        self.length = 0
+
+    def push_front(self, entry):
+        head = self.head
+        entry.prev = head
+        entry.next = head.next
+        head.next.prev = entry
+        head.next = entry
+        self.length += 1
+
+    def remove(self, entry):
+        entry.prev.next = entry.next
+        entry.next.prev = entry.prev
+        entry.prev = entry.next = None
+        self.length -= 1
+
+    def back(self):
+        entry = self.head.prev
+        return None if entry is self.head else entry
+
+
+class Cache:
+    """
+    Shared bookkeeping for LRUCache and LFUCache: the key table, limits,
+    expiry and counters. Subclasses decide the eviction order.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None, ttl=None,
+                 sizeof=sys.getsizeof, clock=time.monotonic):
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.clock = clock
+
+        self.table = HashTable(hash_function=_builtin_hash)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self.table)
+
+    def __contains__(self, key):
+        entry = self.table.get(key)
+        return entry is not None and not self._expired(entry)
+
+    def _expired(self, entry):
+        return entry.expires is not None and entry.expires <= self.clock()
+
+    def get(self, key, default=None):
+        """
+        Return the cached value for `key` (counting a hit) or `default`
+        (counting a miss).
+        """
+        entry = self.table.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        if self._expired(entry):
+            self._remove(entry)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._touch(entry)
+        return entry.value
+
+    def put(self, key, value):
+        """
+        Cache `value` under `key`, evicting entries to stay within the
+        limits. A value bigger than max_bytes on its own isn't cached.
+        """
+        old = self.table.get(key)
+        if old is not None:
+            self._remove(old)
+
+        size = 0
+        if self.max_bytes is not None:
+            size = self.sizeof(key) + self.sizeof(value)
+            if size > self.max_bytes:
+                return
+
+        # Make room first, so a new entry is never its own victim
+        while len(self.table) and (
+                (self.max_entries is not None and len(self.table) >= self.max_entries)
+                or (self.max_bytes is not None and self.bytes + size > self.max_bytes)):
+            self._remove(self._victim())
+            self.evictions += 1
+
+        expires = None if self.ttl is None else self.clock() + self.ttl
+        entry = CacheEntry(key, value, size, expires)
+        self.table.put(key, entry)
+        self.bytes += size
+        self._link(entry)
+
+    def delete(self, key):
+        """
+        Drop `key` from the cache. Returns whether it was there.
+        """
+        entry = self.table.get(key)
+        if entry is None:
+            return False
+        self._remove(entry)
+        return True
+
+    def clear(self):
+        self.table.clear()
+        self.bytes = 0
+        self._reset_order()
+
+    def _remove(self, entry):
+        self.table.delete(entry.key)
+        self.bytes -= entry.size
+        self._unlink(entry)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.table),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class LRUCache(Cache):
+    """
+    Evicts the least recently used entry first.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._reset_order()
+
+    def _reset_order(self):
+        self.order = _LinkedList()
+
+    def _link(self, entry):
+        self.order.push_front(entry)
+
+    def _unlink(self, entry):
+        self.order.remove(entry)
+
+    def _touch(self, entry):
+        self.order.remove(entry)
+        self.order.push_front(entry)
+
+    def _victim(self):
+        return self.order.back()
+
+
+class LFUCache(Cache):
+    """
+    Evicts the least frequently used entry first, least recently used
+    among equals.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._reset_order()
+
+    def _reset_order(self):
+        # use count -> _LinkedList of the entries used that many times
+        self.by_uses = HashTable(hash_function=_builtin_hash)
+        self.min_uses = 0
+
+    def _list_for(self, uses):
+        entries = self.by_uses.get(uses)
+        if entries is None:
+            entries = _LinkedList()
+            self.by_uses.put(uses, entries)
+        return entries
+
+    def _link(self, entry):
+        entry.uses = 1
+        self.min_uses = 1
+        self._list_for(1).push_front(entry)
+
+    def _unlink(self, entry):
+        entries = self.by_uses.get(entry.uses)
+        entries.remove(entry)
+        if entries.length == 0:
+            # If that was the min_uses list, _victim() finds the new minimum
+            self.by_uses.delete(entry.uses)
+
+    def _touch(self, entry):
+        uses = entry.uses
+        entries = self.by_uses.get(uses)
+        entries.remove(entry)
+        if entries.length == 0:
+            self.by_uses.delete(uses)
+            if self.min_uses == uses:
+                self.min_uses = uses + 1
+        entry.uses = uses + 1
+        self._list_for(uses + 1).push_front(entry)
+
+    def _victim(self):
+        entries = self.by_uses.get(self.min_uses)
+        if entries is None:
+            # The least used entries were deleted or expired directly
+            self.min_uses = min(self.by_uses)
+            entries = self.by_uses.get(self.min_uses)
+        return entries.back()
+
+
+POLICIES = {"lru": LRUCache, "lfu": LFUCache}
+
+
+def memoize(max_entries=None, max_bytes=None, ttl=None, policy="lru", cache=None):
+    """
+    Decorator caching a function's results by its arguments, in a bounded
+    LRU (default) or LFU cache. Pass `cache` to share one between
+    functions. The wrapper exposes it as `.cache`, plus cache_clear().
+
+        @memoize(max_entries=1000)
+        def slow(x, y): ...
+    """
+    if cache is None:
+        cache = POLICIES[policy](max_entries=max_entries, max_bytes=max_bytes, ttl=ttl)
+
+    def decorator(fn):
+        missing = object()
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = args if not kwargs else (args, tuple(sorted(kwargs.items())))
+            value = cache.get(key, missing)
+            if value is missing:
+                value = fn(*args, **kwargs)
+                cache.put(key, value)
+            return value
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
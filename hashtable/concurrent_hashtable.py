@@ -0,0 +1,269 @@
+"""
+Thread-safe chaining hash table using lock striping.
+"""
+
+import threading
+
+from hashtable import HashTable, HashTableEntry
+from resize_policy import DEFAULT_POLICY, MIN_CAPACITY
+
+
+class ConcurrentHashTable(HashTable):
+    """
+    HashTable that can be shared between threads.
+
+    Bucket i is guarded by stripe lock i % num_stripes, so writers to
+    different bucket groups don't wait on each other. Each stripe keeps its
+    own key count, so no shared counter is written under contention.
+
+    get() takes no lock. That's safe because writers only ever change a
+    chain with single reference assignments (append a node, unlink a node,
+    replace a value), and resize() builds a fresh array out of copied nodes
+    and publishes it in one assignment, so a reader always walks an intact
+    chain of either the old or the new array.
+
+    resize() takes every stripe lock (always in the same order) so it
+    can't interleave with writers or another resize.
+    """
+
+    __slots__ = ("num_stripes", "locks", "stripe_counts")
+
+    def __init__(self, capacity=MIN_CAPACITY, hash_function="djb2", num_stripes=16,
+                 resize_policy=DEFAULT_POLICY):
+        self.resize_policy = resize_policy
+        self.reserved_capacity = 0
+        capacity = resize_policy.round_capacity(capacity)
+        self.capacity = capacity
+        self.data = [None] * capacity
+        self.set_hash_function(hash_function)
+
+        self.num_stripes = num_stripes
+        self.locks = [threading.Lock() for _ in range(num_stripes)]
+        self.stripe_counts = [0] * num_stripes
+
+        # Incremental resizing isn't supported here
+        self.incremental = False
+        self.old_data = None
+        self.migrate_index = 0
+
+    @property
+    def count(self):
+        return sum(self.stripe_counts)
+
+    def get_load_factor(self):
+        return self.count / self.capacity
+
+    def update_load_factor(self):
+        self.load_factor = self.count / self.capacity
+
+    def _lock_bucket(self, key_hash):
+        """
+        Lock the stripe for `key_hash`'s bucket and return (data, index,
+        stripe). Retries if a resize swapped the array in the meantime.
+        The caller must release self.locks[stripe].
+        """
+        while True:
+            data = self.data
+            index = key_hash % len(data)
+            stripe = index % self.num_stripes
+            self.locks[stripe].acquire()
+            if self.data is data:
+                return data, index, stripe
+            self.locks[stripe].release()
+
+    def put(self, key, value):
+        """
+        Store the value with the given key.
+        """
+        data, index, stripe = self._lock_bucket(self._hash(key))
+        try:
+            node = data[index]
+            if node is None:
+                data[index] = HashTableEntry(key, value)
+                self.stripe_counts[stripe] += 1
+            else:
+                while node.key != key and node.next is not None:
+                    node = node.next
+                if node.key == key:
+                    node.value = value
+                else:
+                    node.next = HashTableEntry(key, value)
+                    self.stripe_counts[stripe] += 1
+        finally:
+            self.locks[stripe].release()
+
+        capacity = len(data)
+        if self.resize_policy.should_grow(self.count, capacity):
+            self._resize_from(capacity, self.resize_policy.grow_capacity(capacity))
+
+    def delete(self, key):
+        """
+        Remove the value stored with the given key.
+        Print a warning if the key is not found.
+        """
+        found, value = self._remove(key)
+        if not found:
+            print("Error: Key not found.")
+        return value
+
+    def _remove(self, key):
+        """
+        Remove `key`, returning (found, value).
+        """
+        data, index, stripe = self._lock_bucket(self._hash(key))
+        try:
+            node = data[index]
+            prev = None
+            while node is not None and node.key != key:
+                prev = node
+                node = node.next
+
+            if node is None:
+                return False, None
+
+            if prev is None:
+                data[index] = node.next
+            else:
+                prev.next = node.next
+            self.stripe_counts[stripe] -= 1
+        finally:
+            self.locks[stripe].release()
+
+        capacity = len(data)
+        if self.resize_policy.should_shrink(self.count, capacity):
+            new_capacity = self.resize_policy.shrink_capacity(
+                self.count, capacity, floor=self.reserved_capacity)
+            if new_capacity != capacity:
+                self._resize_from(capacity, new_capacity)
+        return True, node.value
+
+    def get(self, key, default=None):
+        """
+        Retrieve the value stored with the given key, without locking.
+        Returns `default` (None) if the key is not found.
+        """
+        data = self.data
+        node = data[self._hash(key) % len(data)]
+        while node is not None:
+            if node.key == key:
+                return node.value
+            node = node.next
+        return default
+
+    def __contains__(self, key):
+        data = self.data
+        node = data[self._hash(key) % len(data)]
+        while node is not None:
+            if node.key == key:
+                return True
+            node = node.next
+        return False
+
+    def _iter_entries(self):
+        """
+        Weakly consistent: walks the array current when iteration started
+        and never raises, but may or may not see concurrent changes.
+        """
+        for node in self.data:
+            while node is not None:
+                yield node.key, node.value
+                node = node.next
+
+    def clear(self):
+        for lock in self.locks:
+            lock.acquire()
+        try:
+            self.stripe_counts = [0] * self.num_stripes
+            self.data = [None] * self.capacity
+        finally:
+            for lock in reversed(self.locks):
+                lock.release()
+
+    def increment(self, key, amount=1):
+        """
+        Atomically add `amount` to the number stored under `key` (a
+        missing key counts as 0) and return the new total.
+        """
+        data, index, stripe = self._lock_bucket(self._hash(key))
+        try:
+            node = data[index]
+            while node is not None:
+                if node.key == key:
+                    node.value += amount
+                    return node.value
+                node = node.next
+
+            entry = HashTableEntry(key, amount)
+            entry.next = data[index]
+            data[index] = entry
+            self.stripe_counts[stripe] += 1
+        finally:
+            self.locks[stripe].release()
+
+        capacity = len(data)
+        if self.resize_policy.should_grow(self.count, capacity):
+            self._resize_from(capacity, self.resize_policy.grow_capacity(capacity))
+        return amount
+
+    # The batch operations are plain loops here: each key still locks
+    # only its own stripe, and the table may resize mid-batch
+
+    def put_many(self, items):
+        for key, value in items:
+            self.put(key, value)
+
+    def get_many(self, keys):
+        return [self.get(key) for key in keys]
+
+    def delete_many(self, keys):
+        """
+        Remove a batch of keys and return their values (None for keys
+        that weren't there, without printing a warning for each).
+        """
+        return [self._remove(key)[1] for key in keys]
+
+    def resize(self, new_capacity=None):
+        """
+        Changes the capacity of the hash table and rehashes all key/value
+        pairs, holding every stripe lock while it does.
+        """
+        self._resize_from(None, new_capacity)
+
+    def _resize_from(self, old_capacity, new_capacity):
+        """
+        Resize to `new_capacity`, unless `old_capacity` is given and the
+        table no longer has it (another thread got there first).
+        """
+        for lock in self.locks:
+            lock.acquire()
+        try:
+            if old_capacity is not None and self.capacity != old_capacity:
+                return
+            if new_capacity is None:
+                new_capacity = self.resize_policy.grow_capacity(self.capacity)
+            new_capacity = self.resize_policy.round_capacity(new_capacity)
+
+            data = [None] * new_capacity
+            for node in self.data:
+                while node is not None:
+                    # Copy rather than relink: lock-free readers may still
+                    # be walking the old chains
+                    index = self._hash(node.key) % new_capacity
+                    entry = HashTableEntry(node.key, node.value)
+                    entry.next = data[index]
+                    data[index] = entry
+                    node = node.next
+
+            # Stripe of a bucket depends on the capacity, so recount
+            counts = [0] * self.num_stripes
+            for index, node in enumerate(data):
+                while node is not None:
+                    counts[index % self.num_stripes] += 1
+                    node = node.next
+
+            self.stripe_counts = counts
+            self.capacity = new_capacity
+            self.data = data
+        finally:
+            for lock in reversed(self.locks):
+                lock.release()
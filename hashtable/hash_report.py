@@ -0,0 +1,62 @@
+"""
+Collision report for the hash functions in hashing.py.
+
+    python hash_report.py [corpus.txt ...]
+
+For the unique words of each corpus (the application texts by default)
+prints, per hash function: full-hash collisions, and for a table sized to
+a 0.7 load factor the empty bucket ratio, longest chain and chi-squared
+against a uniform spread (close to the bucket count is good).
+"""
+
+import os
+import sys
+
+from hashing import HASH_FUNCTIONS, hash_many
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CORPORA = [
+    os.path.join(HERE, "..", "applications", "histo", "robin.txt"),
+    os.path.join(HERE, "..", "applications", "markov", "input.txt"),
+    os.path.join(HERE, "..", "applications", "crack_caesar", "ciphertext.txt"),
+]
+
+
+def byte_sum(key):
+    """
+    The old placeholder "fnv1": sums the bytes, so anagrams collide
+    """
+    return sum(key.encode())
+
+
+def report(words, name, hashes):
+    num_words = len(words)
+    num_buckets = max(8, int(num_words / 0.7))
+
+    collisions = num_words - len(set(hashes))
+
+    buckets = [0] * num_buckets
+    for hash in hashes:
+        buckets[hash % num_buckets] += 1
+
+    expected = num_words / num_buckets
+    chi_squared = sum((n - expected) ** 2 for n in buckets) / expected
+    empty = buckets.count(0) / num_buckets
+
+    print(f"  {name:<9} collisions {collisions:6}  empty {empty:6.1%}  "
+          f"longest chain {max(buckets):3}  chi2 {chi_squared:10.1f} "
+          f"(buckets {num_buckets})")
+
+
+if __name__ == "__main__":
+    corpora = sys.argv[1:] or DEFAULT_CORPORA
+
+    for path in corpora:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            words = sorted(set(f.read().split()))
+
+        print(f"{os.path.basename(path)}: {len(words)} unique words")
+        report(words, "bytesum", [byte_sum(w) for w in words])
+        for name in HASH_FUNCTIONS:
+            report(words, name, hash_many(words, name))
+        print()
@@ -0,0 +1,127 @@
+"""
+String hash functions for HashTable.
+
+fnv1_64, fnv1a_64 and djb2_32 hash the UTF-8 bytes of a key and are masked
+to their word size, so they stay fixed-width ints however long the key.
+hash_many() hashes a whole batch of keys at once; with NumPy installed it
+packs the keys into one byte buffer and runs each hash byte-column by
+byte-column across every key, otherwise it falls back to a plain loop.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy is optional
+    np = None
+
+
+FNV_OFFSET_64 = 0xcbf29ce484222325
+FNV_PRIME_64 = 0x100000001b3
+MASK_64 = 0xffffffffffffffff
+
+DJB2_SEED = 5381
+MASK_32 = 0xffffffff
+
+
+def fnv1_64(key):
+    """
+    FNV-1 hash, 64-bit
+    https://en.wikipedia.org/wiki/Fowler%E2%80%93Noll%E2%80%93Vo_hash_function
+    """
+    hash = FNV_OFFSET_64
+    for byte in key.encode():
+        hash = (hash * FNV_PRIME_64) & MASK_64
+        hash ^= byte
+    return hash
+
+
+def fnv1a_64(key):
+    """
+    FNV-1a hash, 64-bit (xor before multiply, better avalanche than FNV-1)
+    """
+    hash = FNV_OFFSET_64
+    for byte in key.encode():
+        hash ^= byte
+        hash = (hash * FNV_PRIME_64) & MASK_64
+    return hash
+
+
+def djb2_32(key):
+    """
+    DJB2 hash, 32-bit
+    """
+    hash = DJB2_SEED
+    for byte in key.encode():
+        hash = ((hash << 5) + hash + byte) & MASK_32
+    return hash
+
+
+HASH_FUNCTIONS = {
+    "fnv1": fnv1_64,
+    "fnv1a": fnv1a_64,
+    "djb2": djb2_32,
+}
+
+
+def _hash_many_numpy(keys, algorithm):
+    encoded = [key.encode() for key in keys]
+    n = len(encoded)
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=n)
+    buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    offsets = np.zeros(n, dtype=np.int64)
+    np.cumsum(lengths[:-1], out=offsets[1:])
+
+    # Longest keys first, so the keys still consuming bytes at column i
+    # are always a prefix of the order
+    order = np.argsort(-lengths, kind="stable")
+    lengths = lengths[order]
+    offsets = offsets[order]
+
+    if algorithm == "djb2":
+        hashes = np.full(n, DJB2_SEED, dtype=np.uint32)
+        multiplier = np.uint32(33)
+    else:
+        hashes = np.full(n, FNV_OFFSET_64, dtype=np.uint64)
+        multiplier = np.uint64(FNV_PRIME_64)
+
+    # Number of keys longer than each column index
+    active_counts = np.searchsorted(-lengths, -np.arange(lengths[0]), side="left")
+
+    # Fixed-width array arithmetic wraps, which does the masking for us
+    for column, active in enumerate(active_counts.tolist()):
+        byte = buffer[offsets[:active] + column].astype(hashes.dtype)
+        current = hashes[:active]
+        if algorithm == "djb2":
+            current *= multiplier
+            current += byte
+        elif algorithm == "fnv1a":
+            current ^= byte
+            current *= multiplier
+        else:
+            current *= multiplier
+            current ^= byte
+
+    result = np.empty_like(hashes)
+    result[order] = hashes
+    return result
+
+
+def hash_many(keys, algorithm="fnv1a", modulus=None):
+    """
+    Hash a batch of string keys with one of HASH_FUNCTIONS.
+    Returns a list of ints, reduced `% modulus` when one is given.
+    """
+    if algorithm not in HASH_FUNCTIONS:
+        raise ValueError(f"Unknown hash algorithm: {algorithm!r}")
+    if not isinstance(keys, (list, tuple)):
+        keys = list(keys)
+
+    if np is None or len(keys) == 0:
+        hash = HASH_FUNCTIONS[algorithm]
+        if modulus is None:
+            return [hash(key) for key in keys]
+        return [hash(key) % modulus for key in keys]
+
+    hashes = _hash_many_numpy(keys, algorithm)
+    if modulus is not None:
+        hashes = hashes.astype(np.uint64) % np.uint64(modulus)
+    return hashes.tolist()
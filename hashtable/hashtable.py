@@ -1,7 +1,19 @@
+import sys
+from collections.abc import ItemsView, MutableMapping, ValuesView
+
+import instrumentation
+import persist
+from hashing import HASH_FUNCTIONS, djb2_32, fnv1_64, fnv1a_64, hash_many
+from resize_policy import DEFAULT_POLICY, MIN_CAPACITY
+
+
 class HashTableEntry:
     """
     Linked List hash table key/value pair
     """
+    # No per-node __dict__, which more than halves the size of a node
+    __slots__ = ("key", "value", "next")
+
     def __init__(self, key, value):
         self.key = key
         self.value = value
@@ -10,21 +22,126 @@ class HashTableEntry:
     def __repr__(self):
         return (f"(key = {self.key}, value = {self.value})")
 
-# Hash table can't have fewer than this many slots
-MIN_CAPACITY = 8
 
 
-class HashTable:
+def _objects_size(objects, seen):
+    """
+    Total sys.getsizeof() of `objects`, counting each object once
+    (keys and values are often shared or interned).
+    """
+    total = 0
+    for obj in objects:
+        if id(obj) not in seen:
+            seen.add(id(obj))
+            total += sys.getsizeof(obj)
+    return total
+
+
+# Default for lookups that have to tell "missing" apart from a None value
+_MISSING = object()
+
+# Marks a slot whose entry was deleted from an open-addressing table, so
+# probe sequences running through it keep going
+_DELETED = object()
+
+
+class HashTableItemsView(ItemsView):
+    """
+    items() view that walks the table's storage instead of looking up
+    each key again.
+    """
+
+    def __iter__(self):
+        return self._mapping._iter_entries()
+
+
+class HashTableValuesView(ValuesView):
+
+    def __iter__(self):
+        for _, value in self._mapping._iter_entries():
+            yield value
+
+
+class HashTable(MutableMapping):
     """
     A hash table that with `capacity` buckets
     that accepts string keys
-    Implement this.
+
+    Implements the MutableMapping protocol: ht[key], key in ht, len(ht),
+    iteration and lazy keys()/values()/items() views. Iterators raise
+    RuntimeError if the table gains or loses keys while they're running.
+
+    backend="chaining" (default) keeps a linked list of entries per bucket.
+    backend="open" returns an OpenAddressingHashTable instead, which keeps
+    hashes, keys and values in parallel flat lists.
+
+    hash_function picks the hash: "djb2" (default), "fnv1", "fnv1a" or any
+    callable mapping a key to a non-negative int. The named ones can also
+    hash a batch of keys at once through hash_indexes().
+
+    incremental=True spreads automatic resizes over later operations:
+    the old and new bucket arrays live side by side and every
+    put/get/delete moves at least `migrate_step` buckets across, so no
+    single operation pays for a full rehash. It moves more when that's
+    needed to finish before the next resize can be triggered.
+
+    resize_policy (a ResizePolicy) sets the load factor thresholds, growth
+    factor, minimum capacity and power-of-two sizing.
+
+    enable_instrumentation() counts probes per get/put/delete and resizes;
+    it costs nothing until it's switched on.
     """
 
-    def __init__(self, capacity=MIN_CAPACITY):
+    # Attributes live in slots, so enable_instrumentation() can switch a
+    # table's class and back without slowing its attribute lookups down.
+    # Anything else set on a table still goes in its __dict__.
+    __slots__ = ("resize_policy", "reserved_capacity", "capacity", "data", "count",
+                 "version", "load_factor", "_hash", "hash_name", "incremental",
+                 "migrate_step", "migrate_rate", "old_data", "migrate_index",
+                 "__dict__", "__weakref__")
+
+    # OperationStats while instrumented, see enable_instrumentation()
+    instrumentation = None
+
+    def __new__(cls, capacity=MIN_CAPACITY, backend="chaining", **kwargs):
+        if cls is HashTable:
+            if backend == "open":
+                cls = OpenAddressingHashTable
+            elif backend != "chaining":
+                raise ValueError(f"Unknown backend: {backend!r}")
+        if issubclass(cls, OpenAddressingHashTable) and \
+                ("incremental" in kwargs or "migrate_step" in kwargs):
+            raise ValueError("incremental resizing is only supported by the chaining backend")
+        return super().__new__(cls)
+
+    def __init__(self, capacity=MIN_CAPACITY, backend="chaining",
+                 hash_function="djb2", incremental=False, migrate_step=4,
+                 resize_policy=DEFAULT_POLICY):
+        self.resize_policy = resize_policy
+        self.reserved_capacity = 0
+        capacity = resize_policy.round_capacity(capacity)
         self.capacity = capacity
         self.data = [None] * capacity
         self.count = 0
+        # Bumped whenever keys are added or removed or the table is resized,
+        # so running iterators can tell they've been invalidated
+        self.version = 0
+        self.set_hash_function(hash_function)
+
+        # Incremental resize state
+        self.incremental = incremental
+        self.migrate_step = migrate_step
+        # Buckets moved per operation during the current migration
+        self.migrate_rate = migrate_step
+        self.old_data = None
+        self.migrate_index = 0
+
+    @property
+    def num_keys(self):
+        """
+        Number of keys stored in the hash table
+        """
+        return self.count
 
     def get_num_slots(self):
         """
@@ -53,51 +170,134 @@ class HashTable:
         """
         FNV-1 Hash, 64-bit
         https://en.wikipedia.org/wiki/Fowler%E2%80%93Noll%E2%80%93Vo_hash_function
-
-        Implement this, and/or DJB2.
         """
-        total = 0
-        for n in key.encode():
-            total += n
-            total &= 0xffffffffffffffff #64 bit
-        
-        return total
+        return fnv1_64(key)
 
+    def fnv1a(self, key):
+        """
+        FNV-1a Hash, 64-bit
+        """
+        return fnv1a_64(key)
 
     def djb2(self, key):
         """
         DJB2 hash, 32-bit
-        Implement this, and/or FNV-1.
         """
-        hash = 5381
-        for x in key:
-            hash = (hash * 33) + ord(x)
-        return hash
+        return djb2_32(key)
+
+    def set_hash_function(self, hash_function):
+        """
+        Choose the hash used by hash_index(). Only call this on an empty
+        table, keys already stored won't be found under a new hash.
+        """
+        if callable(hash_function):
+            self.hash_name = None
+            self._hash = hash_function
+        elif hash_function in HASH_FUNCTIONS:
+            self.hash_name = hash_function
+            self._hash = HASH_FUNCTIONS[hash_function]
+        else:
+            raise ValueError(f"Unknown hash function: {hash_function!r}")
 
     def hash_index(self, key):
         """
         Take an arbitrary key and return a valid integer index
         between within the storage capacity of the hash table.
         """
-        #return self.fnv1(key) % self.capacity
-        return self.djb2(key) % self.capacity
+        return self._hash(key) % self.capacity
+
+    def hash_indexes(self, keys):
+        """
+        hash_index() for a batch of keys, using the vectorized hash_many()
+        when the table uses one of the named hash functions.
+        """
+        if self.hash_name is None:
+            return [self._hash(key) % self.capacity for key in keys]
+        return hash_many(keys, self.hash_name, self.capacity)
+
+    def hash_keys(self, keys):
+        """
+        Full (unreduced) hashes for a batch of keys.
+        """
+        if self.hash_name is None:
+            return [self._hash(key) for key in keys]
+        return hash_many(keys, self.hash_name)
+
+    def capacity_for(self, num_keys):
+        """
+        Capacity, growing from the current one, that holds `num_keys`
+        keys without going over the policy's grow threshold.
+        """
+        return self.resize_policy.capacity_for(num_keys, self.capacity)
+
+    def enable_instrumentation(self, callback=None):
+        """
+        Start counting probes per get/put/delete, resizes and time spent
+        rehashing; the counts show up in stats()["operations"].
+        `callback(event, details)` is called after each of those events.
+        Bulk operations aren't counted per key, only their resizes.
+        """
+        return instrumentation.instrument(self, callback)
+
+    def disable_instrumentation(self):
+        instrumentation.uninstrument(self)
+
+    def save(self, path):
+        """
+        Write the table to `path` in the persist module's file format.
+        """
+        persist.save(self, path)
+
+    @staticmethod
+    def open_mmap(path):
+        """
+        Open a file written by save() as a read-only MappedHashTable,
+        which answers get() from the memory-mapped file directly.
+        """
+        return persist.open_mmap(path)
+
+    def reserve(self, num_keys):
+        """
+        Make room for `num_keys` keys in one resize, and don't shrink
+        below that room afterwards.
+        """
+        new_capacity = self.capacity_for(num_keys)
+        if new_capacity != self.capacity:
+            self.resize(new_capacity)
+        self.reserved_capacity = new_capacity
+
+    @classmethod
+    def from_items(cls, items, **kwargs):
+        """
+        Build a table from (key, value) pairs, sized up front for the
+        number of pairs so it never resizes while loading.
+        Keyword arguments are passed on to HashTable().
+        """
+        ht = cls(**kwargs)
+        # put_many() grows the empty table once, before storing anything
+        ht.put_many(items)
+        return ht
 
     def put(self, key, value):
         """
         Store the value with the given key.
         Hash collisions should be handled with Linked List Chaining.
         """
-        # Use hash_index to create index value based on the key
-        index = self.hash_index(key)
+        if self.old_data is not None:
+            self._migrate(self.migrate_rate)
 
-        if self.data[index] is None:
+        # Find the bucket the key lives in (old array while migrating)
+        data, index = self._locate(key)
+
+        if data[index] is None:
             # No collision. New key so insert value
-            self.data[index] = HashTableEntry(key, value)
+            data[index] = HashTableEntry(key, value)
             self.count += 1
+            self.version += 1
 
         else:
             # Collision!
-            node = self.data[index]
+            node = data[index]
 
             while node.key != key and node.next is not None:
                 node = node.next
@@ -109,11 +309,12 @@ class HashTable:
                 # New key -> insert value
                 node.next = HashTableEntry(key, value)
                 self.count += 1
+                self.version += 1
 
         # STRETCH
         self.update_load_factor()
-        if self.load_factor > 0.7:
-            self.resize()
+        if self.resize_policy.should_grow(self.count, self.capacity):
+            self._auto_resize(self.resize_policy.grow_capacity(self.capacity))
 
     def delete(self, key):
         """
@@ -121,15 +322,18 @@ class HashTable:
         Print a warning if the key is not found.
         Implement this.
         """
-        index = self.hash_index(key)
+        if self.old_data is not None:
+            self._migrate(self.migrate_rate)
+
+        data, index = self._locate(key)
 
-        if self.data[index] is None:
+        if data[index] is None:
             # If no matching hash, nothing to delete
             print("Error: Key not found.")
             return None
 
         else:
-            node = self.data[index]
+            node = data[index]
             prev = None
             while node.key != key and node.next is not None:
                 prev = node
@@ -138,16 +342,19 @@ class HashTable:
             if node.key == key:
                 # Key found -> delete
                 if prev is None:
-                    self.data[index] = node.next
+                    data[index] = node.next
                 else:
                     prev.next = node.next
 
                 # STRETCH
                 # check load factor, re-size if necessary
                 self.count -= 1
+                self.version += 1
                 self.update_load_factor()
-                if self.load_factor < 0.2 and self.capacity >= 16:
-                    self.resize(self.capacity // 2)
+                if self.resize_policy.should_shrink(self.count, self.capacity):
+                    new_capacity = self._shrunk_capacity()
+                    if new_capacity != self.capacity:
+                        self._auto_resize(new_capacity)
                 return node.value
 
             else:
@@ -155,18 +362,21 @@ class HashTable:
                 return None
         
 
-    def get(self, key):
+    def get(self, key, default=None):
         """
         Retrieve the value stored with the given key.
-        Returns None if the key is not found.
+        Returns `default` (None) if the key is not found.
         Implement this.
         """
-        index = self.hash_index(key)
-        if self.data[index] is None:
-            # Not found, return none
-            return None
+        if self.old_data is not None:
+            self._migrate(self.migrate_rate)
+
+        data, index = self._locate(key)
+        if data[index] is None:
+            # Not found, return default
+            return default
         else:
-            node = self.data[index]
+            node = data[index]
             while node.key != key and node.next is not None:
                 node = node.next
             if node.key == key:
@@ -174,7 +384,215 @@ class HashTable:
                 return node.value
             else:
                 # Not found
-                return None
+                return default
+
+    def __contains__(self, key):
+        """
+        Check for a key without returning its value.
+        """
+        if self.old_data is not None:
+            self._migrate(self.migrate_rate)
+
+        data, index = self._locate(key)
+        node = data[index]
+        while node is not None:
+            if node.key == key:
+                return True
+            node = node.next
+        return False
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self.delete(key)
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for key, _ in self._iter_entries():
+            yield key
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self._iter_entries())!r})"
+
+    def items(self):
+        return HashTableItemsView(self)
+
+    def values(self):
+        return HashTableValuesView(self)
+
+    def _iter_entries(self):
+        """
+        Yield (key, value) for every entry, straight from the buckets.
+        """
+        if self.old_data is not None:
+            # Later gets would otherwise move nodes under the iterator
+            self._finish_migration()
+
+        version = self.version
+        for node in self.data:
+            while node is not None:
+                yield node.key, node.value
+                if self.version != version:
+                    raise RuntimeError("HashTable changed size during iteration")
+                node = node.next
+
+    def clear(self):
+        """
+        Remove every key, keeping the current capacity.
+        """
+        self.data = [None] * self.capacity
+        self.old_data = None
+        self.migrate_index = 0
+        self.count = 0
+        self.version += 1
+        self.update_load_factor()
+
+    def increment(self, key, amount=1):
+        """
+        Add `amount` to the number stored under `key` (a missing key
+        counts as 0) and return the new total. Does one lookup, where
+        get() followed by put() does two.
+        """
+        if self.old_data is not None:
+            self._migrate(self.migrate_rate)
+
+        data, index = self._locate(key)
+        node = data[index]
+        while node is not None:
+            if node.key == key:
+                node.value += amount
+                return node.value
+            node = node.next
+
+        # New key -> insert at the head of the chain
+        entry = HashTableEntry(key, amount)
+        entry.next = data[index]
+        data[index] = entry
+        self.count += 1
+        self.version += 1
+
+        self.update_load_factor()
+        if self.resize_policy.should_grow(self.count, self.capacity):
+            self._auto_resize(self.resize_policy.grow_capacity(self.capacity))
+        return amount
+
+    def put_many(self, items):
+        """
+        Store every (key, value) pair in `items`.
+        Resizes at most once, to fit all the pairs as if they were new
+        keys, and hashes the keys as one batch.
+        """
+        items = list(items)
+        if self.old_data is not None:
+            self._finish_migration()
+
+        new_capacity = self.capacity_for(self.count + len(items))
+        if new_capacity != self.capacity:
+            self.resize(new_capacity)
+
+        data = self.data
+        count = self.count
+        indexes = self.hash_indexes([key for key, _ in items])
+
+        for (key, value), index in zip(items, indexes):
+            node = data[index]
+            if node is None:
+                data[index] = HashTableEntry(key, value)
+                count += 1
+                continue
+
+            while node.key != key and node.next is not None:
+                node = node.next
+            if node.key == key:
+                node.value = value
+            else:
+                node.next = HashTableEntry(key, value)
+                count += 1
+
+        if count != self.count:
+            self.count = count
+            self.version += 1
+        self.update_load_factor()
+
+    def get_many(self, keys):
+        """
+        Retrieve the values for a batch of keys, None for missing keys.
+        """
+        keys = list(keys)
+        if self.old_data is not None:
+            return [self.get(key) for key in keys]
+
+        data = self.data
+        values = []
+        for key, index in zip(keys, self.hash_indexes(keys)):
+            node = data[index]
+            while node is not None and node.key != key:
+                node = node.next
+            values.append(None if node is None else node.value)
+        return values
+
+    def delete_many(self, keys):
+        """
+        Remove a batch of keys and return their values (None for keys
+        that weren't there, without printing a warning for each).
+        Shrinks at most once, after all the keys are gone.
+        """
+        keys = list(keys)
+        if self.old_data is not None:
+            self._finish_migration()
+
+        data = self.data
+        values = []
+        for key, index in zip(keys, self.hash_indexes(keys)):
+            node = data[index]
+            prev = None
+            while node is not None and node.key != key:
+                prev = node
+                node = node.next
+
+            if node is None:
+                values.append(None)
+                continue
+
+            if prev is None:
+                data[index] = node.next
+            else:
+                prev.next = node.next
+            self.count -= 1
+            self.version += 1
+            values.append(node.value)
+
+        self._shrink_to_fit()
+        return values
+
+    def _shrunk_capacity(self):
+        """
+        Capacity the policy shrinks an underloaded table to, keeping any
+        room set aside with reserve().
+        """
+        return self.resize_policy.shrink_capacity(
+            self.count, self.capacity, floor=self.reserved_capacity)
+
+    def _shrink_to_fit(self):
+        """
+        Shrink as far as the policy allows, in a single resize.
+        """
+        if self.resize_policy.should_shrink(self.count, self.capacity):
+            new_capacity = self._shrunk_capacity()
+            if new_capacity != self.capacity:
+                self.resize(new_capacity)
+        self.update_load_factor()
 
     def resize(self, new_capacity= None):
         """
@@ -186,27 +604,194 @@ class HashTable:
         - O(n) traverse old hash table
         - for each element: find its slot in new array and place it there
 
+        Nodes are relinked into the new array rather than re-put, so no
+        entries are allocated and no nested resize can happen.
+
         STRETCH: 
         do this automatically when hashtable is overloaded or underloaded
-        ht is overloaded when load factor > 0.7
-        ht is underloaded when load factor < 0.2
+        ht is overloaded when load factor > resize_policy.grow_at (0.7)
+        ht is underloaded when load factor < resize_policy.shrink_at (0.2)
         """
+        if self.old_data is not None:
+            self._finish_migration()
+
         old_data = self.data
 
         if new_capacity is None:
-            new_capacity = len(self.data) * 2
+            new_capacity = self.resize_policy.grow_capacity(self.capacity)
+        new_capacity = self.resize_policy.round_capacity(new_capacity)
 
         self.data = [None] * new_capacity
         self.capacity = new_capacity
+        self.version += 1
 
         for node in old_data:
-            while node is not None:
-                self.put(node.key, node.value)
-                self.count -= 1
-                node = node.next
+            self._relink(node)
 
         self.update_load_factor()
-   
+
+    def _auto_resize(self, new_capacity):
+        """
+        Resize triggered by the load factor. In incremental mode this only
+        allocates the new array; buckets are moved over by later operations.
+        """
+        if not self.incremental:
+            self.resize(new_capacity)
+            return
+
+        if self.old_data is not None:
+            # Only reachable if the count changed without migrating, see
+            # migrate_rate below
+            self._finish_migration()
+
+        self.old_data = self.data
+        self.migrate_index = 0
+        self.version += 1
+        self.data = [None] * new_capacity
+        self.capacity = new_capacity
+        self.update_load_factor()
+
+        # Every put/delete migrates first, so moving this many buckets per
+        # operation finishes before the count can reach the next threshold
+        headroom = self.resize_policy.headroom(self.count, new_capacity)
+        self.migrate_rate = max(self.migrate_step, -(-len(self.old_data) // headroom))
+
+    def _locate(self, key):
+        """
+        Return (bucket array, index) of the bucket that holds `key`.
+        While migrating, buckets of the old array that haven't been moved
+        yet are still authoritative.
+        """
+        key_hash = self._hash(key)
+        old_data = self.old_data
+        if old_data is not None:
+            old_index = key_hash % len(old_data)
+            if old_index >= self.migrate_index:
+                return old_data, old_index
+        return self.data, key_hash % self.capacity
+
+    def _relink(self, node):
+        """
+        Move a chain of nodes into their buckets in self.data.
+        """
+        data = self.data
+        capacity = self.capacity
+        while node is not None:
+            next_node = node.next
+            index = self._hash(node.key) % capacity
+            node.next = data[index]
+            data[index] = node
+            node = next_node
+
+    def _migrate(self, buckets):
+        """
+        Move up to `buckets` buckets from the old array to the new one.
+        """
+        old_data = self.old_data
+        stop = min(self.migrate_index + buckets, len(old_data))
+        for i in range(self.migrate_index, stop):
+            node = old_data[i]
+            if node is not None:
+                old_data[i] = None
+                self._relink(node)
+        self.migrate_index = stop
+
+        if stop == len(old_data):
+            self.old_data = None
+            self.migrate_index = 0
+
+    def _finish_migration(self):
+        self._migrate(len(self.old_data))
+
+    def _probe_length(self, key):
+        """
+        Number of chain nodes a lookup of `key` visits.
+        """
+        data, index = self._locate(key)
+        node = data[index]
+        probes = 0
+        while node is not None:
+            probes += 1
+            if node.key == key:
+                break
+            node = node.next
+        return probes
+
+    def _nodes(self):
+        """
+        Every entry node, including ones still in the old array while
+        an incremental resize is running.
+        """
+        arrays = [self.data] if self.old_data is None else [self.old_data, self.data]
+        for data in arrays:
+            for node in data:
+                while node is not None:
+                    yield node
+                    node = node.next
+
+    def memory_usage(self):
+        """
+        Approximate bytes used by the table, per part: the bucket
+        array(s), the entry nodes, and the key and value objects.
+        Objects shared between entries are only counted once.
+        """
+        buckets = sys.getsizeof(self.data)
+        if self.old_data is not None:
+            buckets += sys.getsizeof(self.old_data)
+
+        nodes = keys = values = 0
+        seen = set()
+        for node in self._nodes():
+            nodes += sys.getsizeof(node)
+            keys += _objects_size((node.key,), seen)
+            values += _objects_size((node.value,), seen)
+
+        return {
+            "buckets": buckets,
+            "nodes": nodes,
+            "keys": keys,
+            "values": values,
+            "total": buckets + nodes + keys + values,
+        }
+
+    def stats(self):
+        """
+        Snapshot of how the keys are spread over the buckets:
+        chain length histogram ({length: number of buckets}), longest
+        chain, share of empty buckets, and memory_usage().
+        """
+        histogram = {}
+        arrays = [self.data] if self.old_data is None else [self.old_data, self.data]
+        for data in arrays:
+            for node in data:
+                length = 0
+                while node is not None:
+                    length += 1
+                    node = node.next
+                histogram[length] = histogram.get(length, 0) + 1
+
+        # Migrated-out buckets of the old array aren't really buckets
+        num_buckets = self.capacity
+        if self.old_data is not None:
+            num_buckets += len(self.old_data) - self.migrate_index
+            histogram[0] -= self.migrate_index
+
+        return {
+            "num_keys": self.count,
+            "capacity": self.capacity,
+            "load_factor": self.get_load_factor(),
+            "chain_lengths": dict(sorted(histogram.items())),
+            "max_chain": max(histogram),
+            "empty_bucket_ratio": histogram.get(0, 0) / num_buckets,
+            "memory": self.memory_usage(),
+            "operations": self._operation_stats(),
+        }
+
+    def _operation_stats(self):
+        if self.instrumentation is None:
+            return None
+        return self.instrumentation.snapshot()
+
     def check_ht(self):
         """
         for testing
@@ -215,6 +800,339 @@ class HashTable:
         print(f"Size: {ht.capacity}, Count: {ht.count}")
         # print(f"Data: {ht.data}")
 
+
+class OpenAddressingHashTable(HashTable):
+    """
+    Hash table using open addressing with linear probing.
+
+    Instead of one HashTableEntry per key, slots live in three parallel
+    lists: the full hash, the key and the value. A slot is empty when its
+    key is None and a tombstone when its key is _DELETED.
+    Create one with HashTable(capacity, backend="open").
+    """
+
+    __slots__ = ("slot_hashes", "slot_keys", "slot_values", "tombstones")
+
+    def __init__(self, capacity=MIN_CAPACITY, backend="open",
+                 hash_function="djb2", resize_policy=DEFAULT_POLICY):
+        if resize_policy.grow_at >= 1:
+            raise ValueError("Open addressing needs grow_at below 1")
+        self.resize_policy = resize_policy
+        self.reserved_capacity = 0
+        capacity = resize_policy.round_capacity(capacity)
+        self.capacity = capacity
+        self.slot_hashes = [None] * capacity
+        self.slot_keys = [None] * capacity
+        self.slot_values = [None] * capacity
+        self.count = 0
+        self.tombstones = 0
+        self.version = 0
+        self.set_hash_function(hash_function)
+
+    def _find_slot(self, key, key_hash):
+        """
+        Probe for `key`. Returns (index, found).
+        If the key isn't there, index is the slot it should be stored in
+        (the first tombstone on the probe path, else the empty slot).
+        """
+        capacity = self.capacity
+        hashes = self.slot_hashes
+        keys = self.slot_keys
+        index = key_hash % capacity
+        free = None
+
+        while True:
+            slot_key = keys[index]
+            if slot_key is None:
+                # Empty slot ends the probe sequence
+                return (index if free is None else free), False
+            if slot_key is _DELETED:
+                if free is None:
+                    free = index
+            elif hashes[index] == key_hash and slot_key == key:
+                return index, True
+            index += 1
+            if index == capacity:
+                index = 0
+
+    def put(self, key, value):
+        """
+        Store the value with the given key.
+        Hash collisions are handled by probing for the next free slot.
+        """
+        key_hash = self._hash(key)
+        index, found = self._find_slot(key, key_hash)
+
+        if found:
+            # Duplicate key -> update value
+            self.slot_values[index] = value
+            return
+
+        if self.slot_keys[index] is _DELETED:
+            self.tombstones -= 1
+        self.slot_hashes[index] = key_hash
+        self.slot_keys[index] = key
+        self.slot_values[index] = value
+        self.count += 1
+        self.version += 1
+
+        # Tombstones lengthen probes as much as live keys do
+        self.update_load_factor()
+        if self.resize_policy.should_grow(self.count + self.tombstones, self.capacity):
+            # Resizing drops the tombstones, so if they're what filled the
+            # table a rehash at the same capacity is enough
+            self.resize(self.resize_policy.capacity_for(self.count, self.capacity))
+
+    def delete(self, key):
+        """
+        Remove the value stored with the given key.
+        Print a warning if the key is not found.
+        """
+        index, found = self._find_slot(key, self._hash(key))
+
+        if not found:
+            print("Error: Key not found.")
+            return None
+
+        value = self.slot_values[index]
+        self.slot_hashes[index] = None
+        self.slot_keys[index] = _DELETED
+        self.slot_values[index] = None
+        self.count -= 1
+        self.tombstones += 1
+        self.version += 1
+
+        self._shrink_to_fit()
+        return value
+
+    def get(self, key, default=None):
+        """
+        Retrieve the value stored with the given key.
+        Returns `default` (None) if the key is not found.
+        """
+        index, found = self._find_slot(key, self._hash(key))
+        if found:
+            return self.slot_values[index]
+        return default
+
+    def __contains__(self, key):
+        return self._find_slot(key, self._hash(key))[1]
+
+    def _iter_entries(self):
+        version = self.version
+        for key, value in zip(self.slot_keys, self.slot_values):
+            if key is None or key is _DELETED:
+                continue
+            yield key, value
+            if self.version != version:
+                raise RuntimeError("HashTable changed size during iteration")
+
+    def clear(self):
+        """
+        Remove every key, keeping the current capacity.
+        """
+        self.slot_hashes = [None] * self.capacity
+        self.slot_keys = [None] * self.capacity
+        self.slot_values = [None] * self.capacity
+        self.count = 0
+        self.tombstones = 0
+        self.version += 1
+        self.update_load_factor()
+
+    def memory_usage(self):
+        """
+        Approximate bytes used by the table, per part: the three slot
+        lists and the key and value objects. Objects shared between
+        slots are only counted once.
+        """
+        slots = (sys.getsizeof(self.slot_hashes) + sys.getsizeof(self.slot_keys)
+                 + sys.getsizeof(self.slot_values))
+        seen = set()
+        hashes = keys = values = 0
+        for key_hash, key, value in zip(self.slot_hashes, self.slot_keys, self.slot_values):
+            if key is None or key is _DELETED:
+                continue
+            hashes += _objects_size((key_hash,), seen)
+            keys += _objects_size((key,), seen)
+            values += _objects_size((value,), seen)
+
+        return {
+            "slots": slots,
+            "hashes": hashes,
+            "keys": keys,
+            "values": values,
+            "total": slots + hashes + keys + values,
+        }
+
+    def stats(self):
+        """
+        Snapshot of how the keys are spread over the slots: probe length
+        histogram ({probes needed to find a key: number of keys}),
+        longest probe, share of empty slots, tombstones and memory_usage().
+        """
+        capacity = self.capacity
+        histogram = {}
+        empty = 0
+        for index, (key_hash, key) in enumerate(zip(self.slot_hashes, self.slot_keys)):
+            if key is None:
+                empty += 1
+            elif key is not _DELETED:
+                probes = (index - key_hash % capacity) % capacity + 1
+                histogram[probes] = histogram.get(probes, 0) + 1
+
+        return {
+            "num_keys": self.count,
+            "capacity": capacity,
+            "load_factor": self.get_load_factor(),
+            "probe_lengths": dict(sorted(histogram.items())),
+            "max_probe": max(histogram, default=0),
+            "empty_slot_ratio": empty / capacity,
+            "tombstones": self.tombstones,
+            "memory": self.memory_usage(),
+            "operations": self._operation_stats(),
+        }
+
+    def _probe_length(self, key):
+        """
+        Number of slots a lookup of `key` inspects.
+        """
+        key_hash = self._hash(key)
+        index = key_hash % self.capacity
+        probes = 1
+        while True:
+            slot_key = self.slot_keys[index]
+            if slot_key is None or (slot_key == key and self.slot_hashes[index] == key_hash):
+                return probes
+            probes += 1
+            index = (index + 1) % self.capacity
+
+    def capacity_for(self, num_keys):
+        """
+        Like HashTable.capacity_for(), counting tombstones as taken slots.
+        """
+        return super().capacity_for(num_keys + self.tombstones)
+
+    def increment(self, key, amount=1):
+        """
+        Add `amount` to the number stored under `key` (a missing key
+        counts as 0) and return the new total, with one probe.
+        """
+        index, found = self._find_slot(key, self._hash(key))
+        if found:
+            self.slot_values[index] += amount
+            return self.slot_values[index]
+        # The class's put(), so an instrumented table counts one operation
+        OpenAddressingHashTable.put(self, key, amount)
+        return amount
+
+    def put_many(self, items):
+        """
+        Store every (key, value) pair in `items`, resizing at most once
+        and hashing the keys as one batch.
+        """
+        items = list(items)
+        new_capacity = self.capacity_for(self.count + len(items))
+        if new_capacity != self.capacity:
+            self.resize(new_capacity)
+
+        hashes = self.slot_hashes
+        keys = self.slot_keys
+        values = self.slot_values
+        find_slot = self._find_slot
+
+        for (key, value), key_hash in zip(items, self.hash_keys([k for k, _ in items])):
+            index, found = find_slot(key, key_hash)
+            if not found:
+                if keys[index] is _DELETED:
+                    self.tombstones -= 1
+                hashes[index] = key_hash
+                keys[index] = key
+                self.count += 1
+                self.version += 1
+            values[index] = value
+
+        self.update_load_factor()
+
+    def get_many(self, keys):
+        """
+        Retrieve the values for a batch of keys, None for missing keys.
+        """
+        keys = list(keys)
+        values = self.slot_values
+        find_slot = self._find_slot
+        result = []
+        for key, key_hash in zip(keys, self.hash_keys(keys)):
+            index, found = find_slot(key, key_hash)
+            result.append(values[index] if found else None)
+        return result
+
+    def delete_many(self, keys):
+        """
+        Remove a batch of keys and return their values (None for keys
+        that weren't there). Shrinks at most once.
+        """
+        keys = list(keys)
+        find_slot = self._find_slot
+        result = []
+        for key, key_hash in zip(keys, self.hash_keys(keys)):
+            index, found = find_slot(key, key_hash)
+            if not found:
+                result.append(None)
+                continue
+            result.append(self.slot_values[index])
+            self.slot_hashes[index] = None
+            self.slot_keys[index] = _DELETED
+            self.slot_values[index] = None
+            self.count -= 1
+            self.tombstones += 1
+            self.version += 1
+
+        self._shrink_to_fit()
+        return result
+
+    def resize(self, new_capacity=None):
+        """
+        Changes the capacity of the hash table and reinserts all live
+        slots using their stored hashes. Tombstones are dropped.
+        """
+        if new_capacity is None:
+            new_capacity = self.resize_policy.grow_capacity(self.capacity)
+        new_capacity = self.resize_policy.round_capacity(new_capacity)
+        if new_capacity <= self.count:
+            raise ValueError("new_capacity must be larger than the number of keys")
+
+        old_hashes = self.slot_hashes
+        old_keys = self.slot_keys
+        old_values = self.slot_values
+
+        self.capacity = new_capacity
+        self.slot_hashes = hashes = [None] * new_capacity
+        self.slot_keys = keys = [None] * new_capacity
+        self.slot_values = values = [None] * new_capacity
+        self.tombstones = 0
+        self.version += 1
+
+        for key_hash, key, value in zip(old_hashes, old_keys, old_values):
+            if key is None or key is _DELETED:
+                continue
+            index = key_hash % new_capacity
+            while keys[index] is not None:
+                index += 1
+                if index == new_capacity:
+                    index = 0
+            hashes[index] = key_hash
+            keys[index] = key
+            values[index] = value
+
+        self.update_load_factor()
+
+
+# What enable_instrumentation() switches tables to, kept here so
+# instrumented tables pickle
+InstrumentedHashTable = instrumentation.instrumented_class(HashTable)
+InstrumentedOpenAddressingHashTable = instrumentation.instrumented_class(OpenAddressingHashTable)
+
+
 if __name__ == "__main__":
     ht = HashTable(8)
 
@@ -0,0 +1,186 @@
+"""
+Optional operation counters for HashTable.
+
+instrument() switches a table's class to an instrumented subclass whose
+get/put/delete, increment and resize methods count what they do, and
+uninstrument() switches it back. increment() counts as a put; the batch
+operations (put_many, get_many, delete_many) are only counted where they
+fall back to get/put/delete. A table's attributes live in slots, so
+switching its class doesn't slow down attribute lookups the way adding
+and deleting instance attributes would: a table that was never
+instrumented (or no longer is) runs the plain class methods at full
+speed. The instrumented classes are plain module-level classes, so an
+instrumented table still pickles.
+"""
+
+import time
+
+
+class OperationStats:
+    """
+    Counters collected while a table is instrumented. Probes are chain
+    nodes visited (chaining) or slots inspected (open addressing).
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.operations = {"get": 0, "put": 0, "delete": 0}
+        self.probes = {"get": 0, "put": 0, "delete": 0}
+        self.max_probes = 0
+        self.resizes = 0
+        self.rehash_seconds = 0.0
+
+    def record(self, operation, probes):
+        self.operations[operation] += 1
+        self.probes[operation] += probes
+        if probes > self.max_probes:
+            self.max_probes = probes
+
+    def record_resize(self, old_capacity, new_capacity, seconds):
+        self.resizes += 1
+        self.rehash_seconds += seconds
+        if self.callback is not None:
+            self.callback("resize", {"old_capacity": old_capacity,
+                                     "new_capacity": new_capacity,
+                                     "seconds": seconds})
+
+    def snapshot(self):
+        """
+        Current counters as a plain dict, including mean probes per
+        operation type.
+        """
+        return {
+            "operations": dict(self.operations),
+            "probes": dict(self.probes),
+            "mean_probes": {
+                op: (self.probes[op] / n if n else 0.0)
+                for op, n in self.operations.items()
+            },
+            "max_probes": self.max_probes,
+            "resizes": self.resizes,
+            "rehash_seconds": self.rehash_seconds,
+        }
+
+
+# Plain class -> its instrumented subclass
+_CLASSES = {}
+
+
+def _counted(operation, method):
+    """
+    `method` of the plain class, counted as `operation`.
+    """
+    def wrapper(self, key, *args, **kwargs):
+        stats = self.instrumentation
+        probes = self._probe_length(key)
+        stats.record(operation, probes)
+        result = method(self, key, *args, **kwargs)
+        if stats.callback is not None:
+            stats.callback(operation, {"key": key, "probes": probes})
+        return result
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+def _counted_resize(resize):
+    def counted_resize(self, new_capacity=None):
+        old_capacity = self.capacity
+        start = time.perf_counter()
+        resize(self, new_capacity)
+        self.instrumentation.record_resize(old_capacity, self.capacity,
+                                           time.perf_counter() - start)
+    return counted_resize
+
+
+def _counted_resize_from(resize_from):
+    # ConcurrentHashTable resizes through _resize_from(), which skips
+    # resizes another thread already did
+    def counted_resize_from(self, old_capacity, new_capacity):
+        before = self.capacity
+        start = time.perf_counter()
+        resize_from(self, old_capacity, new_capacity)
+        if old_capacity is None or self.capacity != before:
+            self.instrumentation.record_resize(before, self.capacity,
+                                               time.perf_counter() - start)
+    return counted_resize_from
+
+
+def _counted_migrate(migrate):
+    # Incremental resizes don't go through resize(): count the start and
+    # time each migration step
+    def counted_migrate(self, buckets):
+        start = time.perf_counter()
+        migrate(self, buckets)
+        self.instrumentation.rehash_seconds += time.perf_counter() - start
+    return counted_migrate
+
+
+def _counted_auto_resize(auto_resize):
+    def counted_auto_resize(self, new_capacity):
+        if not getattr(self, "incremental", False):
+            # Counted by resize()
+            auto_resize(self, new_capacity)
+            return
+        old_capacity = self.capacity
+        auto_resize(self, new_capacity)
+        self.instrumentation.record_resize(old_capacity, new_capacity, 0.0)
+    return counted_auto_resize
+
+
+def instrumented_class(cls):
+    """
+    The subclass of table class `cls` that instrument() switches its
+    tables to, made on first use. hashtable.py keeps its tables'
+    instrumented classes as module attributes, so those pickle.
+    """
+    instrumented = _CLASSES.get(cls)
+    if instrumented is not None:
+        return instrumented
+
+    namespace = {
+        "__module__": cls.__module__,
+        "__doc__": f"{cls.__name__} counting its operations, see instrumentation.",
+        "__slots__": (),
+        "plain_class": cls,
+        "get": _counted("get", cls.get),
+        "put": _counted("put", cls.put),
+        "delete": _counted("delete", cls.delete),
+        "increment": _counted("put", cls.increment),
+    }
+    if hasattr(cls, "_resize_from"):
+        namespace["_resize_from"] = _counted_resize_from(cls._resize_from)
+    else:
+        namespace["resize"] = _counted_resize(cls.resize)
+    if hasattr(cls, "_migrate"):
+        namespace["_migrate"] = _counted_migrate(cls._migrate)
+        namespace["_auto_resize"] = _counted_auto_resize(cls._auto_resize)
+
+    # Single inheritance and no new slots keep the instance layout, so
+    # __class__ can be switched in both directions
+    instrumented = type(f"Instrumented{cls.__name__}", (cls,), namespace)
+    _CLASSES[cls] = instrumented
+    return instrumented
+
+
+def instrument(table, callback=None):
+    """
+    Start counting operations on `table`. `callback`, if given, is called
+    as callback(event, details) after every get/put/delete (details has the
+    key and probes) and every resize (old and new capacity, seconds).
+    Returns the table's OperationStats.
+    """
+    uninstrument(table)
+    table.__class__ = instrumented_class(type(table))
+    table.instrumentation = OperationStats(callback)
+    return table.instrumentation
+
+
+def uninstrument(table):
+    """
+    Stop counting and go back to the plain methods.
+    """
+    plain_class = type(table).__dict__.get("plain_class")
+    if plain_class is not None:
+        table.__class__ = plain_class
+        table.instrumentation = None
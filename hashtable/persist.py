@@ -0,0 +1,219 @@
+"""
+On-disk HashTable format that can be queried through mmap without
+loading it.
+
+Layout (all integers little-endian):
+
+    header   magic b"HTBL", format version, number of slots, number of
+             keys, offset of the slot index, offset of the heap
+    index    one (hash, record offset) pair of uint64 per slot; an offset
+             of 0 means the slot is empty. Keys are placed by FNV-1a 64
+             with linear probing, and there are at least twice as many
+             slots as keys, so probes stay short.
+    heap     one record per key: key length (uint32), value type (uint8),
+             value length (uint32), then the UTF-8 key and the value bytes
+
+Values can be str, bytes, int, float, bool or None.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+
+from hashing import fnv1a_64, hash_many
+
+MAGIC = b"HTBL"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<4sIQQQQ")
+SLOT = struct.Struct("<QQ")
+RECORD = struct.Struct("<IBI")
+
+# Value type tags
+_NONE, _STR, _BYTES, _INT, _FLOAT, _TRUE, _FALSE = range(7)
+
+
+def _encode_value(value):
+    if value is None:
+        return _NONE, b""
+    if value is True:
+        return _TRUE, b""
+    if value is False:
+        return _FALSE, b""
+    if isinstance(value, str):
+        return _STR, value.encode()
+    if isinstance(value, (bytes, bytearray)):
+        return _BYTES, bytes(value)
+    if isinstance(value, int):
+        return _INT, str(value).encode()
+    if isinstance(value, float):
+        return _FLOAT, struct.pack("<d", value)
+    raise TypeError(f"Can't store a {type(value).__name__} value")
+
+
+def _decode_value(tag, raw):
+    if tag == _STR:
+        return raw.decode()
+    if tag == _INT:
+        return int(raw)
+    if tag == _BYTES:
+        return raw
+    if tag == _FLOAT:
+        return struct.unpack("<d", raw)[0]
+    if tag == _NONE:
+        return None
+    if tag == _TRUE:
+        return True
+    if tag == _FALSE:
+        return False
+    raise ValueError(f"Unknown value type {tag} in table file")
+
+
+def save(table, path):
+    """
+    Write every (key, value) of `table` (any mapping with string keys)
+    to `path`.
+    """
+    items = list(table.items())
+    num_keys = len(items)
+    num_slots = 8
+    while num_slots < num_keys * 2:
+        num_slots *= 2
+    mask = num_slots - 1
+
+    index_offset = HEADER.size
+    heap_offset = index_offset + num_slots * SLOT.size
+
+    slots = array("Q", bytes(num_slots * 2 * 8))
+    heap = []
+    offset = heap_offset
+    keys = [key for key, _ in items]
+
+    for (key, value), key_hash in zip(items, hash_many(keys, "fnv1a")):
+        raw_key = key.encode()
+        tag, raw_value = _encode_value(value)
+        heap.append(RECORD.pack(len(raw_key), tag, len(raw_value)))
+        heap.append(raw_key)
+        heap.append(raw_value)
+
+        slot = key_hash & mask
+        while slots[slot * 2 + 1] != 0:
+            slot = (slot + 1) & mask
+        slots[slot * 2] = key_hash
+        slots[slot * 2 + 1] = offset
+        offset += RECORD.size + len(raw_key) + len(raw_value)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, num_slots, num_keys,
+                            index_offset, heap_offset))
+        if sys.byteorder != "little":
+            slots.byteswap()
+        f.write(slots.tobytes())
+        f.write(b"".join(heap))
+    # Readers never see a half-written file
+    os.replace(tmp_path, path)
+
+
+class MappedHashTable(Mapping):
+    """
+    Read-only view of a table file written by save(). Lookups read the
+    slot index and the one matching record straight from the mapping;
+    nothing is deserialized up front.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                raise ValueError(f"{path} is not a hash table file")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, num_slots, num_keys, index_offset, heap_offset = \
+            HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a hash table file")
+        if version != FORMAT_VERSION:
+            self._mm.close()
+            raise ValueError(f"Unsupported table file version {version}")
+
+        self.path = path
+        self.num_slots = num_slots
+        self.count = num_keys
+        self.index_offset = index_offset
+        self.heap_offset = heap_offset
+
+    def _find(self, key):
+        """
+        Return the record offset for `key`, or 0 if it isn't stored.
+        """
+        raw_key = key.encode()
+        key_hash = fnv1a_64(key)
+        mm = self._mm
+        mask = self.num_slots - 1
+        slot = key_hash & mask
+
+        while True:
+            slot_hash, offset = SLOT.unpack_from(mm, self.index_offset + slot * SLOT.size)
+            if offset == 0:
+                return 0
+            if slot_hash == key_hash:
+                key_len = RECORD.unpack_from(mm, offset)[0]
+                start = offset + RECORD.size
+                if mm[start:start + key_len] == raw_key:
+                    return offset
+            slot = (slot + 1) & mask
+
+    def _read(self, offset):
+        """
+        Return (key, value) of the record at `offset`.
+        """
+        key_len, tag, value_len = RECORD.unpack_from(self._mm, offset)
+        start = offset + RECORD.size
+        key = self._mm[start:start + key_len].decode()
+        start += key_len
+        return key, _decode_value(tag, self._mm[start:start + value_len])
+
+    def get(self, key, default=None):
+        offset = self._find(key)
+        if offset == 0:
+            return default
+        return self._read(offset)[1]
+
+    def __getitem__(self, key):
+        offset = self._find(key)
+        if offset == 0:
+            raise KeyError(key)
+        return self._read(offset)[1]
+
+    def __contains__(self, key):
+        return self._find(key) != 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        # Records are laid out back to back in the heap
+        offset = self.heap_offset
+        for _ in range(self.count):
+            key_len, _, value_len = RECORD.unpack_from(self._mm, offset)
+            start = offset + RECORD.size
+            yield self._mm[start:start + key_len].decode()
+            offset = start + key_len + value_len
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_mmap(path):
+    return MappedHashTable(path)
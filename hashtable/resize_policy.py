@@ -0,0 +1,126 @@
+"""
+When and how far a HashTable grows and shrinks.
+"""
+
+import math
+
+# Hash table can't have fewer than this many slots
+MIN_CAPACITY = 8
+
+
+class ResizePolicy:
+    """
+    Resize rules for a HashTable.
+
+    grow_at:        grow once the load factor goes over this
+    shrink_at:      shrink once it drops under this (None: never shrink)
+    growth_factor:  capacity is multiplied by this to grow
+    min_capacity:   never shrink below this many slots
+    power_of_two:   keep every capacity a power of two
+    shrink_target:  a shrink divides the capacity by growth_factor as long
+                    as the load factor stays at or under this. Defaults to
+                    halfway between the thresholds, so a shrink never lands
+                    the table right under grow_at.
+
+    A grow must also not land the table under shrink_at, otherwise keys
+    churning around a threshold would grow and shrink on every change, so
+    shrink_at has to be below grow_at / growth_factor.
+    """
+
+    def __init__(self, grow_at=0.7, shrink_at=0.2, growth_factor=2,
+                 min_capacity=MIN_CAPACITY, power_of_two=False, shrink_target=None):
+        if grow_at <= 0:
+            raise ValueError("grow_at must be positive")
+        if growth_factor <= 1:
+            raise ValueError("growth_factor must be greater than 1")
+        if shrink_at is not None:
+            if not 0 <= shrink_at < grow_at / growth_factor:
+                raise ValueError("shrink_at must be under grow_at / growth_factor")
+            if shrink_target is None:
+                shrink_target = (grow_at + shrink_at) / 2
+            if not shrink_at < shrink_target < grow_at:
+                raise ValueError("shrink_target must be between shrink_at and grow_at")
+
+        self.grow_at = grow_at
+        self.shrink_at = shrink_at
+        self.growth_factor = growth_factor
+        self.power_of_two = power_of_two
+        self.min_capacity = self.round_capacity(min_capacity)
+        self.shrink_target = shrink_target
+
+    def __repr__(self):
+        return (f"ResizePolicy(grow_at={self.grow_at}, shrink_at={self.shrink_at}, "
+                f"growth_factor={self.growth_factor}, min_capacity={self.min_capacity}, "
+                f"power_of_two={self.power_of_two}, shrink_target={self.shrink_target})")
+
+    def round_capacity(self, capacity):
+        """
+        Round a requested capacity up to one this policy allows.
+        """
+        capacity = max(1, int(capacity))
+        if self.power_of_two:
+            return 1 << (capacity - 1).bit_length()
+        return capacity
+
+    def should_grow(self, num_keys, capacity):
+        return num_keys / capacity > self.grow_at
+
+    def should_shrink(self, num_keys, capacity):
+        return (self.shrink_at is not None and capacity > self.min_capacity
+                and num_keys / capacity < self.shrink_at)
+
+    def headroom(self, num_keys, capacity):
+        """
+        Fewest keys that can be added or removed, starting from
+        `num_keys`, before should_grow or should_shrink turns true.
+        """
+        # First key count over grow_at, corrected for float rounding
+        grow = int(self.grow_at * capacity) + 1
+        while self.should_grow(grow - 1, capacity):
+            grow -= 1
+        while not self.should_grow(grow, capacity):
+            grow += 1
+        headroom = grow - num_keys
+
+        if self.should_shrink(0, capacity):
+            # Largest key count under shrink_at
+            shrink = max(0, math.ceil(self.shrink_at * capacity) - 1)
+            while self.should_shrink(shrink + 1, capacity):
+                shrink += 1
+            while shrink > 0 and not self.should_shrink(shrink, capacity):
+                shrink -= 1
+            headroom = min(headroom, num_keys - shrink)
+        return max(1, headroom)
+
+    def grow_capacity(self, capacity):
+        return self.round_capacity(max(capacity + 1, capacity * self.growth_factor))
+
+    def capacity_for(self, num_keys, capacity):
+        """
+        Capacity, growing from `capacity`, that holds `num_keys` keys
+        without going over grow_at.
+        """
+        while self.should_grow(num_keys, capacity):
+            capacity = self.grow_capacity(capacity)
+        return capacity
+
+    def shrink_capacity(self, num_keys, capacity, floor=0):
+        """
+        Smallest capacity, shrinking from `capacity`, that keeps the load
+        factor at or under shrink_target. Never below min_capacity or
+        `floor`.
+        """
+        floor = max(floor, self.min_capacity)
+        while True:
+            smaller = self.round_capacity(capacity / self.growth_factor)
+            if smaller >= capacity or smaller < floor:
+                return capacity
+            if num_keys / smaller > self.shrink_target:
+                return capacity
+            capacity = smaller
+
+
+DEFAULT_POLICY = ResizePolicy()
+
+# Grows like the default but keeps its memory once it has it
+NEVER_SHRINK = ResizePolicy(shrink_at=None)
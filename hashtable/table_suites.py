@@ -0,0 +1,28 @@
+"""
+Helper for rerunning a test module's TestHashTable against another kind
+of table.
+"""
+
+
+class TableFactoryMixin:
+    """
+    Mix in ahead of a suite's test case to build its tables with
+    `make_table` instead of HashTable, by rebinding `suite_module`'s
+    HashTable name for each test.
+
+        class TestOpenAddressing(TableFactoryMixin, test_hashtable.TestHashTable):
+            suite_module = test_hashtable
+            make_table = staticmethod(open_hash_table)
+    """
+
+    suite_module = None
+    make_table = None
+
+    def setUp(self):
+        self._original_table = self.suite_module.HashTable
+        self.suite_module.HashTable = self.make_table
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        self.suite_module.HashTable = self._original_table
@@ -0,0 +1,133 @@
+import unittest
+
+from caching import LFUCache, LRUCache, memoize
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCaching(unittest.TestCase):
+
+    def test_lru_eviction_order(self):
+        cache = LRUCache(max_entries=3)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.put("c", 3)
+        self.assertTrue(cache.get("a") == 1)
+        cache.put("d", 4)
+
+        self.assertTrue(len(cache) == 3)
+        self.assertFalse("b" in cache)
+        self.assertTrue(cache.get("a") == 1)
+        self.assertTrue(cache.get("c") == 3)
+        self.assertTrue(cache.get("d") == 4)
+        self.assertTrue(cache.stats()["evictions"] == 1)
+
+    def test_lfu_eviction_order(self):
+        cache = LFUCache(max_entries=3)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.put("c", 3)
+        for _ in range(3):
+            cache.get("a")
+        cache.get("b")
+        cache.put("d", 4)
+
+        # c was used least
+        self.assertFalse("c" in cache)
+        cache.put("e", 5)
+        # d and e have one use each, d is older
+        self.assertFalse("d" in cache)
+        self.assertTrue(cache.get("a") == 1 and cache.get("b") == 2 and cache.get("e") == 5)
+
+    def test_lfu_after_deleting_least_used(self):
+        cache = LFUCache(max_entries=2)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.put("b", 2)
+        cache.delete("b")
+        cache.put("c", 3)
+        cache.get("c")
+        cache.get("c")
+        cache.put("d", 4)
+        self.assertFalse("a" in cache)
+        self.assertTrue(cache.get("c") == 3 and cache.get("d") == 4)
+
+    def test_max_bytes(self):
+        cache = LRUCache(max_bytes=300, sizeof=lambda obj: 100 if obj != "key" else 0)
+        cache.put("key", "x")
+        for key in ("a", "b"):
+            cache.put(key, key)
+        self.assertTrue(cache.bytes <= 300)
+        self.assertTrue(len(cache) == 1)
+        self.assertTrue(cache.get("b") == "b")
+
+        big = LRUCache(max_bytes=10)
+        big.put("key", "value far bigger than ten bytes")
+        self.assertTrue(len(big) == 0)
+
+    def test_ttl(self):
+        for policy in (LRUCache, LFUCache):
+            clock = FakeClock()
+            cache = policy(ttl=10, clock=clock)
+            cache.put("a", 1)
+            clock.now = 5
+            self.assertTrue(cache.get("a") == 1)
+            clock.now = 10
+            self.assertTrue(cache.get("a") is None)
+            self.assertTrue(len(cache) == 0)
+            stats = cache.stats()
+            self.assertTrue(stats["expirations"] == 1)
+            self.assertTrue(stats["hits"] == 1 and stats["misses"] == 1)
+
+    def test_overwrite_and_clear(self):
+        for policy in (LRUCache, LFUCache):
+            cache = policy(max_entries=2)
+            cache.put("a", 1)
+            cache.put("a", 2)
+            self.assertTrue(len(cache) == 1 and cache.get("a") == 2)
+            cache.clear()
+            self.assertTrue(len(cache) == 0 and cache.get("a") is None)
+            cache.put("b", 1)
+            self.assertTrue(cache.get("b") == 1)
+
+    def test_memoize(self):
+        calls = []
+
+        @memoize(max_entries=2)
+        def add(x, y=0):
+            calls.append((x, y))
+            return x + y
+
+        self.assertTrue(add(1, 2) == 3)
+        self.assertTrue(add(1, 2) == 3)
+        self.assertTrue(add(1, y=2) == 3)
+        self.assertTrue(add(1, y=2) == 3)
+        self.assertTrue(calls == [(1, 2), (1, 2)])
+        self.assertTrue(add.cache.stats()["hits"] == 2)
+
+        add(5)
+        add(6)
+        self.assertTrue(len(add.cache) == 2)
+        add.cache_clear()
+        self.assertTrue(len(add.cache) == 0)
+        self.assertTrue(add.__name__ == "add")
+
+    def test_memoize_lfu(self):
+        @memoize(max_entries=10, policy="lfu")
+        def square(x):
+            return x * x
+
+        for x in range(100):
+            self.assertTrue(square(x % 20) == (x % 20) ** 2)
+        self.assertTrue(len(square.cache) == 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
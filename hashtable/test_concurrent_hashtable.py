@@ -0,0 +1,95 @@
+import threading
+import unittest
+
+from concurrent_hashtable import ConcurrentHashTable
+import test_hashtable
+from table_suites import TableFactoryMixin
+
+
+class TestConcurrentSingleThreaded(TableFactoryMixin, test_hashtable.TestHashTable):
+    suite_module = test_hashtable
+    make_table = ConcurrentHashTable
+
+
+class TestConcurrentHashTable(unittest.TestCase):
+
+    def run_threads(self, target, num_threads):
+        errors = []
+
+        def run(n):
+            try:
+                target(n)
+            except Exception as e:  # surfaced in the main thread below
+                errors.append(e)
+
+        threads = [threading.Thread(target=run, args=(n,)) for n in range(num_threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertTrue(errors == [])
+
+    def test_stress_disjoint_keys(self):
+        ht = ConcurrentHashTable(8, num_stripes=8)
+        num_threads = 16
+        per_thread = 2000
+
+        def work(n):
+            for i in range(per_thread):
+                ht.put(f"t{n}-{i}", i)
+            for i in range(per_thread):
+                assert ht.get(f"t{n}-{i}") == i
+            for i in range(0, per_thread, 2):
+                assert ht.delete(f"t{n}-{i}") == i
+
+        self.run_threads(work, num_threads)
+
+        self.assertTrue(ht.num_keys == num_threads * per_thread // 2)
+        for n in range(num_threads):
+            for i in range(per_thread):
+                expected = None if i % 2 == 0 else i
+                self.assertTrue(ht.get(f"t{n}-{i}") == expected)
+        self.assertTrue(ht.get_load_factor() <= 0.7)
+
+    def test_stress_shared_keys(self):
+        ht = ConcurrentHashTable(8, num_stripes=4)
+        keys = [f"key-{i}" for i in range(500)]
+
+        def work(n):
+            for _ in range(5):
+                for key in keys:
+                    ht.put(key, n)
+                    assert ht.get(key) is not None
+
+        self.run_threads(work, 8)
+
+        self.assertTrue(ht.num_keys == len(keys))
+        for key in keys:
+            self.assertTrue(ht.get(key) in range(8))
+
+    def test_reads_during_resizes(self):
+        ht = ConcurrentHashTable(8)
+        for i in range(100):
+            ht.put(f"stable-{i}", i)
+        done = threading.Event()
+
+        def writer(n):
+            # Grow and shrink repeatedly under the readers
+            for _ in range(10):
+                for i in range(2000):
+                    ht.put(f"w-{i}", i)
+                for i in range(2000):
+                    ht.delete(f"w-{i}")
+            done.set()
+
+        def reader(n):
+            while not done.is_set():
+                for i in range(100):
+                    assert ht.get(f"stable-{i}") == i
+
+        self.run_threads(lambda n: writer(n) if n == 0 else reader(n), 4)
+        self.assertTrue(ht.num_keys == 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
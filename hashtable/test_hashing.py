@@ -0,0 +1,50 @@
+import unittest
+
+from hashing import djb2_32, fnv1_64, fnv1a_64, hash_many, HASH_FUNCTIONS
+from hashtable import HashTable
+
+
+class TestHashing(unittest.TestCase):
+
+    def test_known_values(self):
+        self.assertTrue(fnv1_64("") == 0xcbf29ce484222325)
+        self.assertTrue(fnv1a_64("") == 0xcbf29ce484222325)
+        self.assertTrue(fnv1_64("a") == 0xaf63bd4c8601b7be)
+        self.assertTrue(fnv1a_64("a") == 0xaf63dc4c8601ec8c)
+        self.assertTrue(fnv1a_64("foobar") == 0x85944171f73967e8)
+        self.assertTrue(djb2_32("a") == 5381 * 33 + 97)
+
+    def test_hashes_are_fixed_width(self):
+        key = "x" * 10000
+        self.assertTrue(fnv1_64(key) < 2 ** 64)
+        self.assertTrue(fnv1a_64(key) < 2 ** 64)
+        self.assertTrue(djb2_32(key) < 2 ** 32)
+
+    def test_anagrams_do_not_collide(self):
+        for hash in HASH_FUNCTIONS.values():
+            self.assertTrue(hash("listen") != hash("silent"))
+
+    def test_hash_many_matches_single_key_hashes(self):
+        keys = ["", "a", "key-0", "a much longer key than the others", "é"]
+        for name, hash in HASH_FUNCTIONS.items():
+            self.assertTrue(hash_many(keys, name) == [hash(k) for k in keys])
+            self.assertTrue(hash_many(keys, name, 97) == [hash(k) % 97 for k in keys])
+        with self.assertRaises(ValueError):
+            hash_many(keys, "md5")
+
+    def test_pluggable_hash_function(self):
+        for hash_function in ("fnv1", "fnv1a", "djb2", len):
+            for backend in ("chaining", "open"):
+                ht = HashTable(8, backend=backend, hash_function=hash_function)
+                for i in range(20):
+                    ht.put(f"key-{i}", f"val-{i}")
+                for i in range(20):
+                    self.assertTrue(ht.get(f"key-{i}") == f"val-{i}")
+
+        ht = HashTable(64, hash_function="fnv1a")
+        keys = [f"key-{i}" for i in range(10)]
+        self.assertTrue(ht.hash_indexes(keys) == [ht.hash_index(k) for k in keys])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+
+from hashtable import HashTable
+
+
+class TestHashTableBulk(unittest.TestCase):
+
+    def check_backend(self, backend):
+        ht = HashTable(8, backend=backend)
+        ht.put("key-0", "old-val-0")
+
+        ht.put_many((f"key-{i}", f"val-{i}") for i in range(100))
+
+        self.assertTrue(ht.num_keys == 100)
+        self.assertTrue(ht.get_num_slots() == 256)
+        self.assertTrue(ht.get_load_factor() <= 0.7)
+        for i in range(100):
+            self.assertTrue(ht.get(f"key-{i}") == f"val-{i}")
+
+        values = ht.get_many(["key-3", "missing", "key-99"])
+        self.assertTrue(values == ["val-3", None, "val-99"])
+
+        values = ht.delete_many(f"key-{i}" for i in range(95))
+        self.assertTrue(values == [f"val-{i}" for i in range(95)])
+        self.assertTrue(ht.delete_many(["key-0"]) == [None])
+        self.assertTrue(ht.num_keys == 5)
+        # One shrink straight down to the smallest size that fits
+        self.assertTrue(ht.get_num_slots() == 16)
+        for i in range(95, 100):
+            self.assertTrue(ht.get(f"key-{i}") == f"val-{i}")
+
+    def test_bulk_chaining(self):
+        self.check_backend("chaining")
+
+    def test_bulk_open_addressing(self):
+        self.check_backend("open")
+
+    def test_put_many_resizes_once(self):
+        ht = HashTable(8)
+        resizes = []
+        resize = ht.resize
+        ht.resize = lambda *args: resizes.append(args) or resize(*args)
+
+        ht.put_many((f"key-{i}", i) for i in range(1000))
+
+        self.assertTrue(len(resizes) == 1)
+        self.assertTrue(ht.get_num_slots() == 2048)
+
+    def test_from_items(self):
+        items = [(f"key-{i}", i) for i in range(50)]
+        for backend in ("chaining", "open"):
+            ht = HashTable.from_items(items, backend=backend, hash_function="fnv1a")
+            self.assertTrue(ht.num_keys == 50)
+            self.assertTrue(ht.get_num_slots() == 128)
+            self.assertTrue(ht.get_many(k for k, _ in items) == list(range(50)))
+
+    def test_bulk_while_migrating(self):
+        ht = HashTable(64, incremental=True, migrate_step=1)
+        for i in range(45):
+            ht.put(f"key-{i}", i)
+        self.assertTrue(ht.old_data is not None)
+
+        self.assertTrue(ht.get_many(f"key-{i}" for i in range(45)) == list(range(45)))
+        ht.put_many((f"key-{i}", -i) for i in range(45, 60))
+        self.assertTrue(ht.old_data is None)
+        self.assertTrue(ht.get("key-59") == -59)
+
+
+if __name__ == '__main__':
+    unittest.main()
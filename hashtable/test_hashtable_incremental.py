@@ -0,0 +1,116 @@
+"""
+Runs the chaining test suites again with incremental resizing turned on.
+"""
+
+import unittest
+
+from hashtable import HashTable
+import test_hashtable
+import test_hashtable_resize
+from table_suites import TableFactoryMixin
+
+
+def incremental_hash_table(capacity):
+    return HashTable(capacity, incremental=True, migrate_step=1)
+
+
+class IncrementalMixin(TableFactoryMixin):
+    make_table = staticmethod(incremental_hash_table)
+
+
+class TestIncremental(IncrementalMixin, test_hashtable.TestHashTable):
+    suite_module = test_hashtable
+
+
+class TestIncrementalResize(IncrementalMixin, test_hashtable_resize.TestHashTable):
+    suite_module = test_hashtable_resize
+
+
+class TestIncrementalMigration(unittest.TestCase):
+
+    def test_growth_is_spread_over_operations(self):
+        ht = HashTable(64, incremental=True, migrate_step=2)
+
+        for i in range(45):
+            ht.put(f"key-{i}", f"val-{i}")
+
+        # Crossing 0.7 allocates the new array but moves almost nothing
+        self.assertTrue(ht.get_num_slots() == 128)
+        self.assertTrue(ht.old_data is not None)
+        self.assertTrue(ht.migrate_index == 0)
+
+        # Keys are reachable whichever array they're in
+        for i in range(45):
+            self.assertTrue(ht.get(f"key-{i}") == f"val-{i}")
+
+        # 45 gets at 2 buckets each have moved all 64 old buckets
+        self.assertTrue(ht.old_data is None)
+        for i in range(45):
+            self.assertTrue(ht.get(f"key-{i}") == f"val-{i}")
+
+    def test_put_and_delete_during_migration(self):
+        ht = HashTable(64, incremental=True, migrate_step=1)
+
+        for i in range(45):
+            ht.put(f"key-{i}", f"val-{i}")
+        self.assertTrue(ht.old_data is not None)
+
+        for i in range(0, 45, 3):
+            ht.put(f"key-{i}", f"new-val-{i}")
+        for i in range(1, 45, 3):
+            self.assertTrue(ht.delete(f"key-{i}") == f"val-{i}")
+
+        self.assertTrue(ht.count == 30)
+        for i in range(45):
+            value = ht.get(f"key-{i}")
+            if i % 3 == 0:
+                self.assertTrue(value == f"new-val-{i}")
+            elif i % 3 == 1:
+                self.assertTrue(value is None)
+            else:
+                self.assertTrue(value == f"val-{i}")
+
+    def test_explicit_resize_finishes_migration(self):
+        ht = HashTable(64, incremental=True, migrate_step=1)
+
+        for i in range(45):
+            ht.put(f"key-{i}", f"val-{i}")
+        ht.resize(1024)
+
+        self.assertTrue(ht.old_data is None)
+        self.assertTrue(ht.get_num_slots() == 1024)
+        for i in range(45):
+            self.assertTrue(ht.get(f"key-{i}") == f"val-{i}")
+
+    def test_migration_finishes_before_next_resize(self):
+        # Deleting right after a grow, and growing again, with the smallest
+        # step: no single operation may fall back to moving every bucket
+        ht = HashTable(8, incremental=True, migrate_step=1)
+        moved = []
+        migrate, auto_resize = ht._migrate, ht._auto_resize
+
+        def recording_migrate(buckets):
+            moved.append(buckets)
+            migrate(buckets)
+
+        def checked_auto_resize(new_capacity):
+            self.assertTrue(ht.old_data is None)
+            auto_resize(new_capacity)
+
+        ht._migrate = recording_migrate
+        ht._auto_resize = checked_auto_resize
+
+        for round in range(3):
+            for i in range(5000):
+                ht.put(f"key-{i}", i)
+            for i in range(5000):
+                ht.delete(f"key-{i}")
+
+        self.assertTrue(len(moved) > 0)
+        # The bound comes from the policy's thresholds, not the table size
+        self.assertTrue(max(moved) <= 16)
+        self.assertTrue(ht.count == 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
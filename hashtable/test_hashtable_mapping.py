@@ -0,0 +1,107 @@
+import unittest
+from collections.abc import MutableMapping
+
+from concurrent_hashtable import ConcurrentHashTable
+from hashtable import HashTable
+
+
+class TestHashTableMapping(unittest.TestCase):
+
+    def tables(self):
+        return [HashTable(8), HashTable(8, backend="open"),
+                HashTable(8, incremental=True, migrate_step=1), ConcurrentHashTable(8)]
+
+    def test_mapping_protocol(self):
+        for ht in self.tables():
+            self.assertTrue(isinstance(ht, MutableMapping))
+            self.assertTrue(len(ht) == 0)
+
+            for i in range(50):
+                ht[f"key-{i}"] = i
+            ht["none"] = None
+
+            self.assertTrue(len(ht) == 51)
+            self.assertTrue(ht["key-7"] == 7)
+            self.assertTrue(ht["none"] is None)
+            self.assertTrue("none" in ht)
+            self.assertTrue("key-49" in ht)
+            self.assertFalse("missing" in ht)
+            self.assertTrue(ht.get("missing", -1) == -1)
+            with self.assertRaises(KeyError):
+                ht["missing"]
+            with self.assertRaises(KeyError):
+                del ht["missing"]
+
+            del ht["none"]
+            self.assertTrue(sorted(ht) == sorted(f"key-{i}" for i in range(50)))
+            self.assertTrue(sorted(ht.keys()) == sorted(f"key-{i}" for i in range(50)))
+            self.assertTrue(sorted(ht.values()) == list(range(50)))
+            self.assertTrue(dict(ht.items()) == {f"key-{i}": i for i in range(50)})
+            self.assertTrue(ht == {f"key-{i}": i for i in range(50)})
+            self.assertTrue(("key-3", 3) in ht.items())
+
+            self.assertTrue(ht.pop("key-0") == 0)
+            ht.update({"key-0": "zero"})
+            self.assertTrue(ht.setdefault("key-0", "other") == "zero")
+
+            ht.clear()
+            self.assertTrue(len(ht) == 0)
+            self.assertTrue(list(ht.items()) == [])
+
+    def test_increment(self):
+        for ht in self.tables():
+            words = ["a", "b", "a", "c", "a", "b"] * 10
+            for word in words:
+                ht.increment(word)
+            self.assertTrue(ht.increment("a", 5) == 35)
+            self.assertTrue(ht.increment("d", 2) == 2)
+            self.assertTrue(dict(ht.items()) == {"a": 35, "b": 20, "c": 10, "d": 2})
+
+            for i in range(100):
+                ht.increment(f"key-{i}")
+            self.assertTrue(len(ht) == 104)
+            self.assertTrue(ht.get_load_factor() <= 0.7)
+
+    def test_views_are_lazy(self):
+        ht = HashTable(8)
+        keys = ht.keys()
+        ht["a"] = 1
+        self.assertTrue(list(keys) == ["a"])
+        self.assertTrue(len(keys) == 1)
+
+    def test_iteration_fails_fast(self):
+        for ht in self.tables()[:3]:
+            for i in range(20):
+                ht[f"key-{i}"] = i
+
+            with self.assertRaises(RuntimeError):
+                for key in ht:
+                    ht[key + "-copy"] = 0
+
+            with self.assertRaises(RuntimeError):
+                for key, value in ht.items():
+                    del ht[key]
+
+    def test_updating_values_during_iteration_is_allowed(self):
+        for ht in self.tables():
+            for i in range(20):
+                ht[f"key-{i}"] = i
+            for key, value in ht.items():
+                ht[key] = value * 2
+            self.assertTrue(sorted(ht.values()) == [i * 2 for i in range(20)])
+
+    def test_iteration_finishes_pending_migration(self):
+        ht = HashTable(64, incremental=True, migrate_step=1)
+        for i in range(45):
+            ht[f"key-{i}"] = i
+        self.assertTrue(ht.old_data is not None)
+
+        seen = {}
+        for key in ht:
+            # Lookups must not move buckets under the iterator
+            seen[key] = ht[key]
+        self.assertTrue(seen == {f"key-{i}": i for i in range(45)})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Runs the chaining test suites again against the open-addressing backend.
+"""
+
+import unittest
+
+from hashtable import HashTable, OpenAddressingHashTable
+import test_hashtable
+import test_hashtable_no_collisions
+import test_hashtable_resize
+from table_suites import TableFactoryMixin
+
+
+def open_hash_table(capacity):
+    return HashTable(capacity, backend="open")
+
+
+class OpenAddressingMixin(TableFactoryMixin):
+    make_table = staticmethod(open_hash_table)
+
+
+class TestOpenAddressing(OpenAddressingMixin, test_hashtable.TestHashTable):
+    suite_module = test_hashtable
+
+
+class TestOpenAddressingNoCollisions(OpenAddressingMixin,
+                                     test_hashtable_no_collisions.TestHashTable):
+    suite_module = test_hashtable_no_collisions
+
+
+class TestOpenAddressingResize(OpenAddressingMixin,
+                               test_hashtable_resize.TestHashTable):
+    suite_module = test_hashtable_resize
+
+
+class TestOpenAddressingBackend(unittest.TestCase):
+
+    def test_backend_selection(self):
+        self.assertTrue(type(HashTable(8)) is HashTable)
+        self.assertTrue(type(HashTable(8, backend="open")) is OpenAddressingHashTable)
+        with self.assertRaises(ValueError):
+            HashTable(8, backend="cuckoo")
+
+    def test_incremental_not_supported(self):
+        for kwargs in ({"incremental": True}, {"migrate_step": 8}):
+            with self.assertRaises(ValueError) as cm:
+                HashTable(8, backend="open", **kwargs)
+            self.assertTrue("chaining backend" in str(cm.exception))
+            with self.assertRaises(ValueError):
+                OpenAddressingHashTable(8, **kwargs)
+
+    def test_tombstones_keep_probe_chains_intact(self):
+        ht = HashTable(32, backend="open")
+
+        for i in range(20):
+            ht.put(f"key-{i}", f"val-{i}")
+        for i in range(0, 12, 2):
+            self.assertTrue(ht.delete(f"key-{i}") == f"val-{i}")
+
+        self.assertTrue(ht.tombstones == 6)
+        for i in range(1, 20, 2):
+            self.assertTrue(ht.get(f"key-{i}") == f"val-{i}")
+        for i in range(0, 12, 2):
+            self.assertTrue(ht.get(f"key-{i}") is None)
+
+        # Reinserting a deleted key reuses a tombstoned slot
+        ht.put("key-0", "new-val-0")
+        self.assertTrue(ht.tombstones == 5)
+        self.assertTrue(ht.get("key-0") == "new-val-0")
+
+    def test_resize_drops_tombstones(self):
+        ht = HashTable(64, backend="open")
+
+        for i in range(30):
+            ht.put(f"key-{i}", f"val-{i}")
+        for i in range(10):
+            ht.delete(f"key-{i}")
+
+        ht.resize(128)
+
+        self.assertTrue(ht.tombstones == 0)
+        self.assertTrue(ht.num_keys == 20)
+        for i in range(10, 30):
+            self.assertTrue(ht.get(f"key-{i}") == f"val-{i}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+from hashtable import HashTable, HashTableEntry
+
+
+class TestHashTableStats(unittest.TestCase):
+
+    def test_entries_have_no_dict(self):
+        entry = HashTableEntry("key", "value")
+        self.assertFalse(hasattr(entry, "__dict__"))
+        with self.assertRaises(AttributeError):
+            entry.extra = 1
+
+    def test_chaining_stats(self):
+        ht = HashTable(0x10000)
+        self.assertTrue(ht.stats()["max_chain"] == 0)
+
+        ht.put("key-0", "val-0")
+        ht.put("key-1", "val-1")
+        ht.put("key-2", "val-2")
+
+        stats = ht.stats()
+        self.assertTrue(stats["num_keys"] == 3)
+        self.assertTrue(stats["chain_lengths"] == {0: 0x10000 - 3, 1: 3})
+        self.assertTrue(stats["max_chain"] == 1)
+        self.assertTrue(stats["empty_bucket_ratio"] == (0x10000 - 3) / 0x10000)
+
+    def test_chain_histogram_adds_up(self):
+        ht = HashTable.from_items((f"key-{i}", i) for i in range(500))
+        stats = ht.stats()
+        histogram = stats["chain_lengths"]
+        self.assertTrue(sum(histogram.values()) == ht.get_num_slots())
+        self.assertTrue(sum(n * count for n, count in histogram.items()) == 500)
+        self.assertTrue(stats["max_chain"] == max(histogram))
+
+    def test_open_addressing_stats(self):
+        ht = HashTable.from_items(((f"key-{i}", i) for i in range(500)), backend="open")
+        ht.delete("key-0")
+        stats = ht.stats()
+        self.assertTrue(sum(stats["probe_lengths"].values()) == 499)
+        self.assertTrue(stats["tombstones"] == 1)
+        self.assertTrue(stats["empty_slot_ratio"] == (ht.get_num_slots() - 500) / ht.get_num_slots())
+
+    def test_memory_usage(self):
+        for backend in ("chaining", "open"):
+            ht = HashTable(8, backend=backend)
+            empty = ht.memory_usage()
+            self.assertTrue(empty["total"] > 0)
+            self.assertTrue(empty["keys"] == 0 and empty["values"] == 0)
+
+            shared = "the same value"
+            for i in range(100):
+                ht.put(f"key-{i}", shared)
+            usage = ht.memory_usage()
+            self.assertTrue(usage["keys"] > 0)
+            # The shared value object is counted once
+            self.assertTrue(usage["values"] < 2 * len(shared) + 100)
+            self.assertTrue(usage["total"] == sum(v for k, v in usage.items() if k != "total"))
+
+
+if __name__ == '__main__':
+    unittest.main()
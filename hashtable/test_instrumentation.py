@@ -0,0 +1,106 @@
+import pickle
+import unittest
+
+from concurrent_hashtable import ConcurrentHashTable
+from hashtable import HashTable
+
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_disabled_by_default(self):
+        ht = HashTable(8)
+        self.assertTrue(ht.stats()["operations"] is None)
+        self.assertFalse("get" in vars(ht))
+
+    def test_counts_operations_and_probes(self):
+        for ht in (HashTable(8), HashTable(8, backend="open"),
+                   HashTable(8, incremental=True), ConcurrentHashTable(8)):
+            stats = ht.enable_instrumentation()
+            for i in range(20):
+                ht.put(f"key-{i}", i)
+            for i in range(20):
+                self.assertTrue(ht.get(f"key-{i}") == i)
+            self.assertTrue(ht["key-3"] == 3)
+            ht.delete("key-0")
+
+            snapshot = ht.stats()["operations"]
+            self.assertTrue(snapshot == stats.snapshot())
+            self.assertTrue(snapshot["operations"] == {"get": 21, "put": 20, "delete": 1})
+            self.assertTrue(snapshot["probes"]["get"] >= 21)
+            self.assertTrue(snapshot["mean_probes"]["get"] >= 1)
+            self.assertTrue(snapshot["max_probes"] >= 1)
+            self.assertTrue(snapshot["resizes"] == 2)
+
+    def test_keyword_arguments(self):
+        for ht in (HashTable(8), HashTable(8, backend="open"), ConcurrentHashTable(8)):
+            stats = ht.enable_instrumentation()
+            ht.put("x", 1)
+            self.assertTrue(ht.get("x", default=2) == 1)
+            self.assertTrue(ht.get("missing", default=2) == 2)
+            self.assertTrue(stats.operations["get"] == 2)
+
+    def test_increment_counts_as_put(self):
+        for ht in (HashTable(8), HashTable(8, backend="open"),
+                   HashTable(8, incremental=True), ConcurrentHashTable(8)):
+            stats = ht.enable_instrumentation()
+            for word in "a b a c a b".split():
+                ht.increment(word)
+            self.assertTrue(ht.get("a") == 3)
+            self.assertTrue(stats.operations["put"] == 6)
+            self.assertTrue(stats.probes["put"] >= 3)
+            ht.disable_instrumentation()
+            self.assertFalse("increment" in vars(ht))
+
+    def test_chain_steps(self):
+        # Every key lands in the same bucket
+        ht = HashTable(64, hash_function=lambda key: 0)
+        for i in range(5):
+            ht.put(f"key-{i}", i)
+        stats = ht.enable_instrumentation()
+        ht.get("key-4")
+        ht.get("missing")
+        self.assertTrue(stats.probes["get"] == 10)
+        self.assertTrue(stats.max_probes == 5)
+
+    def test_callback_and_disable(self):
+        events = []
+        ht = HashTable(8)
+        ht.enable_instrumentation(lambda event, details: events.append((event, details)))
+        for i in range(6):
+            ht.put(f"key-{i}", i)
+        ht.get("key-1")
+
+        self.assertTrue([e for e, _ in events].count("put") == 6)
+        resize = [d for e, d in events if e == "resize"][0]
+        self.assertTrue(resize["old_capacity"] == 8 and resize["new_capacity"] == 16)
+        self.assertTrue(events[-1] == ("get", {"key": "key-1", "probes": events[-1][1]["probes"]}))
+
+        ht.disable_instrumentation()
+        ht.get("key-1")
+        self.assertTrue(len(events) == 8)
+        self.assertTrue(ht.stats()["operations"] is None)
+        self.assertTrue(vars(ht).keys().isdisjoint({"get", "put", "delete", "resize"}))
+        self.assertTrue(type(ht) is HashTable)
+
+    def test_pickle(self):
+        for ht in (HashTable(8), HashTable(8, backend="open"), HashTable(8, incremental=True)):
+            plain_class = type(ht)
+            stats = ht.enable_instrumentation()
+            for i in range(20):
+                ht.put(f"key-{i}", i)
+
+            copy = pickle.loads(pickle.dumps(ht))
+            self.assertTrue(dict(copy.items()) == dict(ht.items()))
+            self.assertTrue(copy.instrumentation.operations == stats.operations)
+            copy.get("key-1")
+            self.assertTrue(copy.instrumentation.operations["get"] == 1)
+
+            ht.disable_instrumentation()
+            copy = pickle.loads(pickle.dumps(ht))
+            self.assertTrue(type(copy) is plain_class)
+            self.assertTrue(copy.stats()["operations"] is None)
+            self.assertTrue(copy.get("key-1") == 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
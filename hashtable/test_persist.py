@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+
+from hashtable import HashTable
+from persist import MappedHashTable
+
+
+class TestPersist(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "table.htbl")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_round_trip(self):
+        values = ["val", b"\x00raw", -12, 2 ** 80, 1.5, True, False, None, "", "ünïcode"]
+        for backend in ("chaining", "open"):
+            ht = HashTable(8, backend=backend)
+            for i, value in enumerate(values):
+                ht.put(f"key-{i}", value)
+            ht.put("ключ", "value")
+            ht.save(self.path)
+
+            with HashTable.open_mmap(self.path) as mapped:
+                self.assertTrue(isinstance(mapped, MappedHashTable))
+                self.assertTrue(len(mapped) == len(values) + 1)
+                for i, value in enumerate(values):
+                    self.assertTrue(mapped.get(f"key-{i}") == value)
+                    self.assertTrue(type(mapped[f"key-{i}"]) is type(value))
+                self.assertTrue(mapped["ключ"] == "value")
+                self.assertTrue(mapped.get("missing") is None)
+                self.assertTrue(mapped.get("missing", 0) == 0)
+                self.assertFalse("missing" in mapped)
+                self.assertTrue("key-7" in mapped)
+                with self.assertRaises(KeyError):
+                    mapped["missing"]
+                self.assertTrue(dict(mapped) == dict(ht.items()))
+
+    def test_many_keys(self):
+        ht = HashTable.from_items((f"key-{i}", i) for i in range(5000))
+        ht.save(self.path)
+        with HashTable.open_mmap(self.path) as mapped:
+            for i in range(5000):
+                self.assertTrue(mapped.get(f"key-{i}") == i)
+            self.assertTrue(mapped.get("key-5000") is None)
+
+    def test_empty_table(self):
+        HashTable().save(self.path)
+        with HashTable.open_mmap(self.path) as mapped:
+            self.assertTrue(len(mapped) == 0)
+            self.assertTrue(mapped.get("key") is None)
+            self.assertTrue(list(mapped) == [])
+
+    def test_unsupported_values_and_files(self):
+        ht = HashTable()
+        ht.put("key", object())
+        with self.assertRaises(TypeError):
+            ht.save(self.path)
+
+        with open(self.path, "wb") as f:
+            f.write(b"not a hash table file at all, not at all, no")
+        with self.assertRaises(ValueError):
+            HashTable.open_mmap(self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+
+from concurrent_hashtable import ConcurrentHashTable
+from hashtable import HashTable
+from resize_policy import NEVER_SHRINK, ResizePolicy
+
+
+def count_resizes(ht):
+    resizes = []
+    resize = ht.resize
+    ht.resize = lambda *args: resizes.append(args) or resize(*args)
+    return resizes
+
+
+class TestResizePolicy(unittest.TestCase):
+
+    def test_rejects_thrashing_thresholds(self):
+        with self.assertRaises(ValueError):
+            # A grow from 0.7 lands at 0.35, under the shrink threshold
+            ResizePolicy(grow_at=0.7, shrink_at=0.4)
+        with self.assertRaises(ValueError):
+            ResizePolicy(growth_factor=1)
+        with self.assertRaises(ValueError):
+            HashTable(8, backend="open", resize_policy=ResizePolicy(grow_at=1.5, shrink_at=0.5))
+
+    def test_custom_thresholds_and_growth_factor(self):
+        policy = ResizePolicy(grow_at=0.5, shrink_at=0.1, growth_factor=4)
+        ht = HashTable(8, resize_policy=policy)
+        for i in range(5):
+            ht.put(f"key-{i}", i)
+        self.assertTrue(ht.get_num_slots() == 32)
+
+    def test_power_of_two(self):
+        policy = ResizePolicy(power_of_two=True, growth_factor=3)
+        for backend in ("chaining", "open"):
+            ht = HashTable(10, backend=backend, resize_policy=policy)
+            self.assertTrue(ht.get_num_slots() == 16)
+            for i in range(100):
+                ht.put(f"key-{i}", i)
+            capacity = ht.get_num_slots()
+            self.assertTrue(capacity & (capacity - 1) == 0)
+            ht.resize(1000)
+            self.assertTrue(ht.get_num_slots() == 1024)
+            for i in range(100):
+                self.assertTrue(ht.get(f"key-{i}") == i)
+
+    def test_headroom(self):
+        for policy in (ResizePolicy(), ResizePolicy(grow_at=0.29, shrink_at=0.1), NEVER_SHRINK):
+            for capacity in (8, 16, 100, 1024):
+                for num_keys in range(capacity):
+                    if policy.should_grow(num_keys, capacity) or policy.should_shrink(num_keys, capacity):
+                        continue
+                    headroom = policy.headroom(num_keys, capacity)
+                    # Exactly `headroom` keys away from a threshold
+                    self.assertTrue(policy.should_grow(num_keys + headroom, capacity)
+                                    or policy.should_shrink(num_keys - headroom, capacity))
+                    for k in range(1, headroom):
+                        self.assertFalse(policy.should_grow(num_keys + k, capacity))
+                        self.assertFalse(policy.should_shrink(num_keys - k, capacity))
+
+    def test_shrink_respects_min_capacity(self):
+        policy = ResizePolicy(min_capacity=64)
+        ht = HashTable(256, resize_policy=policy)
+        ht.put("key", 1)
+        ht.delete("key")
+        self.assertTrue(ht.get_num_slots() == 64)
+
+    def test_never_shrink(self):
+        for ht in (HashTable(8, resize_policy=NEVER_SHRINK),
+                   HashTable(8, backend="open", resize_policy=NEVER_SHRINK),
+                   ConcurrentHashTable(8, resize_policy=NEVER_SHRINK)):
+            for i in range(100):
+                ht.put(f"key-{i}", i)
+            capacity = ht.get_num_slots()
+            for i in range(100):
+                ht.delete(f"key-{i}")
+            self.assertTrue(ht.get_num_slots() == capacity)
+
+    def test_reserve(self):
+        for backend in ("chaining", "open"):
+            ht = HashTable(8, backend=backend)
+            resizes = count_resizes(ht)
+            ht.reserve(1000)
+            self.assertTrue(len(resizes) == 1)
+            self.assertTrue(ht.get_num_slots() == 2048)
+
+            for i in range(1000):
+                ht.put(f"key-{i}", i)
+            for i in range(1000):
+                ht.delete(f"key-{i}")
+            # Still room for the reserved keys
+            self.assertTrue(len(resizes) == 1)
+            self.assertTrue(ht.get_num_slots() == 2048)
+
+    def test_churn_at_threshold_does_not_thrash(self):
+        ht = HashTable(8)
+        for i in range(11):
+            ht.put(f"key-{i}", i)
+        self.assertTrue(ht.get_num_slots() == 16)
+
+        resizes = count_resizes(ht)
+        for _ in range(100):
+            ht.put("extra-0", 0)
+            ht.put("extra-1", 0)
+            ht.delete("extra-0")
+            ht.delete("extra-1")
+        self.assertTrue(len(resizes) <= 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
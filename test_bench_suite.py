@@ -0,0 +1,44 @@
+import unittest
+
+from bench_suite import DISTRIBUTIONS, Results, compare, make_keys, parse_sizes
+
+
+class TestBenchSuite(unittest.TestCase):
+
+    def test_make_keys(self):
+        for distribution in DISTRIBUTIONS:
+            keys = make_keys(500, distribution)
+            self.assertTrue(len(keys) == 500)
+            self.assertTrue(len(set(keys)) == 500)
+            self.assertTrue(all(isinstance(key, str) for key in keys))
+        self.assertTrue(make_keys(50, "random") == make_keys(50, "random"))
+        with self.assertRaises(ValueError):
+            make_keys(10, "sorted")
+
+    def test_parse_sizes(self):
+        self.assertTrue(parse_sizes("1e3,10000,1e7") == [1000, 10000, 10000000])
+
+    def test_compare(self):
+        baseline = Results()
+        baseline.add("put", 1000, "ops/s", True)
+        baseline.add("build", 2.0, "s", False)
+        baseline.add("memory", 100, "bytes/key", False)
+        baseline.add("load", 0.001, "s", False)
+
+        current = Results()
+        current.add("put", 800, "ops/s", True)
+        current.add("build", 4.0, "s", False)
+        current.add("memory", 100, "bytes/key", False)
+        current.add("load", 0.004, "s", False)
+        current.add("new", 1, "s", False)
+
+        regressions = compare(current.metrics, baseline.metrics, threshold=0.25)
+        self.assertTrue([name for name, *_ in regressions] == ["build"])
+        self.assertTrue(regressions[0][3] == 0.5)
+
+        regressions = compare(current.metrics, baseline.metrics, threshold=0.1)
+        self.assertTrue([name for name, *_ in regressions] == ["put", "build"])
+
+
+if __name__ == '__main__':
+    unittest.main()